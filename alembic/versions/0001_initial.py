@@ -26,7 +26,9 @@ mission_status_enum = sa.Enum(
 
 
 def upgrade() -> None:
-    op.execute('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"')
+    # SQLite gets uuid_generate_v4() from the connection hook in app.db.
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute('CREATE EXTENSION IF NOT EXISTS "uuid-ossp"')
     mission_type_enum.create(op.get_bind(), checkfirst=True)
     mission_status_enum.create(op.get_bind(), checkfirst=True)
 
@@ -0,0 +1,59 @@
+"""Indexes for per-user lookups, status filters and pending review queues."""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002_hot_path_indexes"
+down_revision = "0001_initial"
+branch_labels = None
+depends_on = None
+
+PENDING = sa.text("status = 'PENDING'")
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_mission_logs_user_id_status", "mission_logs", ["user_id", "status"]
+    )
+    op.create_index(
+        "ix_mission_logs_mission_id_user_id", "mission_logs", ["mission_id", "user_id"]
+    )
+    op.create_index("ix_stamps_user_id", "stamps", ["user_id"])
+    op.create_index("ix_purchases_user_id_status", "purchases", ["user_id", "status"])
+    op.create_index("ix_displays_user_id_status", "displays", ["user_id", "status"])
+    op.create_index("ix_referrals_referrer_user_id", "referrals", ["referrer_user_id"])
+
+    # Admin review queues only ever scan PENDING rows, oldest first.
+    op.create_index(
+        "ix_mission_logs_pending",
+        "mission_logs",
+        ["created_at"],
+        postgresql_where=PENDING,
+        sqlite_where=PENDING,
+    )
+    op.create_index(
+        "ix_purchases_pending",
+        "purchases",
+        ["created_at"],
+        postgresql_where=PENDING,
+        sqlite_where=PENDING,
+    )
+    op.create_index(
+        "ix_displays_pending",
+        "displays",
+        ["created_at"],
+        postgresql_where=PENDING,
+        sqlite_where=PENDING,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_displays_pending", table_name="displays")
+    op.drop_index("ix_purchases_pending", table_name="purchases")
+    op.drop_index("ix_mission_logs_pending", table_name="mission_logs")
+    op.drop_index("ix_referrals_referrer_user_id", table_name="referrals")
+    op.drop_index("ix_displays_user_id_status", table_name="displays")
+    op.drop_index("ix_purchases_user_id_status", table_name="purchases")
+    op.drop_index("ix_stamps_user_id", table_name="stamps")
+    op.drop_index("ix_mission_logs_mission_id_user_id", table_name="mission_logs")
+    op.drop_index("ix_mission_logs_user_id_status", table_name="mission_logs")
@@ -0,0 +1,65 @@
+"""Per-user dashboard counters, backfilled from existing logs and stamps."""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003_user_stats"
+down_revision = "0002_hot_path_indexes"
+branch_labels = None
+depends_on = None
+
+
+def _status_count(status: str) -> str:
+    return (
+        "(SELECT count(*) FROM mission_logs "
+        f"WHERE mission_logs.user_id = users.id AND mission_logs.status = '{status}')"
+    )
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_stats",
+        sa.Column(
+            "user_id",
+            sa.dialects.postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+            nullable=False,
+        ),
+        sa.Column("total_stamps", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("total_points", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("missions_pending", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("missions_approved", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("missions_rejected", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            server_onupdate=sa.func.now(),
+            nullable=False,
+        ),
+    )
+
+    op.execute(
+        "INSERT INTO user_stats (user_id, total_stamps, total_points, "
+        "missions_pending, missions_approved, missions_rejected) "
+        "SELECT users.id, "
+        "(SELECT count(*) FROM stamps WHERE stamps.user_id = users.id), "
+        "(SELECT coalesce(sum(missions.reward_points), 0) FROM mission_logs "
+        "JOIN missions ON mission_logs.mission_id = missions.id "
+        "WHERE mission_logs.user_id = users.id AND mission_logs.status = 'APPROVED'), "
+        f"{_status_count('PENDING')}, "
+        f"{_status_count('APPROVED')}, "
+        f"{_status_count('REJECTED')} "
+        "FROM users"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_stats")
@@ -0,0 +1,88 @@
+"""Append-only points ledger with per-user balance snapshots.
+
+Existing balances are opened from approved mission logs, the same source as
+``user_stats.total_points``, and ``users.total_points`` is realigned with it.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004_points_ledger"
+down_revision = "0003_user_stats"
+branch_labels = None
+depends_on = None
+
+ledger_id = sa.BigInteger().with_variant(sa.Integer(), "sqlite")
+
+APPROVED_POINTS = (
+    "(SELECT coalesce(sum(missions.reward_points), 0) FROM mission_logs "
+    "JOIN missions ON mission_logs.mission_id = missions.id "
+    "WHERE mission_logs.user_id = users.id AND mission_logs.status = 'APPROVED')"
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "points_ledger",
+        sa.Column("id", ledger_id, primary_key=True, autoincrement=True, nullable=False),
+        sa.Column(
+            "user_id",
+            sa.dialects.postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("delta", sa.Integer(), nullable=False),
+        sa.Column("reason", sa.String(length=32), nullable=False),
+        sa.Column(
+            "mission_log_id",
+            sa.dialects.postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("mission_logs.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index("ix_points_ledger_user_id_id", "points_ledger", ["user_id", "id"])
+
+    op.create_table(
+        "points_snapshots",
+        sa.Column(
+            "user_id",
+            sa.dialects.postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+            nullable=False,
+        ),
+        sa.Column("balance", sa.Integer(), nullable=False, server_default=sa.text("0")),
+        sa.Column("last_entry_id", ledger_id, nullable=False, server_default=sa.text("0")),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            server_onupdate=sa.func.now(),
+            nullable=False,
+        ),
+    )
+
+    op.execute(
+        "INSERT INTO points_ledger (user_id, delta, reason) "
+        f"SELECT users.id, {APPROVED_POINTS}, 'OPENING_BALANCE' FROM users "
+        f"WHERE {APPROVED_POINTS} <> 0"
+    )
+    op.execute(f"UPDATE users SET total_points = {APPROVED_POINTS}")
+
+
+def downgrade() -> None:
+    op.drop_table("points_snapshots")
+    op.drop_index("ix_points_ledger_user_id_id", table_name="points_ledger")
+    op.drop_table("points_ledger")
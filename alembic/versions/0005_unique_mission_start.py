@@ -0,0 +1,61 @@
+"""One start per user and mission, except for submission-backed logs."""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005_unique_mission_start"
+down_revision = "0004_points_ledger"
+branch_labels = None
+depends_on = None
+
+NOT_REPEATABLE = sa.text("NOT is_repeatable")
+SUBMISSION_TABLES = ("purchases", "displays", "referrals")
+
+
+def upgrade() -> None:
+    op.add_column(
+        "mission_logs",
+        sa.Column(
+            "is_repeatable",
+            sa.Boolean(),
+            nullable=False,
+            server_default=sa.text("false"),
+        ),
+    )
+
+    # Purchases, displays and referrals each create their own log. Databases
+    # built from 0001 have no displays.mission_log_id, so only tables that
+    # carry the link are consulted.
+    inspector = sa.inspect(op.get_bind())
+    linked = " UNION ".join(
+        f"SELECT mission_log_id FROM {table} WHERE mission_log_id IS NOT NULL"
+        for table in SUBMISSION_TABLES
+        if "mission_log_id" in {column["name"] for column in inspector.get_columns(table)}
+    )
+    op.execute(f"UPDATE mission_logs SET is_repeatable = true WHERE id IN ({linked})")
+    # Double starts that slipped through before the constraint are kept but
+    # exempted, leaving the earliest log as the user's start.
+    op.execute(
+        "UPDATE mission_logs SET is_repeatable = true "
+        "WHERE NOT is_repeatable AND EXISTS ("
+        "SELECT 1 FROM mission_logs AS earlier "
+        "WHERE earlier.mission_id = mission_logs.mission_id "
+        "AND earlier.user_id = mission_logs.user_id "
+        "AND NOT earlier.is_repeatable "
+        "AND (earlier.created_at < mission_logs.created_at "
+        "OR (earlier.created_at = mission_logs.created_at AND earlier.id < mission_logs.id)))"
+    )
+
+    op.create_index(
+        "uq_mission_logs_mission_id_user_id",
+        "mission_logs",
+        ["mission_id", "user_id"],
+        unique=True,
+        postgresql_where=NOT_REPEATABLE,
+        sqlite_where=NOT_REPEATABLE,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_mission_logs_mission_id_user_id", table_name="mission_logs")
+    op.drop_column("mission_logs", "is_repeatable")
@@ -0,0 +1,56 @@
+"""Materialised mission live flag and persisted scheduler jobs.
+
+``is_live`` is backfilled from the current windows and the scheduler job is
+created due immediately, so the first worker to start recomputes the flags
+and stores the next boundary.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006_mission_live_flags"
+down_revision = "0005_unique_mission_start"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "missions",
+        sa.Column("is_live", sa.Boolean(), nullable=False, server_default=sa.text("false")),
+    )
+    op.create_index("ix_missions_is_live", "missions", ["is_live"])
+    op.execute(
+        "UPDATE missions SET is_live = true WHERE is_active "
+        "AND (start_at IS NULL OR start_at <= CURRENT_TIMESTAMP) "
+        "AND (end_at IS NULL OR end_at >= CURRENT_TIMESTAMP)"
+    )
+
+    op.create_table(
+        "scheduler_jobs",
+        sa.Column("name", sa.String(length=64), primary_key=True, nullable=False),
+        sa.Column("next_run_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_run_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.execute(
+        "INSERT INTO scheduler_jobs (name, next_run_at) "
+        "VALUES ('mission_live_flags', CURRENT_TIMESTAMP)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("scheduler_jobs")
+    op.drop_index("ix_missions_is_live", table_name="missions")
+    op.drop_column("missions", "is_live")
@@ -0,0 +1,106 @@
+"""Invoice fingerprints for duplicate purchase detection.
+
+Existing purchases are fingerprinted with a frozen copy of the normaliser
+the API used at this revision, and every purchase after the first with a given fingerprint is linked to
+that first one through ``duplicate_of_id``.
+"""
+
+import hashlib
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007_invoice_fingerprints"
+down_revision = "0006_mission_live_flags"
+branch_labels = None
+depends_on = None
+
+HAS_FINGERPRINT = sa.text("invoice_fingerprint IS NOT NULL")
+IS_DUPLICATE = sa.text("duplicate_of_id IS NOT NULL")
+
+
+def _invoice_fingerprint(invoice_number: str | None) -> str | None:
+    """``app.models.purchase.invoice_fingerprint`` as of this revision."""
+
+    if not invoice_number:
+        return None
+    if invoice_number.isascii():
+        normalized = "".join(filter(str.isalnum, invoice_number.lower()))
+    else:
+        normalized = "".join(
+            str(unicodedata.digit(char)) if char.isdigit() else char
+            for char in unicodedata.normalize("NFKC", invoice_number).casefold()
+            if char.isalnum()
+        )
+    if not normalized:
+        return None
+    return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
+
+def upgrade() -> None:
+    op.add_column("purchases", sa.Column("invoice_fingerprint", sa.String(length=32), nullable=True))
+    op.add_column(
+        "purchases",
+        sa.Column(
+            "duplicate_of_id",
+            sa.dialects.postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("purchases.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+    )
+
+    purchases = sa.table(
+        "purchases",
+        sa.column("id"),
+        sa.column("invoice_number", sa.String()),
+        sa.column("invoice_fingerprint", sa.String()),
+    )
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.select(purchases.c.id, purchases.c.invoice_number).where(
+            purchases.c.invoice_number.is_not(None)
+        )
+    ).all()
+    updates = [
+        {"b_id": purchase_id, "b_fingerprint": fingerprint}
+        for purchase_id, invoice_number in rows
+        if (fingerprint := _invoice_fingerprint(invoice_number)) is not None
+    ]
+    if updates:
+        connection.execute(
+            purchases.update()
+            .where(purchases.c.id == sa.bindparam("b_id"))
+            .values(invoice_fingerprint=sa.bindparam("b_fingerprint")),
+            updates,
+        )
+
+    op.create_index(
+        "ix_purchases_invoice_fingerprint",
+        "purchases",
+        ["invoice_fingerprint"],
+        postgresql_where=HAS_FINGERPRINT,
+        sqlite_where=HAS_FINGERPRINT,
+    )
+    op.execute(
+        "UPDATE purchases SET duplicate_of_id = ("
+        "SELECT first.id FROM purchases AS first "
+        "WHERE first.invoice_fingerprint = purchases.invoice_fingerprint "
+        "ORDER BY first.created_at, first.id LIMIT 1) "
+        "WHERE invoice_fingerprint IS NOT NULL"
+    )
+    op.execute("UPDATE purchases SET duplicate_of_id = NULL WHERE duplicate_of_id = id")
+    op.create_index(
+        "ix_purchases_duplicate_of_id",
+        "purchases",
+        ["duplicate_of_id"],
+        postgresql_where=IS_DUPLICATE,
+        sqlite_where=IS_DUPLICATE,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_purchases_duplicate_of_id", table_name="purchases")
+    op.drop_index("ix_purchases_invoice_fingerprint", table_name="purchases")
+    op.drop_column("purchases", "duplicate_of_id")
+    op.drop_column("purchases", "invoice_fingerprint")
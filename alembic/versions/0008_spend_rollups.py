@@ -0,0 +1,121 @@
+"""Monthly spend rollups per store, brand and city, backfilled from approved purchases.
+
+Months are truncated and brand lists expanded in Python, with the rollup
+keys normalised as the application keyed them at this revision, so the
+backfill runs unchanged on PostgreSQL and SQLite.
+"""
+
+from collections import defaultdict
+from decimal import Decimal
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0008_spend_rollups"
+down_revision = "0007_invoice_fingerprints"
+branch_labels = None
+depends_on = None
+
+ROLLUPS = (
+    ("user_monthly_spend", "user_id"),
+    ("brand_monthly_spend", "brand"),
+    ("city_monthly_spend", "city"),
+)
+
+
+def _brand_names(brands: list[str] | None) -> list[str]:
+    """Distinct, trimmed brand keys, as the spend rollups keyed them at this revision."""
+
+    return sorted({brand.strip()[:128] for brand in brands or ()} - {""})
+
+
+def _key_column(name: str) -> sa.Column:
+    if name == "user_id":
+        return sa.Column(
+            "user_id",
+            postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="CASCADE"),
+            primary_key=True,
+            nullable=False,
+        )
+    return sa.Column(name, sa.String(length=128), primary_key=True, nullable=False)
+
+
+def upgrade() -> None:
+    for table_name, key in ROLLUPS:
+        op.create_table(
+            table_name,
+            _key_column(key),
+            sa.Column("month", sa.Date(), primary_key=True, nullable=False),
+            sa.Column("amount", sa.Numeric(18, 2), nullable=False, server_default=sa.text("0")),
+            sa.Column("purchases", sa.Integer(), nullable=False, server_default=sa.text("0")),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=False,
+            ),
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=False,
+            ),
+        )
+        op.create_index(f"ix_{table_name}_month", table_name, ["month"])
+
+    purchases = sa.table(
+        "purchases",
+        sa.column("user_id"),
+        sa.column("brands", sa.JSON()),
+        sa.column("purchase_date", sa.Date()),
+        sa.column("amount", sa.Numeric(18, 2)),
+        sa.column(
+            "status",
+            postgresql.ENUM("PENDING", "APPROVED", "REJECTED", name="mission_status", create_type=False),
+        ),
+    )
+    users = sa.table("users", sa.column("id"), sa.column("city", sa.String()))
+    totals = {key: defaultdict(lambda: [Decimal(0), 0]) for _, key in ROLLUPS}
+    rows = op.get_bind().execute(
+        sa.select(
+            purchases.c.user_id,
+            users.c.city,
+            purchases.c.brands,
+            purchases.c.purchase_date,
+            purchases.c.amount,
+        )
+        .join(users, users.c.id == purchases.c.user_id)
+        .where(purchases.c.status == "APPROVED")
+        .execution_options(stream_results=True, yield_per=10_000)
+    )
+    for user_id, city, brands, purchase_date, amount in rows:
+        month = purchase_date.replace(day=1)
+        keys = [("user_id", user_id), ("city", (city or "").strip()[:128])]
+        keys.extend(("brand", brand) for brand in _brand_names(brands))
+        for key_name, key in keys:
+            row = totals[key_name][(key, month)]
+            row[0] += Decimal(amount)
+            row[1] += 1
+
+    for table_name, key in ROLLUPS:
+        values = [
+            {key: value, "month": month, "amount": amount, "purchases": count}
+            for (value, month), (amount, count) in totals[key].items()
+        ]
+        if values:
+            table = sa.table(
+                table_name,
+                sa.column(key),
+                sa.column("month", sa.Date()),
+                sa.column("amount", sa.Numeric(18, 2)),
+                sa.column("purchases", sa.Integer()),
+            )
+            op.bulk_insert(table, values)
+
+
+def downgrade() -> None:
+    for table_name, _ in reversed(ROLLUPS):
+        op.drop_index(f"ix_{table_name}_month", table_name=table_name)
+        op.drop_table(table_name)
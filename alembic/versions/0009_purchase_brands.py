@@ -0,0 +1,61 @@
+"""Purchase brands as indexed rows, backfilled from ``purchases.brands``.
+
+Brand lists are expanded with a frozen copy of the normaliser the API used
+at this revision; the brand index is built after the backfill so the
+inserts stay cheap.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0009_purchase_brands"
+down_revision = "0008_spend_rollups"
+branch_labels = None
+depends_on = None
+
+PAGE = 10_000
+
+
+def _brand_names(brands: list[str] | None) -> list[str]:
+    """``app.models.purchase.brand_names`` as of this revision."""
+
+    return sorted({brand.strip()[:128] for brand in brands or ()} - {""})
+
+
+def upgrade() -> None:
+    op.create_table(
+        "purchase_brands",
+        sa.Column(
+            "purchase_id",
+            sa.dialects.postgresql.UUID(as_uuid=True),
+            sa.ForeignKey("purchases.id", ondelete="CASCADE"),
+            primary_key=True,
+            nullable=False,
+        ),
+        sa.Column("brand", sa.String(length=128), primary_key=True, nullable=False),
+    )
+
+    purchases = sa.table("purchases", sa.column("id"), sa.column("brands", sa.JSON()))
+    purchase_brands = sa.table("purchase_brands", sa.column("purchase_id"), sa.column("brand"))
+    rows = op.get_bind().execute(
+        sa.select(purchases.c.id, purchases.c.brands)
+        .where(purchases.c.brands.is_not(None))
+        .execution_options(stream_results=True, yield_per=PAGE)
+    )
+    values: list[dict] = []
+    for purchase_id, brands in rows:
+        values.extend({"purchase_id": purchase_id, "brand": brand} for brand in _brand_names(brands))
+        if len(values) >= PAGE:
+            op.bulk_insert(purchase_brands, values)
+            values = []
+    if values:
+        op.bulk_insert(purchase_brands, values)
+
+    op.create_index(
+        "ix_purchase_brands_brand_purchase_id", "purchase_brands", ["brand", "purchase_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_purchase_brands_brand_purchase_id", table_name="purchase_brands")
+    op.drop_table("purchase_brands")
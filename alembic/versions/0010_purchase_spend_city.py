@@ -0,0 +1,26 @@
+"""The city each approved purchase was credited to in the spend rollups.
+
+Already approved purchases are stamped with their store's current city, the
+same city the 0008 backfill credited them to.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0010_purchase_spend_city"
+down_revision = "0009_purchase_brands"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("purchases", sa.Column("spend_city", sa.String(), nullable=True))
+    op.execute(
+        "UPDATE purchases SET spend_city = ("
+        "SELECT COALESCE(users.city, '') FROM users WHERE users.id = purchases.user_id) "
+        "WHERE status = 'APPROVED'"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("purchases", "spend_city")
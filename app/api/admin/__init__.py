@@ -2,20 +2,46 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+import uuid
+from dataclasses import asdict
+from datetime import date, datetime
+from functools import partial
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.auth import init_data_cache
 from app.api.dependencies import require_admin
 from app.api.display import approve_display_record, reject_display_record
 from app.api.purchase import approve_purchase_record, reject_purchase_record
 from app.api.referral import mark_referral_first_purchase_record
-from app.db import get_session
-from app.models import Display, Mission, MissionType, Purchase, Referral, User
+from app.config import settings
+from app.db import get_read_session, get_session, on_commit, pool_status
+from app.models import (
+    Display,
+    Mission,
+    MissionStatus,
+    MissionType,
+    Purchase,
+    PurchaseBrand,
+    Referral,
+    User,
+)
+from app.models.mission import status_is
 from app.schemas import DisplayOut, PurchaseOut, UserOut
+from app.security import token_cache, user_cache
+from app.services.bulk_review_service import bulk_review
+from app.services.invoice_service import invoice_filter, list_duplicate_groups
+from app.services.dashboard_service import dashboard_cache
+from app.services.mission_catalog_service import mission_catalog
+from app.services.mission_schedule_service import get_job, reschedule_for, upcoming_transitions
+from app.services.mission_status_service import status_maps
+from app.services.points_service import get_points_balance, reconcile_points
+from app.services.purchase_import_service import CONTENT_TYPES, IMPORT_FORMATS, import_purchases
+from app.services.spend_service import list_spend
+from app.services.submission_service import resolve_submission
 
 admin_router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)])
 
@@ -32,6 +58,22 @@ class MissionPayload(BaseModel):
     is_active: bool = True
 
 
+class BulkReviewPayload(BaseModel):
+    purchases: list[uuid.UUID] = []
+    displays: list[uuid.UUID] = []
+    referrals: list[uuid.UUID] = []
+    mission_logs: list[uuid.UUID] = []
+    admin_note: str | None = None
+
+    def ids_by_kind(self) -> dict[str, list[uuid.UUID]]:
+        return {
+            "purchases": self.purchases,
+            "displays": self.displays,
+            "referrals": self.referrals,
+            "mission_logs": self.mission_logs,
+        }
+
+
 def _mission_response(mission: Mission) -> dict:
     return {
         "id": mission.id,
@@ -40,6 +82,7 @@ def _mission_response(mission: Mission) -> dict:
         "description": mission.description,
         "type": mission.type.value if mission.type else None,
         "is_active": mission.is_active,
+        "is_live": mission.is_live,
         "reward_points": mission.reward_points,
         "reward_stamps": mission.reward_stamps,
         "start_at": mission.start_at,
@@ -47,21 +90,161 @@ def _mission_response(mission: Mission) -> dict:
     }
 
 
+@admin_router.get("/metrics/cache")
+async def cache_metrics() -> dict[str, dict]:
+    return {
+        "users": user_cache.stats(),
+        "access_tokens": token_cache.stats(),
+        "telegram_init_data": init_data_cache.stats(),
+        "dashboard": dashboard_cache.stats(),
+        "mission_catalog": mission_catalog.stats(),
+        "mission_statuses": status_maps.stats(),
+        "invoice_filter": invoice_filter.stats(),
+    }
+
+
+@admin_router.get("/metrics/db-pool")
+async def db_pool_metrics() -> dict:
+    return pool_status()
+
+
 @admin_router.get("/users")
-async def list_users(session: AsyncSession = Depends(get_session)) -> list[UserOut]:
+async def list_users(session: AsyncSession = Depends(get_read_session)) -> list[UserOut]:
     users = (await session.scalars(select(User))).all()
     return [UserOut.from_orm(user) for user in users]
 
 
+@admin_router.get("/users/{user_id}/points")
+async def user_points(user_id: uuid.UUID, session: AsyncSession = Depends(get_read_session)) -> dict:
+    user = await session.get(User, user_id)
+    if user is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found.")
+    return {
+        "user_id": user.id,
+        "ledger_balance": await get_points_balance(session, user.id),
+        "total_points": user.total_points,
+    }
+
+
+@admin_router.get("/points/reconciliation")
+async def points_reconciliation(
+    limit: int = 100,
+    session: AsyncSession = Depends(get_read_session),
+) -> list[dict]:
+    return await reconcile_points(session, limit)
+
+
+# Spend rollups
+@admin_router.get("/spend/users")
+async def user_spend(
+    user_id: uuid.UUID | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    limit: int = 100,
+    session: AsyncSession = Depends(get_read_session),
+) -> list[dict]:
+    return await list_spend(session, "users", start, end, user_id, limit)
+
+
+@admin_router.get("/spend/brands")
+async def brand_spend(
+    brand: str | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    limit: int = 100,
+    session: AsyncSession = Depends(get_read_session),
+) -> list[dict]:
+    return await list_spend(session, "brands", start, end, brand, limit)
+
+
+@admin_router.get("/spend/cities")
+async def city_spend(
+    city: str | None = None,
+    start: date | None = None,
+    end: date | None = None,
+    limit: int = 100,
+    session: AsyncSession = Depends(get_read_session),
+) -> list[dict]:
+    return await list_spend(session, "cities", start, end, city, limit)
+
+
 # Purchases
+def _purchase_filters(query, brand: str | None, purchase_status: MissionStatus | None):
+    if brand is not None:
+        # Served by ix_purchase_brands_brand_purchase_id rather than a scan of Purchase.brands.
+        query = query.join(PurchaseBrand, PurchaseBrand.purchase_id == Purchase.id).where(
+            PurchaseBrand.brand == brand.strip()[:128]
+        )
+    if purchase_status is not None:
+        query = query.where(status_is(Purchase.status, purchase_status))
+    return query
+
+
 @admin_router.get("/purchases")
-async def list_purchases(session: AsyncSession = Depends(get_session)) -> list[PurchaseOut]:
-    purchases = (await session.scalars(select(Purchase))).all()
+async def list_purchases(
+    brand: str | None = None,
+    purchase_status: MissionStatus | None = Query(None, alias="status"),
+    limit: int | None = None,
+    offset: int = 0,
+    session: AsyncSession = Depends(get_read_session),
+) -> list[PurchaseOut]:
+    query = _purchase_filters(select(Purchase), brand, purchase_status).order_by(
+        Purchase.created_at.desc(), Purchase.id
+    )
+    purchases = (await session.scalars(query.offset(offset).limit(limit))).all()
     return [PurchaseOut.from_orm(p) for p in purchases]
 
 
+@admin_router.get("/purchases/count")
+async def count_purchases(
+    brand: str | None = None,
+    purchase_status: MissionStatus | None = Query(None, alias="status"),
+    session: AsyncSession = Depends(get_read_session),
+) -> dict:
+    if brand is not None and purchase_status is None:
+        # Answered from the brand index alone, without touching purchases.
+        query = select(func.count()).select_from(PurchaseBrand).where(
+            PurchaseBrand.brand == brand.strip()[:128]
+        )
+    else:
+        query = _purchase_filters(select(func.count()).select_from(Purchase), brand, purchase_status)
+    return {"brand": brand, "status": purchase_status, "count": await session.scalar(query)}
+
+
+@admin_router.post("/purchases/import")
+async def import_purchase_file(request: Request, format: str | None = None) -> dict:
+    """Stream a CSV or NDJSON request body into purchases.
+
+    The format comes from ``?format=`` or the ``Content-Type`` header. The
+    import commits per batch on its own session, outside the request's unit
+    of work.
+    """
+
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    fmt = format or CONTENT_TYPES.get(content_type)
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Send text/csv or application/x-ndjson, or pass ?format=csv|ndjson.",
+        )
+    report = await import_purchases(request.stream(), fmt)
+    return asdict(report)
+
+
+@admin_router.get("/purchases/duplicates")
+async def list_duplicate_purchases(
+    limit: int = 100,
+    session: AsyncSession = Depends(get_read_session),
+) -> list[dict]:
+    groups = await list_duplicate_groups(session, limit)
+    return [
+        {**group, "purchases": [PurchaseOut.from_orm(p) for p in group["purchases"]]}
+        for group in groups
+    ]
+
+
 @admin_router.get("/purchases/{purchase_id}")
-async def get_purchase(purchase_id: str, session: AsyncSession = Depends(get_session)) -> PurchaseOut:
+async def get_purchase(purchase_id: uuid.UUID, session: AsyncSession = Depends(get_read_session)) -> PurchaseOut:
     purchase = await session.get(Purchase, purchase_id)
     if purchase is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Purchase not found.")
@@ -70,41 +253,39 @@ async def get_purchase(purchase_id: str, session: AsyncSession = Depends(get_ses
 
 @admin_router.post("/purchases/{purchase_id}/approve")
 async def approve_purchase(
-    purchase_id: str,
+    purchase_id: uuid.UUID,
     session: AsyncSession = Depends(get_session),
 ) -> PurchaseOut:
-    purchase = await session.get(Purchase, purchase_id)
-    if purchase is None:
+    resolved = await resolve_submission(session, Purchase, purchase_id)
+    if resolved is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Purchase not found.")
-    await approve_purchase_record(session, purchase)
-    await session.commit()
-    await session.refresh(purchase)
+    purchase = resolved.submission
+    await approve_purchase_record(session, resolved)
     return PurchaseOut.from_orm(purchase)
 
 
 @admin_router.post("/purchases/{purchase_id}/reject")
 async def reject_purchase(
-    purchase_id: str,
+    purchase_id: uuid.UUID,
     session: AsyncSession = Depends(get_session),
 ) -> PurchaseOut:
-    purchase = await session.get(Purchase, purchase_id)
-    if purchase is None:
+    resolved = await resolve_submission(session, Purchase, purchase_id)
+    if resolved is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Purchase not found.")
-    await reject_purchase_record(session, purchase)
-    await session.commit()
-    await session.refresh(purchase)
+    purchase = resolved.submission
+    await reject_purchase_record(session, resolved)
     return PurchaseOut.from_orm(purchase)
 
 
 # Displays
 @admin_router.get("/displays")
-async def list_displays(session: AsyncSession = Depends(get_session)) -> list[DisplayOut]:
+async def list_displays(session: AsyncSession = Depends(get_read_session)) -> list[DisplayOut]:
     displays = (await session.scalars(select(Display))).all()
     return [DisplayOut.from_orm(display) for display in displays]
 
 
 @admin_router.get("/displays/{display_id}")
-async def get_display(display_id: str, session: AsyncSession = Depends(get_session)) -> DisplayOut:
+async def get_display(display_id: uuid.UUID, session: AsyncSession = Depends(get_read_session)) -> DisplayOut:
     display = await session.get(Display, display_id)
     if display is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Display not found.")
@@ -113,35 +294,33 @@ async def get_display(display_id: str, session: AsyncSession = Depends(get_sessi
 
 @admin_router.post("/displays/{display_id}/approve")
 async def approve_display(
-    display_id: str,
+    display_id: uuid.UUID,
     session: AsyncSession = Depends(get_session),
 ) -> DisplayOut:
-    display = await session.get(Display, display_id)
-    if display is None:
+    resolved = await resolve_submission(session, Display, display_id)
+    if resolved is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Display not found.")
-    await approve_display_record(session, display)
-    await session.commit()
-    await session.refresh(display)
+    display = resolved.submission
+    await approve_display_record(session, resolved)
     return DisplayOut.from_orm(display)
 
 
 @admin_router.post("/displays/{display_id}/reject")
 async def reject_display(
-    display_id: str,
+    display_id: uuid.UUID,
     session: AsyncSession = Depends(get_session),
 ) -> DisplayOut:
-    display = await session.get(Display, display_id)
-    if display is None:
+    resolved = await resolve_submission(session, Display, display_id)
+    if resolved is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Display not found.")
-    await reject_display_record(session, display)
-    await session.commit()
-    await session.refresh(display)
+    display = resolved.submission
+    await reject_display_record(session, resolved)
     return DisplayOut.from_orm(display)
 
 
 # Referrals
 @admin_router.get("/referrals")
-async def list_referrals(session: AsyncSession = Depends(get_session)) -> list[dict]:
+async def list_referrals(session: AsyncSession = Depends(get_read_session)) -> list[dict]:
     referrals = (await session.scalars(select(Referral))).all()
     return [
         {
@@ -160,24 +339,42 @@ async def list_referrals(session: AsyncSession = Depends(get_session)) -> list[d
 
 @admin_router.post("/referrals/{referral_id}/mark-first-purchase")
 async def mark_first_purchase(
-    referral_id: str,
+    referral_id: uuid.UUID,
     session: AsyncSession = Depends(get_session),
 ) -> dict[str, str]:
-    referral = await session.get(Referral, referral_id)
-    if referral is None:
+    resolved = await resolve_submission(session, Referral, referral_id)
+    if resolved is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Referral not found.")
-    await mark_referral_first_purchase_record(session, referral)
-    await session.commit()
+    await mark_referral_first_purchase_record(session, resolved)
     return {"status": "ok"}
 
 
 # Missions
 @admin_router.get("/missions")
-async def list_missions(session: AsyncSession = Depends(get_session)) -> list[dict]:
-    missions = (await session.scalars(select(Mission))).all()
+async def list_missions(
+    live: bool | None = None,
+    session: AsyncSession = Depends(get_read_session),
+) -> list[dict]:
+    query = select(Mission)
+    if live is not None:
+        query = query.where(Mission.is_live.is_(live))
+    missions = (await session.scalars(query)).all()
     return [_mission_response(m) for m in missions]
 
 
+@admin_router.get("/missions/transitions")
+async def mission_transitions(
+    limit: int = 50,
+    session: AsyncSession = Depends(get_read_session),
+) -> dict:
+    job = await get_job(session)
+    return {
+        "next_run_at": job.next_run_at if job else None,
+        "last_run_at": job.last_run_at if job else None,
+        "transitions": await upcoming_transitions(session, datetime.utcnow(), limit),
+    }
+
+
 @admin_router.post("/missions")
 async def create_mission(
     payload: MissionPayload, session: AsyncSession = Depends(get_session)
@@ -194,14 +391,15 @@ async def create_mission(
         is_active=payload.is_active,
     )
     session.add(mission)
-    await session.commit()
-    await session.refresh(mission)
+    await reschedule_for(session, mission)
+    await session.flush()
+    on_commit(session, partial(mission_catalog.upsert, mission))
     return _mission_response(mission)
 
 
 @admin_router.put("/missions/{mission_id}")
 async def update_mission(
-    mission_id: str,
+    mission_id: uuid.UUID,
     payload: MissionPayload,
     session: AsyncSession = Depends(get_session),
 ) -> dict:
@@ -218,34 +416,62 @@ async def update_mission(
     mission.end_at = payload.end_at
     mission.is_active = payload.is_active
     session.add(mission)
-    await session.commit()
-    await session.refresh(mission)
+    await reschedule_for(session, mission)
+    on_commit(session, partial(mission_catalog.upsert, mission))
     return _mission_response(mission)
 
 
 @admin_router.patch("/missions/{mission_id}/activate")
 async def activate_mission(
-    mission_id: str, session: AsyncSession = Depends(get_session)
+    mission_id: uuid.UUID, session: AsyncSession = Depends(get_session)
 ) -> dict:
     mission = await session.get(Mission, mission_id)
     if mission is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mission not found.")
     mission.is_active = True
     session.add(mission)
-    await session.commit()
-    await session.refresh(mission)
+    await reschedule_for(session, mission)
+    on_commit(session, partial(mission_catalog.upsert, mission))
     return {"status": "ok"}
 
 
 @admin_router.patch("/missions/{mission_id}/deactivate")
 async def deactivate_mission(
-    mission_id: str, session: AsyncSession = Depends(get_session)
+    mission_id: uuid.UUID, session: AsyncSession = Depends(get_session)
 ) -> dict:
     mission = await session.get(Mission, mission_id)
     if mission is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mission not found.")
     mission.is_active = False
     session.add(mission)
-    await session.commit()
-    await session.refresh(mission)
+    await reschedule_for(session, mission)
+    on_commit(session, partial(mission_catalog.upsert, mission))
     return {"status": "ok"}
+
+
+# Bulk review
+async def _bulk_review(
+    payload: BulkReviewPayload, target: MissionStatus, session: AsyncSession
+) -> dict[str, list[dict]]:
+    ids_by_kind = payload.ids_by_kind()
+    total = sum(len(ids) for ids in ids_by_kind.values())
+    if total > settings.bulk_review_max_items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.bulk_review_max_items} items per request.",
+        )
+    return await bulk_review(session, ids_by_kind, target, payload.admin_note)
+
+
+@admin_router.post("/bulk/approve")
+async def bulk_approve(
+    payload: BulkReviewPayload, session: AsyncSession = Depends(get_session)
+) -> dict[str, list[dict]]:
+    return await _bulk_review(payload, MissionStatus.APPROVED, session)
+
+
+@admin_router.post("/bulk/reject")
+async def bulk_reject(
+    payload: BulkReviewPayload, session: AsyncSession = Depends(get_session)
+) -> dict[str, list[dict]]:
+    return await _bulk_review(payload, MissionStatus.REJECTED, session)
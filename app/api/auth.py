@@ -2,12 +2,22 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends
+import hashlib
+import hmac
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from urllib.parse import parse_qsl
+
+from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import get_session
+from app.cache import TTLCache
+from app.config import settings
+from app.db import dialect_insert, get_session
 from app.models import User
 from app.schemas import TokenResponse
 from app.security import create_access_token
@@ -19,27 +29,120 @@ class TelegramAuthIn(BaseModel):
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+# Telegram derives the WebApp signing key from the bot token; it never changes
+# for the lifetime of the process, so compute it once.
+_WEBAPP_SECRET = hmac.new(
+    b"WebAppData", settings.telegram_bot_token.encode(), hashlib.sha256
+).digest()
+
+
+@dataclass(frozen=True)
+class _VerifiedInitData:
+    init_data: str
+    data: dict
+    user_id: uuid.UUID
+
+
+# Recently verified initData keyed by its Telegram ``hash`` value.
+init_data_cache: TTLCache[str, _VerifiedInitData] = TTLCache(
+    maxsize=settings.telegram_init_data_cache_size,
+    ttl=settings.telegram_init_data_cache_ttl_seconds,
+)
+
+
+def _invalid_init_data() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid Telegram init data.",
+    )
+
+
+def _extract_hash(init_data: str) -> str | None:
+    for part in init_data.split("&"):
+        if part.startswith("hash="):
+            return part[5:]
+    return None
+
 
 def verify_telegram_init_data(init_data: str) -> dict:
-    """Mock verification for Telegram init data."""
+    """Validate Telegram WebApp init data and return the Telegram user fields."""
 
-    # TODO: replace this placeholder with real Telegram WebApp verification logic.
-    return {"telegram_id": 123456789, "first_name": "Test User"}
+    fields = dict(parse_qsl(init_data, keep_blank_values=True))
+    received_hash = fields.pop("hash", None)
+    if not received_hash:
+        raise _invalid_init_data()
+
+    data_check_string = "\n".join(f"{key}={fields[key]}" for key in sorted(fields))
+    expected_hash = hmac.new(
+        _WEBAPP_SECRET, data_check_string.encode(), hashlib.sha256
+    ).hexdigest()
+    # compare_digest rejects non-ASCII str operands with TypeError, so compare bytes.
+    if not hmac.compare_digest(expected_hash.encode(), received_hash.encode()):
+        raise _invalid_init_data()
+
+    try:
+        auth_date = int(fields["auth_date"])
+        telegram_user = json.loads(fields["user"])
+        telegram_id = int(telegram_user["id"])
+    except (KeyError, TypeError, ValueError):
+        raise _invalid_init_data()
+    if time.time() - auth_date > settings.telegram_init_data_max_age_seconds:
+        raise _invalid_init_data()
+
+    return {
+        "telegram_id": telegram_id,
+        "first_name": telegram_user.get("first_name"),
+        "auth_date": auth_date,
+    }
+
+
+async def _upsert_user_id(session: AsyncSession, telegram_id: int) -> uuid.UUID:
+    """Return the user id for ``telegram_id``, creating the user if needed.
+
+    On PostgreSQL and SQLite this is a single ``INSERT ... ON CONFLICT DO UPDATE
+    ... RETURNING`` statement, which also keeps concurrent first logins from
+    tripping over the unique index on ``users.telegram_id``.
+    """
+
+    insert = dialect_insert(session)
+    if insert is None:
+        user = await session.scalar(select(User).where(User.telegram_id == telegram_id))
+        if user is None:
+            user = User(telegram_id=telegram_id)
+            session.add(user)
+            await session.flush()
+        return user.id
+
+    stmt = insert(User).values(id=uuid.uuid4(), telegram_id=telegram_id)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[User.telegram_id],
+        set_={"telegram_id": stmt.excluded.telegram_id},
+    ).returning(User.id)
+    return await session.scalar(stmt)
 
 
 @router.post("/telegram", response_model=TokenResponse)
 async def telegram_auth(
     payload: TelegramAuthIn, session: AsyncSession = Depends(get_session)
 ) -> TokenResponse:
+    init_hash = _extract_hash(payload.init_data)
+    cached = init_data_cache.get(init_hash) if init_hash else None
+    if cached is not None and hmac.compare_digest(
+        cached.init_data.encode(), payload.init_data.encode()
+    ):
+        return TokenResponse(access_token=create_access_token({"user_id": str(cached.user_id)}))
+
     data = verify_telegram_init_data(payload.init_data)
-    stmt = select(User).where(User.telegram_id == data["telegram_id"])
-    result = await session.execute(stmt)
-    user = result.scalar_one_or_none()
-    if user is None:
-        user = User(telegram_id=data["telegram_id"])
-        session.add(user)
-        await session.commit()
-        await session.refresh(user)
-
-    access_token = create_access_token({"user_id": str(user.id)})
+    user_id = await _upsert_user_id(session, data["telegram_id"])
+
+    if init_hash:
+        # Never keep an entry past the point where the init data itself expires.
+        remaining = settings.telegram_init_data_max_age_seconds - (time.time() - data["auth_date"])
+        init_data_cache.set(
+            init_hash,
+            _VerifiedInitData(init_data=payload.init_data, data=data, user_id=user_id),
+            ttl=min(init_data_cache.ttl, remaining),
+        )
+
+    access_token = create_access_token({"user_id": str(user_id)})
     return TokenResponse(access_token=access_token)
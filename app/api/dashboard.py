@@ -2,55 +2,37 @@
 
 from __future__ import annotations
 
+import json
+import uuid
+from functools import partial
+
 from fastapi import APIRouter, Depends
-from sqlalchemy import func, select
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import get_session
-from app.models import Mission, MissionLog, MissionStatus, Stamp, User
+from app.db import read_session_factory
+from app.models import User
 from app.schemas import DashboardOut, UserOut
 from app.security import get_current_user
+from app.services.dashboard_service import dashboard_cache
+from app.services.user_stats_service import get_user_stats
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 
-async def _get_count(session: AsyncSession, status: MissionStatus, user: User) -> int:
-    stmt = select(func.count()).select_from(MissionLog).where(
-        MissionLog.user_id == user.id,
-        MissionLog.status == status,
+async def _load_dashboard(user_id: uuid.UUID) -> dict:
+    async with read_session_factory(user_id)() as session:
+        user = await session.get(User, user_id)
+        stats = await get_user_stats(session, user_id)
+    dashboard = DashboardOut(
+        user=UserOut.from_orm(user),
+        total_stamps=stats.total_stamps,
+        total_points=stats.total_points,
+        missions_pending=stats.missions_pending,
+        missions_approved=stats.missions_approved,
+        missions_rejected=stats.missions_rejected,
     )
-    result = await session.scalar(stmt)
-    return result or 0
+    return json.loads(dashboard.json())
 
 
 @router.get("/", response_model=DashboardOut)
-async def dashboard(
-    user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
-) -> DashboardOut:
-    total_stamps_stmt = select(func.count()).select_from(Stamp).where(Stamp.user_id == user.id)
-    total_stamps = int((await session.scalar(total_stamps_stmt)) or 0)
-
-    total_points_stmt = (
-        select(func.coalesce(func.sum(Mission.reward_points), 0))
-        .select_from(MissionLog)
-        .join(Mission, MissionLog.mission_id == Mission.id)
-        .where(
-            MissionLog.user_id == user.id,
-            MissionLog.status == MissionStatus.APPROVED,
-        )
-    )
-    total_points = int((await session.scalar(total_points_stmt)) or 0)
-
-    pending = await _get_count(session, MissionStatus.PENDING, user)
-    approved = await _get_count(session, MissionStatus.APPROVED, user)
-    rejected = await _get_count(session, MissionStatus.REJECTED, user)
-
-    return DashboardOut(
-        user=UserOut.from_orm(user),
-        total_stamps=total_stamps,
-        total_points=total_points,
-        missions_pending=pending,
-        missions_approved=approved,
-        missions_rejected=rejected,
-    )
+async def dashboard(user: User = Depends(get_current_user)) -> dict:
+    return await dashboard_cache.get_or_load(user.id, partial(_load_dashboard, user.id))
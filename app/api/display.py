@@ -3,36 +3,31 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import require_admin_user as require_admin
-from app.db import get_session
+from app.db import get_read_session, get_session
 from app.models import Display, Mission, MissionLog, MissionStatus, MissionType, User
 from app.schemas import DisplayIn, DisplayOut, DisplaySubmissionOut
 from app.security import get_current_user
+from app.services.mission_catalog_service import CatalogMission, mission_catalog
 from app.services.notification_service import send_notification
 from app.services.stamp_service import award_stamps
+from app.services.submission_service import (
+    ResolvedSubmission,
+    claim,
+    move_mission_log,
+    resolve_submission,
+)
+from app.services.user_stats_service import record_mission_transition, record_reward_points
 
 router = APIRouter(prefix="/display", tags=["display"])
 
 
-async def _find_active_display_mission(session: AsyncSession) -> Mission | None:
-    now = datetime.utcnow()
-    stmt = (
-        select(Mission)
-        .where(
-            Mission.type == MissionType.DISPLAY,
-            Mission.is_active.is_(True),
-            or_(Mission.start_at.is_(None), Mission.start_at <= now),
-            or_(Mission.end_at.is_(None), Mission.end_at >= now),
-        )
-        .limit(1)
-    )
-    return await session.scalar(stmt)
+async def _find_active_display_mission() -> CatalogMission | None:
+    return await mission_catalog.first_active(MissionType.DISPLAY)
 
 
 def _notification_payload(resource_id: uuid.UUID, mission: Mission | None) -> dict:
@@ -48,31 +43,17 @@ def _display_to_out(display: Display) -> DisplayOut:
     return DisplayOut.from_orm(display)
 
 
-async def _resolve_display_mission(
-    session: AsyncSession,
-    display: Display,
-) -> tuple[Mission | None, MissionLog | None]:
-    mission_log = None
-    mission = None
-    if display.mission_log_id:
-        mission_log = await session.get(MissionLog, display.mission_log_id)
-        if mission_log:
-            mission = await session.get(Mission, mission_log.mission_id)
-    elif display.mission_id:
-        mission = await session.get(Mission, display.mission_id)
-    return mission, mission_log
-
-
 async def approve_display_record(
     session: AsyncSession,
-    display: Display,
+    resolved: ResolvedSubmission[Display],
 ) -> tuple[Mission | None, MissionLog | None]:
-    mission, mission_log = await _resolve_display_mission(session, display)
-    display.status = MissionStatus.APPROVED
-    session.add(display)
+    display, mission_log, mission = resolved.submission, resolved.mission_log, resolved.mission
+    if not await claim(session, display, status=MissionStatus.APPROVED):
+        return mission, mission_log
     if mission_log:
-        mission_log.status = MissionStatus.APPROVED
-        session.add(mission_log)
+        await move_mission_log(
+            session, mission_log, MissionStatus.APPROVED, mission.reward_points if mission else 0
+        )
     if mission:
         await _apply_display_rewards(session, display, mission, mission_log)
     await send_notification(
@@ -86,14 +67,20 @@ async def approve_display_record(
 
 async def reject_display_record(
     session: AsyncSession,
-    display: Display,
+    resolved: ResolvedSubmission[Display],
 ) -> tuple[Mission | None, MissionLog | None]:
-    mission, mission_log = await _resolve_display_mission(session, display)
-    display.status = MissionStatus.REJECTED
-    session.add(display)
+    display, mission_log, mission = resolved.submission, resolved.mission_log, resolved.mission
+    previous = display.status
+    if not await claim(session, display, status=MissionStatus.REJECTED):
+        return mission, mission_log
     if mission_log:
-        mission_log.status = MissionStatus.REJECTED
-        session.add(mission_log)
+        await move_mission_log(
+            session, mission_log, MissionStatus.REJECTED, mission.reward_points if mission else 0
+        )
+    elif mission and previous == MissionStatus.APPROVED:
+        await record_reward_points(
+            session, display.user_id, -mission.reward_points, "DISPLAY_REVOKED"
+        )
     await send_notification(
         session,
         display.user_id,
@@ -109,10 +96,11 @@ async def _apply_display_rewards(
     mission: Mission,
     mission_log: MissionLog | None,
 ) -> None:
-    user = await session.get(User, display.user_id)
-    if user:
-        user.total_points += mission.reward_points
-        session.add(user)
+    # Logged missions book their points in move_mission_log.
+    if mission_log is None:
+        await record_reward_points(
+            session, display.user_id, mission.reward_points, "DISPLAY_APPROVED"
+        )
     if mission.reward_stamps > 0:
         await award_stamps(
             session,
@@ -136,15 +124,16 @@ async def submit_display(
         notes=payload.notes,
         status=MissionStatus.PENDING,
     )
-    session.add(display)
 
-    mission = await _find_active_display_mission(session)
+    mission = await _find_active_display_mission()
     mission_log_id: uuid.UUID | None = None
     if mission:
         mission_log = MissionLog(
+            id=uuid.uuid4(),
             mission_id=mission.id,
             user_id=user.id,
             status=MissionStatus.PENDING,
+            is_repeatable=True,
             payload={
                 "brand": payload.brand,
                 "location_desc": payload.location_desc,
@@ -152,13 +141,15 @@ async def submit_display(
             },
         )
         session.add(mission_log)
-        await session.flush()
         display.mission_id = mission.id
         display.mission_log_id = mission_log.id
         mission_log_id = mission_log.id
+        await record_mission_transition(
+            session, user.id, None, MissionStatus.PENDING, mission_id=mission.id
+        )
 
-    await session.commit()
-    await session.refresh(display)
+    session.add(display)
+    await session.flush()
     return DisplaySubmissionOut(
         display_id=display.id,
         mission_log_id=mission_log_id,
@@ -172,18 +163,12 @@ async def approve_display(
     _admin: User = Depends(require_admin),
     session: AsyncSession = Depends(get_session),
 ) -> DisplayOut:
-    display = await session.get(Display, display_id)
-    if display is None:
+    resolved = await resolve_submission(session, Display, display_id)
+    if resolved is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Display not found.")
 
-    display.status = MissionStatus.APPROVED
-    session.add(display)
-
-    await approve_display_record(session, display)
-
-    await session.commit()
-    await session.refresh(display)
-    return _display_to_out(display)
+    await approve_display_record(session, resolved)
+    return _display_to_out(resolved.submission)
 
 
 @router.post("/{display_id}/reject", response_model=DisplayOut)
@@ -192,25 +177,19 @@ async def reject_display(
     _admin: User = Depends(require_admin),
     session: AsyncSession = Depends(get_session),
 ) -> DisplayOut:
-    display = await session.get(Display, display_id)
-    if display is None:
+    resolved = await resolve_submission(session, Display, display_id)
+    if resolved is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Display not found.")
 
-    display.status = MissionStatus.REJECTED
-    session.add(display)
-
-    await reject_display_record(session, display)
-
-    await session.commit()
-    await session.refresh(display)
-    return _display_to_out(display)
+    await reject_display_record(session, resolved)
+    return _display_to_out(resolved.submission)
 
 
 @router.get("/{display_id}", response_model=DisplayOut)
 async def get_display(
     display_id: uuid.UUID,
     user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ) -> DisplayOut:
     display = await session.get(Display, display_id)
     if display is None:
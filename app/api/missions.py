@@ -6,16 +6,21 @@ import uuid
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, status, Body
-from sqlalchemy import or_, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import require_admin_user as require_admin
-from app.db import get_session
+from app.db import dialect_insert, get_read_session, get_session
 from app.models import Mission, MissionLog, MissionStatus, User
+from app.models.mission import NOT_REPEATABLE
 from app.schemas import MissionLogOut, MissionOut
 from app.security import get_current_user
+from app.services.mission_catalog_service import mission_catalog
+from app.services.mission_status_service import get_mission_statuses
 from app.services.notification_service import send_notification
 from app.services.stamp_service import award_stamps
+from app.services.submission_service import move_mission_log, resolve_mission_log
+from app.services.user_stats_service import record_mission_transition
 
 router = APIRouter(prefix="/missions", tags=["missions"])
 
@@ -31,24 +36,10 @@ def _notification_payload(resource_id: uuid.UUID, mission: Mission | None) -> di
 
 @router.get("/", response_model=list[MissionOut])
 async def list_missions(
-    user: User = Depends(get_current_user), session: AsyncSession = Depends(get_session)
+    user: User = Depends(get_current_user), session: AsyncSession = Depends(get_read_session)
 ) -> list[MissionOut]:
-    now = datetime.utcnow()
-    stmt = select(Mission).where(
-        Mission.is_active.is_(True),
-        or_(Mission.start_at.is_(None), Mission.start_at <= now),
-        or_(Mission.end_at.is_(None), Mission.end_at >= now),
-    )
-    missions = (await session.scalars(stmt)).all()
-    logs = (await session.scalars(select(MissionLog).where(MissionLog.user_id == user.id))).all()
-    log_map = {log.mission_id: log.status for log in logs}
-
-    def _status_for(mission_id: uuid.UUID) -> str:
-        status_value = log_map.get(mission_id)
-        if status_value is None:
-            return "NONE"
-        return status_value.value
-
+    missions = await mission_catalog.active()
+    statuses = await get_mission_statuses(session, user.id, [mission.id for mission in missions])
     return [
         MissionOut(
             id=mission.id,
@@ -57,46 +48,81 @@ async def list_missions(
             description=mission.description,
             type=mission.type,
             is_active=mission.is_active,
-            user_status=_status_for(mission.id),
+            user_status=statuses[mission.id],
         )
         for mission in missions
     ]
 
 
+async def _insert_mission_start(session: AsyncSession, mission_log: MissionLog) -> bool:
+    """Insert a started mission log unless the user already started the mission.
+
+    Relies on the partial unique index over non-repeatable logs, so a double
+    tap costs one statement instead of a check-then-insert race.
+    """
+
+    insert_for_dialect = dialect_insert(session)
+    if insert_for_dialect is None:
+        existing = await session.scalar(
+            select(MissionLog.id).where(
+                MissionLog.mission_id == mission_log.mission_id,
+                MissionLog.user_id == mission_log.user_id,
+                MissionLog.is_repeatable.is_(False),
+            )
+        )
+        if existing is not None:
+            return False
+        session.add(mission_log)
+        await session.flush()
+        return True
+
+    stmt = (
+        insert_for_dialect(MissionLog)
+        .values(
+            id=mission_log.id,
+            mission_id=mission_log.mission_id,
+            user_id=mission_log.user_id,
+            status=mission_log.status,
+            payload=mission_log.payload,
+            is_repeatable=False,
+        )
+        .on_conflict_do_nothing(
+            index_elements=[MissionLog.mission_id, MissionLog.user_id],
+            index_where=NOT_REPEATABLE,
+        )
+        .returning(MissionLog.id)
+    )
+    return await session.scalar(stmt) is not None
+
+
 @router.post("/{mission_id}/start", response_model=MissionLogOut)
 async def start_mission(
     mission_id: uuid.UUID,
     user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> MissionLogOut:
-    mission = await session.get(Mission, mission_id)
+    mission = await mission_catalog.get(mission_id)
     if mission is None:
-        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mission not found.")
-
-    now = datetime.utcnow()
-    if not mission.is_active or (mission.start_at and mission.start_at > now) or (
-        mission.end_at and mission.end_at < now
-    ):
+        # Only missions that are not live, or unknown ones, reach the database here.
+        if await session.get(Mission, mission_id) is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mission not found.")
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Mission not available.")
+    if not mission.is_live(datetime.utcnow()):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Mission not available.")
-
-    existing = await session.scalar(
-        select(MissionLog).where(
-            MissionLog.mission_id == mission_id,
-            MissionLog.user_id == user.id,
-        )
-    )
-    if existing:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Mission already started.")
 
     mission_log = MissionLog(
+        id=uuid.uuid4(),
         mission_id=mission_id,
         user_id=user.id,
         status=MissionStatus.PENDING,
         payload={},
     )
-    session.add(mission_log)
-    await session.commit()
-    await session.refresh(mission_log)
+    if not await _insert_mission_start(session, mission_log):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Mission already started.")
+
+    await record_mission_transition(
+        session, user.id, None, MissionStatus.PENDING, mission_id=mission_id
+    )
     return MissionLogOut.from_orm(mission_log)
 
 
@@ -107,16 +133,16 @@ async def approve_mission(
     _admin: User = Depends(require_admin),
     session: AsyncSession = Depends(get_session),
 ) -> MissionLogOut:
-    mission_log = await session.get(MissionLog, log_id)
-    if mission_log is None or mission_log.mission_id != mission_id:
+    resolved = await resolve_mission_log(session, log_id)
+    if resolved is None or resolved[0].mission_id != mission_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mission log not found.")
 
-    mission = await session.get(Mission, mission_id)
+    mission_log, mission = resolved
     if mission is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mission not found.")
 
-    mission_log.status = MissionStatus.APPROVED
-    session.add(mission_log)
+    if not await move_mission_log(session, mission_log, MissionStatus.APPROVED, mission.reward_points):
+        return MissionLogOut.from_orm(mission_log)
 
     await award_stamps(session, mission_log.user_id, mission.reward_stamps, mission_log.id)
     await send_notification(
@@ -126,8 +152,6 @@ async def approve_mission(
         _notification_payload(mission_log.id, mission),
     )
 
-    await session.commit()
-    await session.refresh(mission_log)
     return MissionLogOut.from_orm(mission_log)
 
 
@@ -139,22 +163,25 @@ async def reject_mission(
     _admin: User = Depends(require_admin),
     session: AsyncSession = Depends(get_session),
 ) -> MissionLogOut:
-    mission_log = await session.get(MissionLog, log_id)
-    if mission_log is None or mission_log.mission_id != mission_id:
+    resolved = await resolve_mission_log(session, log_id)
+    if resolved is None or resolved[0].mission_id != mission_id:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Mission log not found.")
 
-    mission_log.status = MissionStatus.REJECTED
+    mission_log, mission = resolved
+    moved = await move_mission_log(
+        session, mission_log, MissionStatus.REJECTED, mission.reward_points if mission else 0
+    )
     if admin_note is not None:
         mission_log.admin_note = admin_note
-    session.add(mission_log)
+        session.add(mission_log)
+    if not moved:
+        return MissionLogOut.from_orm(mission_log)
 
     await send_notification(
         session,
         mission_log.user_id,
         "MISSION_REJECTED",
-        _notification_payload(mission_log.id, mission_log.mission),
+        _notification_payload(mission_log.id, mission),
     )
 
-    await session.commit()
-    await session.refresh(mission_log)
     return MissionLogOut.from_orm(mission_log)
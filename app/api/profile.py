@@ -3,14 +3,16 @@
 from __future__ import annotations
 
 from datetime import datetime
+from functools import partial
 
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import get_session
-from app.security import get_current_user
+from app.db import get_session, on_commit
+from app.security import get_current_user, invalidate_cached_user
 from app.schemas import CompleteProfileIn, UserOut
 from app.models import User
+from app.services.dashboard_service import invalidate_dashboard
 
 router = APIRouter(prefix="/profile", tags=["profile"])
 
@@ -34,6 +36,6 @@ async def complete_profile(
         user.vip_since = datetime.utcnow()
 
     session.add(user)
-    await session.commit()
-    await session.refresh(user)
+    on_commit(session, partial(invalidate_cached_user, user.id))
+    invalidate_dashboard(session, user.id)
     return user
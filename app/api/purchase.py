@@ -4,26 +4,37 @@ from __future__ import annotations
 
 import uuid
 from decimal import Decimal
-from datetime import datetime
+from functools import partial
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import require_admin_user as require_admin
-from app.db import get_session
+from app.db import get_read_session, get_session, on_commit
 from app.models import (
     Mission,
     MissionLog,
     MissionStatus,
     MissionType,
     Purchase,
+    PurchaseBrand,
     User,
 )
+from app.models.purchase import brand_names, invoice_fingerprint
 from app.schemas import PurchaseIn, PurchaseOut
 from app.security import get_current_user
+from app.services.invoice_service import find_duplicate_of, invoice_filter
+from app.services.mission_catalog_service import CatalogMission, mission_catalog
 from app.services.notification_service import send_notification
+from app.services.spend_service import record_purchase_review_spend
 from app.services.stamp_service import award_stamps
+from app.services.submission_service import (
+    ResolvedSubmission,
+    claim,
+    move_mission_log,
+    resolve_submission,
+)
+from app.services.user_stats_service import record_mission_transition, record_reward_points
 
 router = APIRouter(prefix="/purchase", tags=["purchase"])
 
@@ -38,19 +49,8 @@ def _mission_log_payload(payload: PurchaseIn) -> dict[str, float | str | list[st
     }
 
 
-async def _find_active_purchase_mission(session: AsyncSession) -> Mission | None:
-    now = datetime.utcnow()
-    stmt = (
-        select(Mission)
-        .where(
-            Mission.type == MissionType.PURCHASE,
-            Mission.is_active.is_(True),
-            or_(Mission.start_at.is_(None), Mission.start_at <= now),
-            or_(Mission.end_at.is_(None), Mission.end_at >= now),
-        )
-        .limit(1)
-    )
-    return await session.scalar(stmt)
+async def _find_active_purchase_mission() -> CatalogMission | None:
+    return await mission_catalog.first_active(MissionType.PURCHASE)
 
 
 def _purchase_to_out(purchase: Purchase) -> PurchaseOut:
@@ -66,36 +66,25 @@ def _notification_payload(resource_id: uuid.UUID, mission: Mission | None) -> di
     }
 
 
-async def _resolve_purchase_mission(
-    session: AsyncSession,
-    purchase: Purchase,
-) -> tuple[Mission | None, MissionLog | None]:
-    mission_log = None
-    mission = None
-    if purchase.mission_log_id:
-        mission_log = await session.get(MissionLog, purchase.mission_log_id)
-        if mission_log:
-            mission = await session.get(Mission, mission_log.mission_id)
-    elif purchase.mission_id:
-        mission = await session.get(Mission, purchase.mission_id)
-    return mission, mission_log
-
-
 async def approve_purchase_record(
     session: AsyncSession,
-    purchase: Purchase,
+    resolved: ResolvedSubmission[Purchase],
 ) -> tuple[Mission | None, MissionLog | None]:
-    mission, mission_log = await _resolve_purchase_mission(session, purchase)
-    purchase.status = MissionStatus.APPROVED
-    session.add(purchase)
+    purchase, mission_log, mission = resolved.submission, resolved.mission_log, resolved.mission
+    previous = purchase.status
+    if not await claim(session, purchase, status=MissionStatus.APPROVED):
+        return mission, mission_log
+    await record_purchase_review_spend(session, {purchase.id: previous}, MissionStatus.APPROVED)
     if mission_log:
-        mission_log.status = MissionStatus.APPROVED
-        session.add(mission_log)
+        await move_mission_log(
+            session, mission_log, MissionStatus.APPROVED, mission.reward_points if mission else 0
+        )
+    elif mission:
+        # Logged missions book their points in move_mission_log.
+        await record_reward_points(
+            session, purchase.user_id, mission.reward_points, "PURCHASE_APPROVED"
+        )
     if mission:
-        user = await session.get(User, purchase.user_id)
-        if user:
-            user.total_points += mission.reward_points
-            session.add(user)
         await award_stamps(
             session,
             purchase.user_id,
@@ -113,14 +102,21 @@ async def approve_purchase_record(
 
 async def reject_purchase_record(
     session: AsyncSession,
-    purchase: Purchase,
+    resolved: ResolvedSubmission[Purchase],
 ) -> tuple[Mission | None, MissionLog | None]:
-    mission, mission_log = await _resolve_purchase_mission(session, purchase)
-    purchase.status = MissionStatus.REJECTED
-    session.add(purchase)
+    purchase, mission_log, mission = resolved.submission, resolved.mission_log, resolved.mission
+    previous = purchase.status
+    if not await claim(session, purchase, status=MissionStatus.REJECTED):
+        return mission, mission_log
+    await record_purchase_review_spend(session, {purchase.id: previous}, MissionStatus.REJECTED)
     if mission_log:
-        mission_log.status = MissionStatus.REJECTED
-        session.add(mission_log)
+        await move_mission_log(
+            session, mission_log, MissionStatus.REJECTED, mission.reward_points if mission else 0
+        )
+    elif mission and previous == MissionStatus.APPROVED:
+        await record_reward_points(
+            session, purchase.user_id, -mission.reward_points, "PURCHASE_REVOKED"
+        )
     await send_notification(
         session,
         purchase.user_id,
@@ -136,7 +132,9 @@ async def create_purchase(
     user: User = Depends(get_current_user),
     session: AsyncSession = Depends(get_session),
 ) -> PurchaseOut:
+    fingerprint = invoice_fingerprint(payload.invoice_number)
     purchase = Purchase(
+        id=uuid.uuid4(),
         user_id=user.id,
         amount=Decimal(str(payload.amount)),
         purchase_date=payload.purchase_date,
@@ -146,25 +144,37 @@ async def create_purchase(
         invoice_number=payload.invoice_number,
         product_category=payload.product_category,
         barcode=payload.barcode,
+        invoice_fingerprint=fingerprint,
+        duplicate_of_id=await find_duplicate_of(session, fingerprint),
         status=MissionStatus.PENDING,
     )
-    session.add(purchase)
+    if fingerprint is not None:
+        on_commit(session, partial(invoice_filter.add, fingerprint))
 
-    mission = await _find_active_purchase_mission(session)
+    mission = await _find_active_purchase_mission()
     if mission:
         mission_log = MissionLog(
+            id=uuid.uuid4(),
             mission_id=mission.id,
             user_id=user.id,
             status=MissionStatus.PENDING,
+            is_repeatable=True,
             payload=_mission_log_payload(payload),
         )
         session.add(mission_log)
-        await session.flush()
         purchase.mission_id = mission.id
         purchase.mission_log_id = mission_log.id
+        await record_mission_transition(
+            session, user.id, None, MissionStatus.PENDING, mission_id=mission.id
+        )
 
-    await session.commit()
-    await session.refresh(purchase)
+    # Added only now so the mission lookup above does not autoflush a
+    # half-built row; one flush then writes all rows and the server defaults.
+    session.add(purchase)
+    session.add_all(
+        PurchaseBrand(purchase_id=purchase.id, brand=brand) for brand in brand_names(payload.brands)
+    )
+    await session.flush()
     return _purchase_to_out(purchase)
 
 
@@ -174,15 +184,12 @@ async def approve_purchase(
     _admin: User = Depends(require_admin),
     session: AsyncSession = Depends(get_session),
 ) -> PurchaseOut:
-    purchase = await session.get(Purchase, purchase_id)
-    if purchase is None:
+    resolved = await resolve_submission(session, Purchase, purchase_id)
+    if resolved is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Purchase not found.")
 
-    mission, _ = await approve_purchase_record(session, purchase)
-
-    await session.commit()
-    await session.refresh(purchase)
-    return _purchase_to_out(purchase)
+    await approve_purchase_record(session, resolved)
+    return _purchase_to_out(resolved.submission)
 
 
 @router.post("/{purchase_id}/reject", response_model=PurchaseOut)
@@ -191,22 +198,19 @@ async def reject_purchase(
     _admin: User = Depends(require_admin),
     session: AsyncSession = Depends(get_session),
 ) -> PurchaseOut:
-    purchase = await session.get(Purchase, purchase_id)
-    if purchase is None:
+    resolved = await resolve_submission(session, Purchase, purchase_id)
+    if resolved is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Purchase not found.")
 
-    await reject_purchase_record(session, purchase)
-
-    await session.commit()
-    await session.refresh(purchase)
-    return _purchase_to_out(purchase)
+    await reject_purchase_record(session, resolved)
+    return _purchase_to_out(resolved.submission)
 
 
 @router.get("/{purchase_id}", response_model=PurchaseOut)
 async def get_purchase(
     purchase_id: uuid.UUID,
     user: User = Depends(get_current_user),
-    session: AsyncSession = Depends(get_session),
+    session: AsyncSession = Depends(get_read_session),
 ) -> PurchaseOut:
     purchase = await session.get(Purchase, purchase_id)
     if purchase is None:
@@ -3,10 +3,8 @@
 from __future__ import annotations
 
 import uuid
-from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import require_admin_user as require_admin
@@ -14,8 +12,16 @@ from app.db import get_session
 from app.models import Mission, MissionLog, MissionStatus, MissionType, Referral, User
 from app.schemas import ReferralCreate, ReferralResponse
 from app.security import get_current_user
+from app.services.mission_catalog_service import mission_catalog
 from app.services.notification_service import send_notification
 from app.services.stamp_service import award_stamps
+from app.services.submission_service import (
+    ResolvedSubmission,
+    claim,
+    move_mission_log,
+    resolve_submission,
+)
+from app.services.user_stats_service import record_mission_transition
 
 router = APIRouter(prefix="/referral", tags=["referral"])
 
@@ -29,46 +35,38 @@ def _notification_payload(resource_id: uuid.UUID, mission: Mission | None) -> di
     }
 
 
-async def _resolve_referral_mission(
-    session: AsyncSession,
-    referral: Referral,
-) -> tuple[Mission | None, MissionLog | None]:
-    mission_log = None
-    mission = None
-    if referral.mission_log_id:
-        mission_log = await session.get(MissionLog, referral.mission_log_id)
-        if mission_log:
-            mission = await session.get(Mission, mission_log.mission_id)
-    elif referral.mission_id:
-        mission = await session.get(Mission, referral.mission_id)
-    return mission, mission_log
-
-
 async def mark_referral_first_purchase_record(
     session: AsyncSession,
-    referral: Referral,
+    resolved: ResolvedSubmission[Referral],
 ) -> tuple[Mission | None, MissionLog | None]:
-    mission, mission_log = await _resolve_referral_mission(session, referral)
-    referral.first_purchase_completed = True
-    session.add(referral)
+    referral, mission_log, mission = resolved.submission, resolved.mission_log, resolved.mission
+    if not await claim(session, referral, first_purchase_completed=True):
+        return mission, mission_log
     if mission_log:
-        mission_log.status = MissionStatus.APPROVED
-        session.add(mission_log)
+        await move_mission_log(
+            session, mission_log, MissionStatus.APPROVED, mission.reward_points if mission else 0
+        )
     elif mission:
         mission_log = MissionLog(
+            id=uuid.uuid4(),
             mission_id=mission.id,
             user_id=referral.referrer_user_id,
             status=MissionStatus.APPROVED,
+            is_repeatable=True,
             payload={"referral_id": str(referral.id)},
         )
         session.add(mission_log)
-        await session.flush()
         referral.mission_log_id = mission_log.id
+        await record_mission_transition(
+            session,
+            referral.referrer_user_id,
+            None,
+            MissionStatus.APPROVED,
+            mission.reward_points,
+            mission_log.id,
+            mission_id=mission_log.mission_id,
+        )
     if mission:
-        user = await session.get(User, referral.referrer_user_id)
-        if user:
-            user.total_points += mission.reward_points
-            session.add(user)
         await award_stamps(
             session,
             referral.referrer_user_id,
@@ -91,6 +89,7 @@ async def create_referral(
     session: AsyncSession = Depends(get_session),
 ) -> ReferralResponse:
     referral = Referral(
+        id=uuid.uuid4(),
         referrer_user_id=user.id,
         store_name=payload.store_name,
         manager_name=payload.manager_name,
@@ -98,36 +97,27 @@ async def create_referral(
         city=payload.city,
         notes=payload.notes,
     )
-    session.add(referral)
 
-    now = datetime.utcnow()
-    mission_stmt = (
-        select(Mission)
-        .where(
-            Mission.type == MissionType.REFERRAL,
-            Mission.is_active.is_(True),
-            or_(Mission.start_at.is_(None), Mission.start_at <= now),
-            or_(Mission.end_at.is_(None), Mission.end_at >= now),
-        )
-        .limit(1)
-    )
-    mission = await session.scalar(mission_stmt)
+    mission = await mission_catalog.first_active(MissionType.REFERRAL)
     mission_log_id: uuid.UUID | None = None
     if mission:
         mission_log = MissionLog(
+            id=uuid.uuid4(),
             mission_id=mission.id,
             user_id=user.id,
             status=MissionStatus.PENDING,
+            is_repeatable=True,
             payload={"referral_id": str(referral.id)},
         )
         session.add(mission_log)
-        await session.flush()
         referral.mission_id = mission.id
         referral.mission_log_id = mission_log.id
         mission_log_id = mission_log.id
+        await record_mission_transition(
+            session, user.id, None, MissionStatus.PENDING, mission_id=mission.id
+        )
 
-    await session.commit()
-    await session.refresh(referral)
+    session.add(referral)
     return ReferralResponse(
         referral_id=referral.id,
         mission_log_id=mission_log_id,
@@ -140,11 +130,9 @@ async def mark_first_purchase(
     _admin: User = Depends(require_admin),
     session: AsyncSession = Depends(get_session),
 ) -> dict[str, str]:
-    referral = await session.get(Referral, referral_id)
-    if referral is None:
+    resolved = await resolve_submission(session, Referral, referral_id)
+    if resolved is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Referral not found.")
 
-    await mark_referral_first_purchase_record(session, referral)
-
-    await session.commit()
+    await mark_referral_first_purchase_record(session, resolved)
     return {"status": "ok"}
@@ -2,13 +2,10 @@ from aiogram import Bot, Dispatcher, Router
 from aiogram.client.default import DefaultBotProperties
 from aiogram.filters import Command
 from aiogram.types import Message, Update, InlineKeyboardMarkup, InlineKeyboardButton, WebAppInfo
-from fastapi import APIRouter, Request
 from app.config import settings
 
-bot = Bot(
-    token=settings.telegram_bot_token,
-    default=DefaultBotProperties(parse_mode="HTML")
-)
+_bot: Bot | None = None
+_dp: Dispatcher | None = None
 
 router = Router()
 
@@ -33,15 +30,24 @@ async def start_cmd(message: Message):
     )
 
 
-dp = Dispatcher()
-dp.include_router(router)
+def get_bot() -> Bot:
+    global _bot
+    if _bot is None:
+        _bot = Bot(
+            token=settings.telegram_bot_token,
+            default=DefaultBotProperties(parse_mode="HTML")
+        )
+    return _bot
 
-api_router = APIRouter()
 
+def get_dispatcher() -> Dispatcher:
+    global _dp
+    if _dp is None:
+        _dp = Dispatcher()
+        _dp.include_router(router)
+    return _dp
 
-@api_router.post("/bot/webhook")
-async def telegram_webhook(request: Request):
-    data = await request.json()
+
+async def feed_update(data: dict) -> None:
     update = Update(**data)
-    await dp.feed_update(bot, update)
-    return {"ok": True}
\ No newline at end of file
+    await get_dispatcher().feed_update(get_bot(), update)
@@ -0,0 +1,23 @@
+"""Telegram webhook route; aiogram is only imported once an update arrives."""
+
+from fastapi import APIRouter, Request
+
+api_router = APIRouter()
+
+
+def warm_up_bot() -> None:
+    """Import aiogram and build the bot and dispatcher ahead of the first update."""
+
+    from app.bot.bot import get_bot, get_dispatcher
+
+    get_bot()
+    get_dispatcher()
+
+
+@api_router.post("/bot/webhook")
+async def telegram_webhook(request: Request):
+    from app.bot.bot import feed_update
+
+    data = await request.json()
+    await feed_update(data)
+    return {"ok": True}
@@ -0,0 +1,294 @@
+"""Small in-process caches shared by the request hot paths."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from typing import Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded LRU cache whose entries expire after a time-to-live.
+
+    The cache is not thread-safe; it is meant to be used from the event loop
+    of a single worker process.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """Return the cached value for ``key`` or ``default`` when absent or expired."""
+
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Store ``value`` under ``key``, evicting the least recently used entry when full."""
+
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> None:
+        """Drop ``key`` from the cache if present."""
+
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict[str, int | float]:
+        """Return size and hit/miss counters for monitoring."""
+
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings.
+
+    ``might_contain`` never returns ``False`` for an added key; it returns
+    ``True`` for absent keys at roughly ``error_rate`` while fewer than
+    ``capacity`` keys have been added.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        capacity = max(capacity, 1)
+        self.size = max(int(-capacity * math.log(error_rate) / math.log(2) ** 2), 8)
+        self.hashes = max(round(self.size / capacity * math.log(2)), 1)
+        self.count = 0
+        self.checks = 0
+        self.positives = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def might_contain(self, key: str) -> bool:
+        self.checks += 1
+        found = all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+        self.positives += found
+        return found
+
+    def clear(self) -> None:
+        self._bits = bytearray(len(self._bits))
+        self.count = 0
+
+    def stats(self) -> dict[str, int | float]:
+        """Return fill and check counters for monitoring."""
+
+        return {
+            "bits": self.size,
+            "hashes": self.hashes,
+            "added": self.count,
+            "checks": self.checks,
+            "positives": self.positives,
+            "positive_rate": round(self.positives / self.checks, 4) if self.checks else 0.0,
+        }
+
+
+class MemoryStore:
+    """In-process JSON value store with the same async interface as ``RedisStore``."""
+
+    def __init__(self, maxsize: int) -> None:
+        self._cache: TTLCache[str, dict] = TTLCache(maxsize=maxsize, ttl=0)
+
+    async def get(self, key: str) -> dict | None:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: dict, ttl: float) -> None:
+        self._cache.set(key, value, ttl=ttl)
+
+    async def delete(self, key: str) -> None:
+        self._cache.pop(key)
+
+    async def delete_many(self, keys: list[str]) -> None:
+        for key in keys:
+            self._cache.pop(key)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+class RedisStore:
+    """JSON value store backed by Redis, shared by every worker process.
+
+    Redis failures are logged and treated as cache misses so an outage only
+    costs the database round trips the cache was saving.
+    """
+
+    def __init__(self, url: str) -> None:
+        from redis import asyncio as aioredis
+
+        self._client = aioredis.from_url(url)
+
+    async def get(self, key: str) -> dict | None:
+        try:
+            raw = await self._client.get(key)
+        except Exception as exc:
+            logger.warning("Redis GET %s failed: %s", key, exc)
+            return None
+        return json.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, value: dict, ttl: float) -> None:
+        try:
+            await self._client.set(key, json.dumps(value), px=max(int(ttl * 1000), 1))
+        except Exception as exc:
+            logger.warning("Redis SET %s failed: %s", key, exc)
+
+    async def delete(self, key: str) -> None:
+        try:
+            await self._client.delete(key)
+        except Exception as exc:
+            logger.warning("Redis DEL %s failed: %s", key, exc)
+
+    async def delete_many(self, keys: list[str]) -> None:
+        try:
+            await self._client.delete(*keys)
+        except Exception as exc:
+            logger.warning("Redis DEL of %d keys failed: %s", len(keys), exc)
+
+
+class StaleWhileRevalidateCache:
+    """Read-through cache that serves expired entries while refreshing them.
+
+    Entries are fresh for ``ttl`` seconds and may then be served for another
+    ``stale_ttl`` seconds while a single background task reloads them.
+    Concurrent misses for the same key share one load, and ``invalidate``
+    discards both the stored entry and any load already in flight, so a
+    value read before a write is never stored after it.
+    """
+
+    def __init__(
+        self,
+        store: MemoryStore | RedisStore,
+        namespace: str,
+        ttl: float,
+        stale_ttl: float,
+    ) -> None:
+        self.store = store
+        self.namespace = namespace
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._background: set[asyncio.Task] = set()
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.namespace}:{key}"
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[dict]]) -> dict:
+        """Return the cached value for ``key``, calling ``loader`` to fill or refresh it."""
+
+        store_key = self._key(key)
+        entry = await self.store.get(store_key)
+        if entry is not None:
+            if entry["fresh_until"] > time.time():
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                if store_key not in self._inflight:
+                    refresh = self._start_load(store_key, loader)
+                    self._background.add(refresh)
+                    refresh.add_done_callback(self._background.discard)
+            return entry["value"]
+
+        self.misses += 1
+        task = self._inflight.get(store_key) or self._start_load(store_key, loader)
+        return await asyncio.shield(task)
+
+    def _start_load(self, store_key: str, loader: Callable[[], Awaitable[dict]]) -> asyncio.Task:
+        task = asyncio.get_running_loop().create_task(self._load(store_key, loader))
+        self._inflight[store_key] = task
+        return task
+
+    async def _load(self, store_key: str, loader: Callable[[], Awaitable[dict]]) -> dict:
+        current = asyncio.current_task()
+        try:
+            value = await loader()
+            if self._inflight.get(store_key) is current:
+                entry = {"value": value, "fresh_until": time.time() + self.ttl}
+                await self.store.set(store_key, entry, ttl=self.ttl + self.stale_ttl)
+            return value
+        finally:
+            if self._inflight.get(store_key) is current:
+                del self._inflight[store_key]
+
+    async def invalidate(self, key: Hashable) -> None:
+        """Forget ``key`` so the next read loads it from the source again."""
+
+        store_key = self._key(key)
+        self._inflight.pop(store_key, None)
+        await self.store.delete(store_key)
+
+    async def invalidate_many(self, keys: list[Hashable]) -> None:
+        """Forget several keys with a single store round trip."""
+
+        store_keys = [self._key(key) for key in keys]
+        for store_key in store_keys:
+            self._inflight.pop(store_key, None)
+        await self.store.delete_many(store_keys)
+
+    def stats(self) -> dict[str, int | float | str]:
+        """Return hit, stale-hit and miss counters for monitoring."""
+
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "backend": type(self.store).__name__,
+            "inflight": len(self._inflight),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,110 @@
+"""Maintenance commands, run as ``python -m app.cli <command>``."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+from app.db import async_session
+from app.services.invoice_service import invoice_filter
+from app.services.mission_catalog_service import mission_catalog
+from app.services.points_service import compact_points_snapshots, reconcile_points
+from app.services.purchase_import_service import IMPORT_FORMATS, import_purchases
+from app.services.spend_service import rebuild_spend_rollups
+from app.services.user_stats_service import rebuild_user_stats
+
+
+async def _rebuild_user_stats(args: argparse.Namespace) -> None:
+    async with async_session() as session:
+        count = await rebuild_user_stats(session)
+        await session.commit()
+    print(f"user_stats rebuilt for {count} users")
+
+
+async def _rebuild_spend_rollups(args: argparse.Namespace) -> None:
+    async with async_session() as session:
+        count = await rebuild_spend_rollups(session)
+        await session.commit()
+    print(f"spend rollups rebuilt from {count} approved purchases")
+
+
+async def _compact_points(args: argparse.Namespace) -> None:
+    async with async_session() as session:
+        count = await compact_points_snapshots(session)
+        await session.commit()
+    print(f"points snapshots compacted for {count} users")
+
+
+async def _reconcile_points(args: argparse.Namespace) -> None:
+    async with async_session() as session:
+        drifted = await reconcile_points(session, args.limit)
+    for row in drifted:
+        print(
+            f"{row['user_id']}: ledger={row['ledger_balance']} "
+            f"users.total_points={row['user_total_points']} "
+            f"user_stats.total_points={row['dashboard_total_points']}"
+        )
+    print(f"{len(drifted)} users with drifting point balances")
+
+
+async def _read_chunks(path: Path, size: int = 1 << 16) -> AsyncIterator[bytes]:
+    with path.open("rb") as handle:
+        while chunk := handle.read(size):
+            yield chunk
+
+
+async def _import_purchases(args: argparse.Namespace) -> None:
+    path = Path(args.path)
+    fmt = args.format or ("csv" if path.suffix.lower() == ".csv" else "ndjson")
+    await mission_catalog.reload()
+    await invoice_filter.load()
+    report = await import_purchases(_read_chunks(path), fmt, args.batch_size)
+    for error in report.errors:
+        print(f"line {error['line']}: {error['error']}")
+    print(
+        f"{report.imported} of {report.rows} rows imported, "
+        f"{report.duplicates} duplicate invoices, {report.failed} failed"
+    )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    rebuild_stats = commands.add_parser(
+        "rebuild-user-stats", help="Recompute user_stats from mission logs, stamps and the points ledger."
+    )
+    rebuild_stats.set_defaults(handler=_rebuild_user_stats)
+
+    rebuild_spend = commands.add_parser(
+        "rebuild-spend-rollups", help="Recompute the monthly spend rollups from approved purchases."
+    )
+    rebuild_spend.set_defaults(handler=_rebuild_spend_rollups)
+
+    compact_points = commands.add_parser(
+        "compact-points", help="Fold new ledger entries into the per-user snapshots."
+    )
+    compact_points.set_defaults(handler=_compact_points)
+
+    reconcile = commands.add_parser(
+        "reconcile-points", help="Report users whose point balances disagree."
+    )
+    reconcile.add_argument("--limit", type=int, default=100)
+    reconcile.set_defaults(handler=_reconcile_points)
+
+    import_file = commands.add_parser(
+        "import-purchases", help="Import a distributor CSV or NDJSON purchase file."
+    )
+    import_file.add_argument("path")
+    import_file.add_argument("--format", choices=IMPORT_FORMATS)
+    import_file.add_argument("--batch-size", type=int)
+    import_file.set_defaults(handler=_import_purchases)
+
+    args = parser.parse_args(argv)
+    asyncio.run(args.handler(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -11,7 +11,9 @@ class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_file=".env")
 
     database_url: str
-    redis_url: str
+    database_replica_url: str | None = None
+    replica_read_your_writes_seconds: float = 5.0
+    redis_url: str = ""
     telegram_bot_token: str
     secret_key: str
     access_token_expire_minutes: int = 43_200
@@ -20,6 +22,41 @@ class Settings(BaseSettings):
     admin_username: str
     admin_password: str
     admin_token: str | None = None
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0
+    db_pool_recycle: int = 1_800
+    db_pool_pre_ping: bool = True
+    db_statement_cache_size: int = 100
+    sqlite_reader_pool_size: int = 8
+    sqlite_busy_timeout_ms: int = 5_000
+    sqlite_mmap_size: int = 268_435_456
+    sqlite_cache_size_kib: int = 65_536
+    sql_instrumentation_enabled: bool = True
+    lazy_startup: bool = True
+    log_level: str = "INFO"
+    sql_n_plus_one_threshold: int = 3
+    user_cache_ttl_seconds: int = 60
+    user_cache_max_entries: int = 10_000
+    token_cache_max_entries: int = 50_000
+    telegram_init_data_max_age_seconds: int = 86_400
+    telegram_init_data_cache_size: int = 10_000
+    telegram_init_data_cache_ttl_seconds: int = 300
+    dashboard_cache_ttl_seconds: float = 30.0
+    dashboard_cache_stale_seconds: float = 300.0
+    dashboard_cache_max_entries: int = 10_000
+    points_snapshot_interval_seconds: float = 300.0
+    points_compaction_horizon_seconds: float = 60.0
+    mission_catalog_refresh_seconds: float = 60.0
+    mission_status_cache_ttl_seconds: int = 10
+    mission_status_cache_max_entries: int = 10_000
+    bulk_review_max_items: int = 5_000
+    mission_scheduler_poll_seconds: float = 30.0
+    invoice_bloom_capacity: int = 1_000_000
+    invoice_bloom_error_rate: float = 0.01
+    invoice_filter_refresh_seconds: float = 60.0
+    purchase_import_batch_size: int = 1_000
+    purchase_import_max_errors: int = 1_000
 
     @staticmethod
     def build_render_postgres_url() -> str:
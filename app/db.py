@@ -1,47 +1,411 @@
-from contextlib import asynccontextmanager
+import asyncio
+import hashlib
+import inspect
+import time
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from dataclasses import dataclass
+from itertools import chain
 
+from fastapi import Request
 from sqlalchemy.ext.asyncio import (
     AsyncEngine,
     AsyncSession,
     create_async_engine,
 )
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util import await_only
 
-from sqlalchemy import text
+from sqlalchemy import event, exc, inspect as inspect_schema, text
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.schema import CreateColumn
 
+from .cache import TTLCache
 from .config import settings
-from .models import Base  # مهم: اضافه شد
+from .models import Base, Referral, User  # مهم: اضافه شد
 
 
-engine: AsyncEngine = create_async_engine(
-    settings.resolved_database_url,
-    future=True,
-)
+@dataclass
+class PoolStats:
+    """Checkout counters collected by ``TimedQueuePool``."""
+
+    checkouts: int = 0
+    timeouts: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    def record(self, waited: float, timed_out: bool) -> None:
+        if timed_out:
+            self.timeouts += 1
+        else:
+            self.checkouts += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+
+pool_stats = PoolStats()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_stats.record(time.perf_counter() - started, timed_out=True)
+            raise
+        pool_stats.record(time.perf_counter() - started, timed_out=False)
+        return connection
+
+
+def _engine_options(url: str) -> dict:
+    options: dict = {
+        "future": True,
+        "poolclass": TimedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+    if url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+        }
+    elif url.startswith("sqlite"):
+        # WAL lets every pooled connection read concurrently with the writer.
+        options["pool_size"] = settings.sqlite_reader_pool_size
+    return options
+
+
+def _sqlite_on_connect(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.sqlite_busy_timeout_ms)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size)}")
+    cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_kib)}")
+    cursor.close()
+    # Primary keys default to uuid_generate_v4(), which only PostgreSQL provides.
+    dbapi_connection.create_function("uuid_generate_v4", 0, lambda: uuid.uuid4().hex)
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    created = create_async_engine(url, **_engine_options(url))
+    if created.url.get_backend_name() == "sqlite":
+        event.listen(created.sync_engine, "connect", _sqlite_on_connect)
+    return created
+
+
+engine: AsyncEngine = _create_engine(settings.resolved_database_url)
+
+
+class PrimarySession(Session):
+    """Session class for the primary engine; commits mark users as recent writers."""
 
 
 async_session = sessionmaker(
     engine,
     class_=AsyncSession,
+    sync_session_class=PrimarySession,
     expire_on_commit=False,
 )
 
+if settings.database_replica_url:
+    read_engine: AsyncEngine = _create_engine(settings.database_replica_url)
+else:
+    read_engine = engine
+
+read_async_session = sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+# Users whose own writes were committed within the read-your-writes window.
+# The window is tracked per process, so it assumes sticky or single-worker routing.
+recent_writers: TTLCache[uuid.UUID, bool] = TTLCache(
+    maxsize=100_000,
+    ttl=settings.replica_read_your_writes_seconds,
+)
+
+
+def _written_user_id(obj: object) -> uuid.UUID | None:
+    if isinstance(obj, User):
+        return obj.id
+    if isinstance(obj, Referral):
+        return obj.referrer_user_id
+    return getattr(obj, "user_id", None)
+
+
+@event.listens_for(PrimarySession, "after_flush")
+def _collect_written_users(session: Session, flush_context) -> None:
+    written = session.info.setdefault("written_user_ids", set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        user_id = _written_user_id(obj)
+        if user_id is not None:
+            written.add(user_id)
+
+
+@event.listens_for(PrimarySession, "after_commit")
+def _mark_recent_writers(session: Session) -> None:
+    for user_id in session.info.pop("written_user_ids", ()):
+        recent_writers.set(user_id, True)
+    for callback in session.info.pop("on_commit", ()):
+        result = callback()
+        if inspect.isawaitable(result):
+            await_only(result)
+
+
+@event.listens_for(PrimarySession, "after_rollback")
+def _discard_written_users(session: Session) -> None:
+    session.info.pop("written_user_ids", None)
+    session.info.pop("on_commit", None)
+
+
+def note_write(session: AsyncSession, user_id: uuid.UUID) -> None:
+    """Mark ``user_id`` as written by a Core statement the flush hook cannot see."""
+
+    session.info.setdefault("written_user_ids", set()).add(user_id)
+
+
+def dialect_insert(session: AsyncSession):
+    """Return the ``insert`` construct with ``ON CONFLICT`` support for the session's
+    dialect, or ``None`` when the backend has no native upsert."""
+
+    name = session.bind.dialect.name
+    if name == "postgresql":
+        return postgresql_insert
+    if name == "sqlite":
+        return sqlite_insert
+    return None
+
+
+def on_commit(session: AsyncSession, callback: Callable[[], Awaitable[None] | None]) -> None:
+    """Run ``callback`` once the session's current transaction has committed.
+
+    Coroutine callbacks are awaited before ``commit()`` returns.
+    """
+
+    session.info.setdefault("on_commit", []).append(callback)
+
+
+# Keeps every IN list well below SQLite's bound-parameter limit.
+IN_LIST_CHUNK_SIZE = 500
+
+
+def chunked(values: list, size: int = IN_LIST_CHUNK_SIZE) -> Iterator[list]:
+    """Split ``values`` into slices short enough for one ``IN (...)`` clause."""
+
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+# SQLite allows a single writer per database file. Instead of letting
+# concurrent write transactions race for the file lock until busy_timeout
+# expires, writers queue here (FIFO) and hold the lane until their
+# transaction ends; readers are never blocked.
+_sqlite_writer_lock = asyncio.Lock()
+
+
+def _acquire_writer_lane(session: Session) -> None:
+    if not session.info.get("holds_writer_lane"):
+        await_only(_sqlite_writer_lock.acquire())
+        session.info["holds_writer_lane"] = True
+
+
+def _sqlite_before_flush(session: Session, flush_context, instances) -> None:
+    if session.new or session.dirty or session.deleted:
+        _acquire_writer_lane(session)
+
+
+def _sqlite_do_orm_execute(orm_execute_state) -> None:
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _acquire_writer_lane(orm_execute_state.session)
+
+
+def _sqlite_after_transaction_end(session: Session, transaction) -> None:
+    if transaction.parent is None and session.info.pop("holds_writer_lane", False):
+        _sqlite_writer_lock.release()
+
+
+async def acquire_writer_lane(session: AsyncSession) -> None:
+    """Queue for the SQLite writer lane before a read-modify-write.
+
+    The lane is otherwise only taken at the first flush or DML statement,
+    so rows read before that can be changed by another writer in between.
+    Taking it before the read keeps them current until the transaction
+    ends. A no-op on PostgreSQL, where ``FOR UPDATE`` locks the rows.
+    """
+
+    sync_session = session.sync_session
+    if engine.url.get_backend_name() != "sqlite" or not isinstance(sync_session, PrimarySession):
+        return
+    # Begin the transaction first, so its end always releases the lane.
+    await session.connection()
+    if not sync_session.info.get("holds_writer_lane"):
+        await _sqlite_writer_lock.acquire()
+        sync_session.info["holds_writer_lane"] = True
+
+
+if engine.url.get_backend_name() == "sqlite":
+    event.listen(PrimarySession, "before_flush", _sqlite_before_flush)
+    event.listen(PrimarySession, "do_orm_execute", _sqlite_do_orm_execute)
+    event.listen(PrimarySession, "after_transaction_end", _sqlite_after_transaction_end)
+
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """Request-scoped unit of work on the primary database.
+
+    Handlers only add and flush; the transaction is committed once after the
+    handler returns, or rolled back if it raised.
+    """
 
-@asynccontextmanager
-async def get_session() -> AsyncSession:
     async with async_session() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def get_read_session(request: Request) -> AsyncIterator[AsyncSession]:
+    """Yield a session on the read replica, or on the primary for recent writers.
+
+    ``get_current_user`` records the caller on ``request.state``; users who
+    committed a write within ``replica_read_your_writes_seconds`` keep reading
+    from the primary so they never observe replication lag on their own data.
+    """
+
+    async with read_session_factory(getattr(request.state, "user_id", None))() as session:
         yield session
 
 
+def read_session_factory(user_id: uuid.UUID | None = None) -> sessionmaker:
+    """Return the session factory reads on behalf of ``user_id`` should use."""
+
+    if read_engine is engine or (user_id is not None and recent_writers.get(user_id)):
+        return async_session
+    return read_async_session
+
+
+def pool_status() -> dict:
+    """Return live pool occupancy and cumulative checkout wait statistics."""
+
+    pool = engine.pool
+    attempts = pool_stats.checkouts + pool_stats.timeouts
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": pool.overflow(),
+        "max_overflow": settings.db_max_overflow,
+        "checkouts": pool_stats.checkouts,
+        "timeouts": pool_stats.timeouts,
+        "avg_wait_ms": round(pool_stats.total_wait / attempts * 1000, 3) if attempts else 0.0,
+        "max_wait_ms": round(pool_stats.max_wait * 1000, 3),
+    }
+
+
+def _schema_fingerprint() -> int:
+    """Stable hash of the declared tables, columns and indexes."""
+
+    parts: list[str] = []
+    for table in Base.metadata.sorted_tables:
+        parts.append(table.name)
+        parts.extend(f"{column.name}:{column.type!r}" for column in table.columns)
+        parts.extend(sorted(index.name for index in table.indexes))
+    digest = hashlib.sha256("|".join(parts).encode()).hexdigest()
+    return int(digest[:7], 16)
+
+
+# Rows that predate an added column and need more than its server default,
+# mirroring the data steps of the matching Alembic migration.
+_SQLITE_BACKFILLS = {
+    ("mission_logs", "is_repeatable"): (
+        "UPDATE mission_logs SET is_repeatable = true WHERE id IN ("
+        "SELECT mission_log_id FROM purchases WHERE mission_log_id IS NOT NULL "
+        "UNION SELECT mission_log_id FROM displays WHERE mission_log_id IS NOT NULL "
+        "UNION SELECT mission_log_id FROM referrals WHERE mission_log_id IS NOT NULL)",
+        "UPDATE mission_logs SET is_repeatable = true "
+        "WHERE NOT is_repeatable AND EXISTS ("
+        "SELECT 1 FROM mission_logs AS earlier "
+        "WHERE earlier.mission_id = mission_logs.mission_id "
+        "AND earlier.user_id = mission_logs.user_id "
+        "AND NOT earlier.is_repeatable "
+        "AND (earlier.created_at < mission_logs.created_at "
+        "OR (earlier.created_at = mission_logs.created_at AND earlier.id < mission_logs.id)))",
+    ),
+    ("purchases", "spend_city"): (
+        "UPDATE purchases SET spend_city = ("
+        "SELECT COALESCE(users.city, '') FROM users WHERE users.id = purchases.user_id) "
+        "WHERE status = 'APPROVED'",
+    ),
+}
+
+
+def _upgrade_sqlite_tables(conn: Connection) -> None:
+    """Bring tables that predate the models up to date.
+
+    ``create_all`` only creates missing tables, so columns and indexes
+    declared since an existing table was created are added here.
+    """
+
+    inspector = inspect_schema(conn)
+    preparer = conn.dialect.identifier_preparer
+    for table in Base.metadata.sorted_tables:
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present:
+                continue
+            if not column.nullable and column.server_default is None:
+                raise RuntimeError(
+                    f"{table.name}.{column.name} is NOT NULL without a server default and "
+                    "cannot be added to the existing SQLite database; recreate it."
+                )
+            ddl = CreateColumn(column).compile(dialect=conn.dialect)
+            conn.exec_driver_sql(f"ALTER TABLE {preparer.format_table(table)} ADD COLUMN {ddl}")
+            for statement in _SQLITE_BACKFILLS.get((table.name, column.name), ()):
+                conn.exec_driver_sql(statement)
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+async def _create_sqlite_schema(sqlite_engine: AsyncEngine) -> bool:
+    """Create or upgrade the schema unless ``PRAGMA user_version`` already
+    matches the models."""
+
+    fingerprint = _schema_fingerprint()
+    async with sqlite_engine.begin() as conn:
+        if await conn.scalar(text("PRAGMA user_version")) == fingerprint:
+            return False
+        # به SQLAlchemy می‌گوید همه جداول را بسازد
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_upgrade_sqlite_tables)
+        await conn.execute(text(f"PRAGMA user_version = {fingerprint}"))
+    return True
+
+
 # --------------------------
 #   init_db برای SQLite dev
 # --------------------------
-async def init_db():
+async def init_db() -> bool:
     """
     برای محیط توسعه:
     وقتی دیتابیس sqlite+aiosqlite باشد،
     جدول‌ها را اتوماتیک می‌سازد.
+
+    Returns whether ``create_all`` actually ran.
     """
+    created = False
     if settings.resolved_database_url.startswith("sqlite"):
-        async with engine.begin() as conn:
-            # به SQLAlchemy می‌گوید همه جداول را بسازد
-            await conn.run_sync(Base.metadata.create_all)
+        created = await _create_sqlite_schema(engine)
+    if read_engine is not engine and read_engine.url.get_backend_name() == "sqlite":
+        created = await _create_sqlite_schema(read_engine) or created
+    return created
@@ -0,0 +1,120 @@
+"""Per-request SQL statement counting, timing and N+1 detection."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from .config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    """SQL activity of a single request."""
+
+    count: int = 0
+    total: float = 0.0
+    slowest: float = 0.0
+    slowest_statement: str | None = None
+    shapes: Counter[str] = field(default_factory=Counter)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        self.shapes[statement] += 1
+        if elapsed > self.slowest:
+            self.slowest = elapsed
+            self.slowest_statement = statement
+
+    def repeated_shapes(self, threshold: int) -> list[tuple[str, int]]:
+        """Statements issued at least ``threshold`` times, i.e. likely N+1 loops."""
+
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+
+def _record(conn, statement: str) -> None:
+    started_at = conn.info["query_started_at"].pop()
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started_at)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    _record(conn, statement)
+
+
+def _handle_error(exception_context) -> None:
+    # A failed statement never reaches after_cursor_execute; pop its start
+    # time here so it is not attributed to the connection's next statement.
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started_at"):
+        _record(conn, exception_context.statement)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attach the statement timing hooks to ``engine``."""
+
+    sync_engine = engine.sync_engine
+    if not event.contains(sync_engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(sync_engine, "handle_error", _handle_error)
+
+
+def _shorten(statement: str | None, limit: int = 200) -> str:
+    flat = " ".join((statement or "-").split())
+    return flat if len(flat) <= limit else flat[: limit - 3] + "..."
+
+
+async def query_stats_middleware(request: Request, call_next) -> Response:
+    """Report each request's SQL statement count and DB time in headers and logs."""
+
+    stats = QueryStats()
+    token = _current_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        _current_stats.reset(token)
+
+    repeated = stats.repeated_shapes(settings.sql_n_plus_one_threshold)
+    response.headers["X-DB-Statements"] = str(stats.count)
+    response.headers["X-DB-Time-Ms"] = f"{stats.total * 1000:.2f}"
+    response.headers["X-DB-Slowest-Ms"] = f"{stats.slowest * 1000:.2f}"
+    response.headers["Server-Timing"] = f'db;dur={stats.total * 1000:.2f};desc="{stats.count} statements"'
+    if repeated:
+        response.headers["X-DB-Repeated-Statements"] = str(len(repeated))
+
+    logger.info(
+        "%s %s: %d statements in %.2f ms, slowest %.2f ms: %s",
+        request.method,
+        request.url.path,
+        stats.count,
+        stats.total * 1000,
+        stats.slowest * 1000,
+        _shorten(stats.slowest_statement),
+    )
+    for shape, count in repeated:
+        logger.warning(
+            "%s %s: possible N+1, statement issued %d times: %s",
+            request.method,
+            request.url.path,
+            count,
+            _shorten(shape),
+        )
+    return response
@@ -1,14 +1,100 @@
-from fastapi import FastAPI
-from app.api import api_router
-from app.db import init_db
-from app.bot.bot import api_router as bot_router
+import asyncio
+import logging
+import time
+
+_boot_started = time.perf_counter()
+
+from fastapi import FastAPI  # noqa: E402
+
+_fastapi_imported = time.perf_counter()
+
+from app.api import api_router  # noqa: E402
+from app.config import settings  # noqa: E402
+from app.db import engine, init_db, read_engine  # noqa: E402
+from app.instrumentation import instrument_engine, query_stats_middleware  # noqa: E402
+from app.bot.webhook import api_router as bot_router, warm_up_bot  # noqa: E402
+from app.services.invoice_service import run_invoice_filter_refresh  # noqa: E402
+from app.services.mission_catalog_service import mission_catalog, run_catalog_refresh  # noqa: E402
+from app.services.mission_schedule_service import run_mission_scheduler  # noqa: E402
+from app.services.points_service import run_points_compaction  # noqa: E402
+
+_app_imported = time.perf_counter()
+
+logger = logging.getLogger(__name__)
+
+
+def _configure_logging() -> None:
+    # Uvicorn only configures its own loggers, so without this the startup
+    # breakdown and per-request statement logs below WARNING go nowhere.
+    app_logger = logging.getLogger("app")
+    app_logger.setLevel(settings.log_level.upper())
+    if not app_logger.handlers and not logging.getLogger().handlers:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        app_logger.addHandler(handler)
+
+
+_configure_logging()
 
 app = FastAPI()
+_background_tasks: set[asyncio.Task] = set()
+
+if settings.sql_instrumentation_enabled:
+    instrument_engine(engine)
+    instrument_engine(read_engine)
+    app.middleware("http")(query_stats_middleware)
 
 
 @app.on_event("startup")
 async def startup_event():
-    await init_db()
+    phases = {
+        "import fastapi": _fastapi_imported - _boot_started,
+        "import app": _app_imported - _fastapi_imported,
+    }
+
+    started = time.perf_counter()
+    created = await init_db()
+    phases["init_db" if created else "init_db (schema up to date)"] = time.perf_counter() - started
+
+    if not settings.lazy_startup:
+        started = time.perf_counter()
+        warm_up_bot()
+        phases["bot"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    await mission_catalog.reload()
+    phases["mission catalog"] = time.perf_counter() - started
+
+    if settings.mission_catalog_refresh_seconds > 0:
+        _background_tasks.add(
+            asyncio.create_task(run_catalog_refresh(settings.mission_catalog_refresh_seconds))
+        )
+    _background_tasks.add(
+        asyncio.create_task(run_invoice_filter_refresh(settings.invoice_filter_refresh_seconds))
+    )
+    if settings.mission_scheduler_poll_seconds > 0:
+        _background_tasks.add(
+            asyncio.create_task(run_mission_scheduler(settings.mission_scheduler_poll_seconds))
+        )
+    if settings.points_snapshot_interval_seconds > 0:
+        _background_tasks.add(
+            asyncio.create_task(run_points_compaction(settings.points_snapshot_interval_seconds))
+        )
+
+    logger.info(
+        "startup %.1f ms: %s%s",
+        (time.perf_counter() - _boot_started) * 1000,
+        ", ".join(f"{name} {seconds * 1000:.1f} ms" for name, seconds in phases.items()),
+        ", bot deferred to first webhook" if settings.lazy_startup else "",
+    )
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    for task in _background_tasks:
+        task.cancel()
+    await asyncio.gather(*_background_tasks, return_exceptions=True)
+    _background_tasks.clear()
 
 app.include_router(api_router, prefix="/api/v1")
 app.include_router(bot_router)
@@ -2,21 +2,33 @@ from .base import Base
 from .display import Display
 from .mission import Mission, MissionLog, MissionStatus, MissionType
 from .notification import NotificationLog
-from .purchase import Purchase
+from .points import PointsLedgerEntry, PointsSnapshot
+from .purchase import Purchase, PurchaseBrand
 from .referral import Referral
+from .scheduler import SchedulerJob
+from .spend import BrandMonthlySpend, CityMonthlySpend, UserMonthlySpend
 from .stamp import Stamp
 from .user import User
+from .user_stats import UserStats
 
 __all__ = [
     "Base",
+    "BrandMonthlySpend",
+    "CityMonthlySpend",
     "Display",
     "Mission",
     "MissionLog",
     "MissionStatus",
     "MissionType",
     "NotificationLog",
+    "PointsLedgerEntry",
+    "PointsSnapshot",
     "Purchase",
+    "PurchaseBrand",
     "Referral",
+    "SchedulerJob",
     "Stamp",
     "User",
+    "UserMonthlySpend",
+    "UserStats",
 ]
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import uuid
 
-from sqlalchemy import Enum as SQLEnum, ForeignKey, String, Text, text
+from sqlalchemy import Enum as SQLEnum, ForeignKey, Index, String, Text, text
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -14,6 +14,15 @@ from .mission import MissionStatus
 
 class Display(Base, TimestampMixin):
     __tablename__ = "displays"
+    __table_args__ = (
+        Index("ix_displays_user_id_status", "user_id", "status"),
+        Index(
+            "ix_displays_pending",
+            "created_at",
+            postgresql_where=text("status = 'PENDING'"),
+            sqlite_where=text("status = 'PENDING'"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         PGUUID(as_uuid=True),
@@ -5,7 +5,8 @@ from __future__ import annotations
 import enum
 import uuid
 
-from sqlalchemy import Boolean, DateTime, Enum as SQLEnum, ForeignKey, Integer, String, Text, text, JSON
+from sqlalchemy import Boolean, DateTime, Enum as SQLEnum, ForeignKey, Index, Integer, String, Text, text, JSON
+from sqlalchemy import literal_column
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -26,6 +27,16 @@ class MissionStatus(str, enum.Enum):
     REJECTED = "REJECTED"
 
 
+def status_is(column, status: MissionStatus):
+    """``column = status`` with the status inlined rather than bound.
+
+    The partial ``status = 'PENDING'`` queue indexes only match a literal;
+    neither SQLite nor a PostgreSQL generic plan uses them for a parameter.
+    """
+
+    return column == literal_column(f"'{MissionStatus(status).value}'")
+
+
 class Mission(Base, TimestampMixin):
     __tablename__ = "missions"
 
@@ -44,6 +55,10 @@ class Mission(Base, TimestampMixin):
     is_active: Mapped[bool] = mapped_column(
         Boolean, nullable=False, default=True, server_default=text("true")
     )
+    # Materialised "active and inside its window", flipped by the mission scheduler.
+    is_live: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, server_default=text("false"), index=True
+    )
     start_at: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     end_at: Mapped[DateTime | None] = mapped_column(DateTime(timezone=True), nullable=True)
     reward_points: Mapped[int] = mapped_column(Integer, nullable=False)
@@ -56,8 +71,31 @@ class Mission(Base, TimestampMixin):
     )
 
 
+NOT_REPEATABLE = text("NOT is_repeatable")
+
+
 class MissionLog(Base, TimestampMixin):
     __tablename__ = "mission_logs"
+    __table_args__ = (
+        Index("ix_mission_logs_user_id_status", "user_id", "status"),
+        Index("ix_mission_logs_mission_id_user_id", "mission_id", "user_id"),
+        # A mission can be started once per user; submission-backed logs
+        # (purchases, displays, referrals) repeat and are exempt.
+        Index(
+            "uq_mission_logs_mission_id_user_id",
+            "mission_id",
+            "user_id",
+            unique=True,
+            postgresql_where=NOT_REPEATABLE,
+            sqlite_where=NOT_REPEATABLE,
+        ),
+        Index(
+            "ix_mission_logs_pending",
+            "created_at",
+            postgresql_where=text("status = 'PENDING'"),
+            sqlite_where=text("status = 'PENDING'"),
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         PGUUID(as_uuid=True),
@@ -79,6 +117,9 @@ class MissionLog(Base, TimestampMixin):
         SQLEnum(MissionStatus, name="mission_status"), nullable=False
     )
     payload: Mapped[dict] = mapped_column(JSON, nullable=False)
+    is_repeatable: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, default=False, server_default=text("false")
+    )
     admin_note: Mapped[str | None] = mapped_column(Text, nullable=True)
 
     user: Mapped["User"] = relationship("User", back_populates="missions_logs")
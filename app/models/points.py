@@ -0,0 +1,52 @@
+"""Append-only points ledger and compacted per-user balance snapshots."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, String, func, text
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, TimestampMixin
+
+# SQLite only auto-increments INTEGER PRIMARY KEY columns.
+LedgerId = BigInteger().with_variant(Integer(), "sqlite")
+
+
+class PointsLedgerEntry(Base):
+    __tablename__ = "points_ledger"
+    __table_args__ = (Index("ix_points_ledger_user_id_id", "user_id", "id"),)
+
+    id: Mapped[int] = mapped_column(LedgerId, primary_key=True, autoincrement=True)
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+    delta: Mapped[int] = mapped_column(Integer, nullable=False)
+    reason: Mapped[str] = mapped_column(String(32), nullable=False)
+    mission_log_id: Mapped[uuid.UUID | None] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("mission_logs.id", ondelete="SET NULL"),
+        nullable=True,
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+
+class PointsSnapshot(Base, TimestampMixin):
+    __tablename__ = "points_snapshots"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+    balance: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    last_entry_id: Mapped[int] = mapped_column(LedgerId, nullable=False, server_default=text("0"))
@@ -2,22 +2,76 @@
 
 from __future__ import annotations
 
+import hashlib
+import unicodedata
 import uuid
 
 from decimal import Decimal
 
 from datetime import date
 
-from sqlalchemy import Date, Enum as SQLEnum, ForeignKey, JSON, Numeric, String, text
+from sqlalchemy import Date, Enum as SQLEnum, ForeignKey, Index, JSON, Numeric, String, text
 from sqlalchemy.dialects.postgresql import UUID as PGUUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base, TimestampMixin
 from .mission import MissionStatus
 
+HAS_FINGERPRINT = text("invoice_fingerprint IS NOT NULL")
+IS_DUPLICATE = text("duplicate_of_id IS NOT NULL")
+
+
+def brand_names(brands: list[str] | None) -> list[str]:
+    """Distinct, trimmed brand names as stored in ``purchase_brands``."""
+
+    return sorted({brand.strip()[:128] for brand in brands or ()} - {""})
+
+
+def invoice_fingerprint(invoice_number: str | None) -> str | None:
+    """Normalise an invoice number so reformatted copies of it collide.
+
+    Case, punctuation and whitespace are dropped and Persian/Arabic digits are
+    folded to ASCII before hashing; numbers with nothing left return ``None``.
+    """
+
+    if not invoice_number:
+        return None
+    if invoice_number.isascii():
+        normalized = "".join(filter(str.isalnum, invoice_number.lower()))
+    else:
+        normalized = "".join(
+            str(unicodedata.digit(char)) if char.isdigit() else char
+            for char in unicodedata.normalize("NFKC", invoice_number).casefold()
+            if char.isalnum()
+        )
+    if not normalized:
+        return None
+    return hashlib.blake2b(normalized.encode(), digest_size=16).hexdigest()
+
 
 class Purchase(Base, TimestampMixin):
     __tablename__ = "purchases"
+    __table_args__ = (
+        Index("ix_purchases_user_id_status", "user_id", "status"),
+        Index(
+            "ix_purchases_pending",
+            "created_at",
+            postgresql_where=text("status = 'PENDING'"),
+            sqlite_where=text("status = 'PENDING'"),
+        ),
+        Index(
+            "ix_purchases_invoice_fingerprint",
+            "invoice_fingerprint",
+            postgresql_where=HAS_FINGERPRINT,
+            sqlite_where=HAS_FINGERPRINT,
+        ),
+        Index(
+            "ix_purchases_duplicate_of_id",
+            "duplicate_of_id",
+            postgresql_where=IS_DUPLICATE,
+            sqlite_where=IS_DUPLICATE,
+        ),
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         PGUUID(as_uuid=True),
@@ -39,9 +93,19 @@ class Purchase(Base, TimestampMixin):
     invoice_number: Mapped[str | None] = mapped_column(String, nullable=True)
     product_category: Mapped[str | None] = mapped_column(String, nullable=True)
     barcode: Mapped[str | None] = mapped_column(String, nullable=True)
+    invoice_fingerprint: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    # Earliest purchase with the same fingerprint, as seen at submission time.
+    duplicate_of_id: Mapped[uuid.UUID | None] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("purchases.id", ondelete="SET NULL"),
+        nullable=True,
+    )
     status: Mapped[MissionStatus] = mapped_column(
         SQLEnum(MissionStatus, name="mission_status"), nullable=False
     )
+    # The store's city when the purchase was last approved, so a later
+    # rejection leaves the city rollup the approval was credited to.
+    spend_city: Mapped[str | None] = mapped_column(String, nullable=True)
     mission_id: Mapped[uuid.UUID | None] = mapped_column(
         PGUUID(as_uuid=True),
         ForeignKey("missions.id", ondelete="SET NULL"),
@@ -58,3 +122,23 @@ class Purchase(Base, TimestampMixin):
     mission_log: Mapped["MissionLog | None"] = relationship(
         "MissionLog", foreign_keys="Purchase.mission_log_id"
     )
+
+    @property
+    def is_duplicate(self) -> bool:
+        return self.duplicate_of_id is not None
+
+
+class PurchaseBrand(Base):
+    """One row per brand listed on a purchase, so brand lookups use an index
+    instead of decoding ``Purchase.brands``."""
+
+    __tablename__ = "purchase_brands"
+    __table_args__ = (Index("ix_purchase_brands_brand_purchase_id", "brand", "purchase_id"),)
+
+    purchase_id: Mapped[uuid.UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("purchases.id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+    brand: Mapped[str] = mapped_column(String(128), primary_key=True, nullable=False)
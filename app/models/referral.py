@@ -24,6 +24,7 @@ class Referral(Base, TimestampMixin):
         PGUUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
     store_name: Mapped[str] = mapped_column(String, nullable=False)
     manager_name: Mapped[str] = mapped_column(String, nullable=False)
@@ -31,7 +32,7 @@ class Referral(Base, TimestampMixin):
     city: Mapped[str] = mapped_column(String, nullable=False)
     notes: Mapped[str | None] = mapped_column(Text, nullable=True)
     first_purchase_completed: Mapped[bool] = mapped_column(
-        Boolean, nullable=False, server_default="false"
+        Boolean, nullable=False, server_default=text("false")
     )
     mission_id: Mapped[uuid.UUID | None] = mapped_column(
         PGUUID(as_uuid=True),
@@ -0,0 +1,54 @@
+"""Monthly spend rollups of approved purchases."""
+
+from __future__ import annotations
+
+import uuid
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import Date, ForeignKey, Index, Integer, Numeric, String, text
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, TimestampMixin
+
+
+class SpendTotalsMixin:
+    """Approved spend and purchase count for one key and calendar month."""
+
+    # First day of the month of ``Purchase.purchase_date``.
+    month: Mapped[date] = mapped_column(Date, primary_key=True, nullable=False)
+    amount: Mapped[Decimal] = mapped_column(
+        Numeric(18, 2), nullable=False, server_default=text("0")
+    )
+    purchases: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+
+
+class UserMonthlySpend(Base, SpendTotalsMixin, TimestampMixin):
+    __tablename__ = "user_monthly_spend"
+    __table_args__ = (Index("ix_user_monthly_spend_month", "month"),)
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+
+
+class BrandMonthlySpend(Base, SpendTotalsMixin, TimestampMixin):
+    """A purchase listing several brands counts in full towards each of them."""
+
+    __tablename__ = "brand_monthly_spend"
+    __table_args__ = (Index("ix_brand_monthly_spend_month", "month"),)
+
+    brand: Mapped[str] = mapped_column(String(128), primary_key=True, nullable=False)
+
+
+class CityMonthlySpend(Base, SpendTotalsMixin, TimestampMixin):
+    """Keyed by the store's city when the purchase was approved; ``""`` if unset."""
+
+    __tablename__ = "city_monthly_spend"
+    __table_args__ = (Index("ix_city_monthly_spend_month", "month"),)
+
+    city: Mapped[str] = mapped_column(String(128), primary_key=True, nullable=False)
@@ -24,6 +24,7 @@ class Stamp(Base, TimestampMixin):
         PGUUID(as_uuid=True),
         ForeignKey("users.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
     mission_log_id: Mapped[uuid.UUID | None] = mapped_column(
         PGUUID(as_uuid=True),
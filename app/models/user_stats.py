@@ -0,0 +1,33 @@
+"""Per-user dashboard counters maintained alongside mission and stamp writes."""
+
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import ForeignKey, Integer, text
+from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base, TimestampMixin
+
+
+class UserStats(Base, TimestampMixin):
+    __tablename__ = "user_stats"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        PGUUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+        nullable=False,
+    )
+    total_stamps: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    total_points: Mapped[int] = mapped_column(Integer, nullable=False, server_default=text("0"))
+    missions_pending: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default=text("0")
+    )
+    missions_approved: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default=text("0")
+    )
+    missions_rejected: Mapped[int] = mapped_column(
+        Integer, nullable=False, server_default=text("0")
+    )
@@ -128,6 +128,8 @@ class PurchaseOut(BaseModel):
     invoice_number: str | None = None
     product_category: str | None = None
     barcode: str | None = None
+    is_duplicate: bool = False
+    duplicate_of_id: uuid.UUID | None = None
     created_at: datetime
 
     class Config:
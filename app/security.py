@@ -2,15 +2,19 @@
 
 from __future__ import annotations
 
+import hashlib
+import time
 import uuid
 from datetime import datetime, timedelta
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from sqlalchemy import select
+from sqlalchemy import inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import make_transient_to_detached
 
+from .cache import TTLCache
 from .config import settings
 from .db import get_session
 from .models import User
@@ -18,6 +22,42 @@ from .models import User
 ALGORITHM = "HS256"
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
+# Column snapshots of recently authenticated users keyed by user id.
+user_cache: TTLCache[uuid.UUID, dict] = TTLCache(
+    maxsize=settings.user_cache_max_entries,
+    ttl=settings.user_cache_ttl_seconds,
+)
+_USER_COLUMNS = tuple(attr.key for attr in inspect(User).column_attrs)
+
+# Verified JWT claims keyed by a digest of the raw token, held until ``exp``.
+token_cache: TTLCache[bytes, dict] = TTLCache(
+    maxsize=settings.token_cache_max_entries,
+    ttl=settings.access_token_expire_minutes * 60,
+)
+
+
+def invalidate_cached_user(user_id: uuid.UUID | None) -> None:
+    """Drop a user from the principal cache after it has been modified."""
+
+    if user_id is not None:
+        user_cache.pop(user_id)
+
+
+def _cache_user(user: User) -> None:
+    user_cache.set(user.id, {key: getattr(user, key) for key in _USER_COLUMNS})
+
+
+def _user_from_cache(session: AsyncSession, user_id: uuid.UUID) -> User | None:
+    snapshot = user_cache.get(user_id)
+    if snapshot is None:
+        return None
+    # Rebuild a fresh instance per request and attach it without emitting SQL,
+    # so handlers can keep mutating and committing the user as before.
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    session.add(user)
+    return user
+
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     """Create a JWT access token for the provided data."""
@@ -29,7 +69,25 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     return encoded_jwt
 
 
+def decode_access_token(token: str) -> dict:
+    """Decode and verify ``token``, reusing claims verified by earlier requests."""
+
+    digest = hashlib.sha256(token.encode()).digest()
+    claims = token_cache.get(digest)
+    if claims is not None:
+        return claims
+
+    claims = jwt.decode(token, settings.secret_key, algorithms=[ALGORITHM])
+    exp = claims.get("exp")
+    if isinstance(exp, (int, float)):
+        remaining = exp - time.time()
+        if remaining > 0:
+            token_cache.set(digest, claims, ttl=remaining)
+    return claims
+
+
 async def get_current_user(
+    request: Request,
     token: str = Depends(oauth2_scheme),
     session: AsyncSession = Depends(get_session),
 ) -> User:
@@ -42,16 +100,22 @@ async def get_current_user(
     )
 
     try:
-        payload = jwt.decode(token, settings.secret_key, algorithms=[ALGORITHM])
+        payload = decode_access_token(token)
         user_id_value = payload.get("user_id")
         if not user_id_value:
             raise credentials_exception
         user_id = uuid.UUID(user_id_value)
     except (JWTError, ValueError):
         raise credentials_exception
+    request.state.user_id = user_id
+
+    user = _user_from_cache(session, user_id)
+    if user is not None:
+        return user
 
     result = await session.execute(select(User).where(User.id == user_id))
     user = result.scalar_one_or_none()
     if user is None:
         raise credentials_exception
+    _cache_user(user)
     return user
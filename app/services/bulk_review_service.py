@@ -0,0 +1,322 @@
+"""Set-based approve/reject for the admin review queue.
+
+Each batch is loaded with a handful of column-only ``IN`` queries under the
+same row locks as the single-item endpoints (``FOR UPDATE`` on PostgreSQL,
+the writer lane on SQLite). Status changes are claimed with
+``UPDATE ... WHERE id IN (...) AND status IS DISTINCT FROM :target
+RETURNING id`` and stamps, notifications, ledger entries and counters are
+built only from the returned ids and inserted in bulk, all in the caller's
+transaction. Side effects match the single-item admin endpoints, except
+that items already in the target state are reported as ``unchanged``
+instead of being rewarded again.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import acquire_writer_lane, chunked
+from app.models import (
+    Display,
+    Mission,
+    MissionLog,
+    MissionStatus,
+    NotificationLog,
+    Purchase,
+    Referral,
+    Stamp,
+)
+from app.services.mission_status_service import note_mission_status
+from app.services.points_service import record_points_bulk
+from app.services.spend_service import record_purchase_review_spend
+from app.services.submission_service import claim_many
+from app.services.user_stats_service import (
+    apply_user_stats_deltas,
+    ledger_reason,
+    transition_deltas,
+)
+
+RESOURCE_KINDS = ("purchases", "displays", "referrals", "mission_logs")
+
+_NOTIFICATION_PREFIX = {"purchases": "PURCHASE", "displays": "DISPLAY", "mission_logs": "MISSION"}
+
+
+@dataclass
+class _Item:
+    id: uuid.UUID
+    user_id: uuid.UUID
+    mission_id: uuid.UUID | None
+    mission_log_id: uuid.UUID | None
+    status: MissionStatus | None = None
+    done: bool = False
+
+
+@dataclass
+class _Log:
+    user_id: uuid.UUID
+    status: MissionStatus | None
+    mission_id: uuid.UUID
+
+
+async def _load_items(session: AsyncSession, kind: str, ids: list[uuid.UUID]) -> dict[uuid.UUID, _Item]:
+    if kind == "referrals":
+        columns = (Referral.id, Referral.referrer_user_id, Referral.mission_id, Referral.mission_log_id)
+    elif kind == "mission_logs":
+        columns = (MissionLog.id, MissionLog.user_id, MissionLog.mission_id, MissionLog.id, MissionLog.status)
+    else:
+        model = Purchase if kind == "purchases" else Display
+        columns = (model.id, model.user_id, model.mission_id, model.mission_log_id, model.status)
+
+    items: dict[uuid.UUID, _Item] = {}
+    for chunk in chunked(sorted(ids)):
+        rows = await session.execute(
+            select(*columns).where(columns[0].in_(chunk)).order_by(columns[0]).with_for_update()
+        )
+        for row in rows:
+            items[row[0]] = _Item(*row)
+    return items
+
+
+class _Batch:
+    """Accumulates the writes of one bulk review before they are flushed."""
+
+    def __init__(self, target: MissionStatus, admin_note: str | None) -> None:
+        self.target = target
+        self.admin_note = admin_note
+        self.logs: dict[uuid.UUID, _Log] = {}
+        self.missions: dict[uuid.UUID, Mission] = {}
+        self.purchase_statuses: dict[uuid.UUID, MissionStatus] = {}
+        self.noted_log_ids: list[uuid.UUID] = []
+        self.new_logs: list[dict] = []
+        self.referral_links: list[dict] = []
+        self.stamps: list[dict] = []
+        self.notifications: list[dict] = []
+        self.ledger: list[dict] = []
+        self.stats: dict[uuid.UUID, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.status_notes: list[tuple[uuid.UUID, uuid.UUID]] = []
+
+    def mission_for(self, item: _Item) -> Mission | None:
+        if item.mission_log_id:
+            log = self.logs.get(item.mission_log_id)
+            return self.missions.get(log.mission_id) if log else None
+        return self.missions.get(item.mission_id) if item.mission_id else None
+
+    def transition(self, log_id: uuid.UUID, mission: Mission | None) -> None:
+        log = self.logs[log_id]
+        if log.status == self.target:
+            return
+        reward_points = mission.reward_points if mission else 0
+        deltas = transition_deltas(log.status, self.target, reward_points)
+        for column, delta in deltas.items():
+            self.stats[log.user_id][column] += delta
+        if deltas.get("total_points"):
+            self.ledger.append(
+                {
+                    "user_id": log.user_id,
+                    "delta": deltas["total_points"],
+                    "reason": ledger_reason(self.target),
+                    "mission_log_id": log_id,
+                }
+            )
+        log.status = self.target
+        self.status_notes.append((log.user_id, log.mission_id))
+
+    async def claim(self, session: AsyncSession, items: dict[str, dict[uuid.UUID, _Item]]) -> None:
+        """Move the batch's rows to the target state, marking every item
+        this transaction did not move as done.
+
+        Runs before any side effect is built: logs that were already in the
+        target state are recorded as such, so :meth:`transition` skips them.
+        """
+
+        for kind, kind_items in items.items():
+            if kind == "mission_logs" or (kind == "referrals" and self.target != MissionStatus.APPROVED):
+                continue
+            if kind == "referrals":
+                model, values = Referral, {"first_purchase_completed": True}
+            else:
+                model, values = (Purchase if kind == "purchases" else Display), {"status": self.target}
+            claimed = await claim_many(session, model, list(kind_items), **values)
+            for item in kind_items.values():
+                item.done = item.id not in claimed
+
+        log_ids = [
+            item.mission_log_id
+            for kind_items in items.values()
+            for item in kind_items.values()
+            if not item.done and item.mission_log_id in self.logs
+        ]
+        moved = await claim_many(session, MissionLog, log_ids, status=self.target)
+        for log_id, log in self.logs.items():
+            if log_id not in moved:
+                log.status = self.target
+        for item in items.get("mission_logs", {}).values():
+            item.done = item.id not in moved
+
+    def award(self, user_id: uuid.UUID, mission: Mission, mission_log_id: uuid.UUID | None) -> None:
+        if mission.reward_stamps and mission.reward_stamps > 0:
+            self.stamps.append(
+                {"user_id": user_id, "mission_log_id": mission_log_id, "value": mission.reward_stamps}
+            )
+            self.stats[user_id]["total_stamps"] += 1
+
+    def notify(self, user_id: uuid.UUID, type: str, resource_id: uuid.UUID, mission: Mission | None) -> None:
+        self.notifications.append(
+            {
+                "user_id": user_id,
+                "type": type,
+                "payload": {
+                    "resource_id": str(resource_id),
+                    "mission_id": str(mission.id) if mission else None,
+                    "mission_code": mission.code if mission else None,
+                    "mission_type": mission.type.value if mission else None,
+                },
+                "sent_at": datetime.utcnow(),
+            }
+        )
+
+    def review(self, kind: str, item: _Item) -> str:
+        approve = self.target == MissionStatus.APPROVED
+        if kind == "referrals" and not approve:
+            return "unsupported"
+        if item.done:
+            return "unchanged"
+        item.done = True
+
+        mission = self.mission_for(item)
+        if item.mission_log_id and item.mission_log_id in self.logs:
+            self.transition(item.mission_log_id, mission)
+        elif approve and mission and kind == "referrals":
+            item.mission_log_id = uuid.uuid4()
+            self.logs[item.mission_log_id] = _Log(item.user_id, None, mission.id)
+            self.new_logs.append(
+                {
+                    "id": item.mission_log_id,
+                    "mission_id": mission.id,
+                    "user_id": item.user_id,
+                    "status": MissionStatus.APPROVED,
+                    "is_repeatable": True,
+                    "payload": {"referral_id": str(item.id)},
+                }
+            )
+            self.referral_links.append({"b_id": item.id, "b_log_id": item.mission_log_id})
+            self.transition(item.mission_log_id, mission)
+        elif mission and (approve or item.status == MissionStatus.APPROVED):
+            # Log-less credits are booked directly and revoked the same way.
+            points = mission.reward_points if approve else -mission.reward_points
+            self.ledger.append(
+                {
+                    "user_id": item.user_id,
+                    "delta": points,
+                    "reason": f"{_NOTIFICATION_PREFIX[kind]}_{'APPROVED' if approve else 'REVOKED'}",
+                    "mission_log_id": None,
+                }
+            )
+            self.stats[item.user_id]["total_points"] += points
+        if kind == "mission_logs" and not approve and self.admin_note is not None:
+            self.noted_log_ids.append(item.id)
+
+        if approve and mission:
+            self.award(item.user_id, mission, item.mission_log_id)
+        if kind == "referrals":
+            notification = "REFERRAL_COMPLETED"
+        else:
+            notification = f"{_NOTIFICATION_PREFIX[kind]}_{self.target.value}"
+        self.notify(item.user_id, notification, item.id, mission)
+        if kind == "purchases":
+            self.purchase_statuses[item.id] = item.status
+        return self.target.value.lower()
+
+    async def write(self, session: AsyncSession) -> None:
+        await record_purchase_review_spend(session, self.purchase_statuses, self.target)
+        if self.new_logs:
+            await session.execute(insert(MissionLog), self.new_logs)
+        for chunk in chunked(self.noted_log_ids):
+            await session.execute(
+                update(MissionLog)
+                .where(MissionLog.id.in_(chunk))
+                .values(admin_note=self.admin_note)
+                .execution_options(synchronize_session=False)
+            )
+        if self.referral_links:
+            referrals = Referral.__table__
+            await session.execute(
+                update(referrals)
+                .where(referrals.c.id == bindparam("b_id"))
+                .values(mission_log_id=bindparam("b_log_id")),
+                self.referral_links,
+            )
+
+        if self.stamps:
+            await session.execute(insert(Stamp), self.stamps)
+        if self.notifications:
+            await session.execute(insert(NotificationLog), self.notifications)
+        await record_points_bulk(session, self.ledger)
+        await apply_user_stats_deltas(session, self.stats)
+        for user_id, mission_id in self.status_notes:
+            note_mission_status(session, user_id, mission_id, self.target)
+
+
+async def bulk_review(
+    session: AsyncSession,
+    ids_by_kind: dict[str, list[uuid.UUID]],
+    target: MissionStatus,
+    admin_note: str | None = None,
+) -> dict[str, list[dict]]:
+    """Approve or reject many submissions at once.
+
+    Returns, per resource kind, one ``{"id", "result"}`` entry per requested
+    id, where result is ``approved``/``rejected``, ``unchanged``,
+    ``not_found`` or ``unsupported`` (referrals cannot be rejected).
+    """
+
+    await acquire_writer_lane(session)
+    batch = _Batch(target, admin_note)
+    items = {kind: await _load_items(session, kind, ids) for kind, ids in ids_by_kind.items() if ids}
+
+    log_ids = {
+        item.mission_log_id
+        for kind_items in items.values()
+        for item in kind_items.values()
+        if item.mission_log_id
+    }
+    for chunk in chunked(sorted(log_ids)):
+        rows = await session.execute(
+            select(MissionLog.id, MissionLog.user_id, MissionLog.status, MissionLog.mission_id)
+            .where(MissionLog.id.in_(chunk))
+            .order_by(MissionLog.id)
+            .with_for_update()
+        )
+        for log_id, user_id, status, mission_id in rows:
+            batch.logs[log_id] = _Log(user_id, status, mission_id)
+    await batch.claim(session, items)
+
+    mission_ids = {log.mission_id for log in batch.logs.values()}
+    mission_ids.update(
+        item.mission_id
+        for kind_items in items.values()
+        for item in kind_items.values()
+        if item.mission_id
+    )
+    for chunk in chunked(list(mission_ids)):
+        for mission in await session.scalars(select(Mission).where(Mission.id.in_(chunk))):
+            batch.missions[mission.id] = mission
+
+    results: dict[str, list[dict]] = {}
+    for kind, ids in ids_by_kind.items():
+        kind_items = items.get(kind, {})
+        results[kind] = [
+            {"id": resource_id, "result": batch.review(kind, kind_items[resource_id])}
+            if resource_id in kind_items
+            else {"id": resource_id, "result": "not_found"}
+            for resource_id in ids
+        ]
+
+    await batch.write(session)
+    return results
@@ -0,0 +1,37 @@
+"""Cached dashboard payloads, invalidated when a user's counters change."""
+
+from __future__ import annotations
+
+import uuid
+from functools import partial
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import MemoryStore, RedisStore, StaleWhileRevalidateCache
+from app.config import settings
+from app.db import on_commit
+
+# Without REDIS_URL the store is per process, so invalidations only reach the
+# worker that committed the change; other workers converge within the TTL.
+dashboard_cache = StaleWhileRevalidateCache(
+    RedisStore(settings.redis_url)
+    if settings.redis_url
+    else MemoryStore(maxsize=settings.dashboard_cache_max_entries),
+    namespace="dashboard",
+    ttl=settings.dashboard_cache_ttl_seconds,
+    stale_ttl=settings.dashboard_cache_stale_seconds,
+)
+
+
+def invalidate_dashboard(session: AsyncSession, user_id: uuid.UUID | None) -> None:
+    """Drop the user's cached dashboard once ``session`` commits."""
+
+    if user_id is not None:
+        on_commit(session, partial(dashboard_cache.invalidate, user_id))
+
+
+def invalidate_dashboards(session: AsyncSession, user_ids: list[uuid.UUID]) -> None:
+    """Drop several users' cached dashboards once ``session`` commits."""
+
+    if user_ids:
+        on_commit(session, partial(dashboard_cache.invalidate_many, user_ids))
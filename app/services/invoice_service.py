@@ -0,0 +1,147 @@
+"""Duplicate-invoice detection for purchase submissions.
+
+Every purchase stores a normalised ``invoice_fingerprint``. A per-process
+Bloom filter of known fingerprints answers the common "never seen" case
+without touching the database; only possible matches cost an index probe.
+The filter is warmed in the background at startup and topped up from the table periodically,
+so fingerprints submitted through other workers are picked up as well.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import BloomFilter
+from app.config import settings
+from app.db import read_async_session
+from app.models import Purchase
+
+logger = logging.getLogger(__name__)
+
+_LOAD_PAGE = 10_000
+
+
+class InvoiceFilter:
+    """Bloom filter of stored fingerprints with incremental refresh."""
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.bloom = BloomFilter(capacity, error_rate)
+        self.ready = False
+        self._loaded_since: datetime | None = None
+
+    def add(self, fingerprint: str) -> None:
+        self.bloom.add(fingerprint)
+
+    def add_many(self, fingerprints: list[str]) -> None:
+        for fingerprint in fingerprints:
+            self.bloom.add(fingerprint)
+
+    def might_exist(self, fingerprint: str) -> bool:
+        # Until the first load finishes every fingerprint has to be probed.
+        return not self.ready or self.bloom.might_contain(fingerprint)
+
+    async def load(self, overlap: float = 0.0) -> int:
+        """Add fingerprints stored since the previous load, or all of them
+        on the first call; ``overlap`` seconds are re-read to cover
+        transactions that committed late."""
+
+        started = datetime.utcnow()
+        fingerprint = Purchase.invoice_fingerprint
+        query = select(fingerprint).where(fingerprint.is_not(None))
+        if self._loaded_since is not None:
+            query = query.where(Purchase.created_at >= self._loaded_since - timedelta(seconds=overlap))
+        added = 0
+        last = ""
+        async with read_async_session() as session:
+            # Keyset pages walk the fingerprint index without buffering the table.
+            while True:
+                page = (
+                    await session.scalars(
+                        query.where(fingerprint > last).order_by(fingerprint).limit(_LOAD_PAGE)
+                    )
+                ).all()
+                self.add_many(page)
+                added += len(page)
+                if len(page) < _LOAD_PAGE:
+                    break
+                last = page[-1]
+        self._loaded_since = started
+        self.ready = True
+        return added
+
+    def stats(self) -> dict:
+        return {"ready": self.ready, **self.bloom.stats()}
+
+
+invoice_filter = InvoiceFilter(settings.invoice_bloom_capacity, settings.invoice_bloom_error_rate)
+
+
+async def find_duplicate_of(session: AsyncSession, fingerprint: str | None) -> uuid.UUID | None:
+    """Return the earliest purchase carrying ``fingerprint``, if any."""
+
+    if fingerprint is None or not invoice_filter.might_exist(fingerprint):
+        return None
+    return await session.scalar(
+        select(Purchase.id)
+        .where(Purchase.invoice_fingerprint == fingerprint)
+        .order_by(Purchase.created_at, Purchase.id)
+        .limit(1)
+    )
+
+
+async def list_duplicate_groups(session: AsyncSession, limit: int = 100) -> list[dict]:
+    """Group purchases that share an invoice fingerprint, newest groups first.
+
+    Unlike ``Purchase.duplicate_of_id`` this reads the table itself, so it
+    also catches copies submitted concurrently.
+    """
+
+    groups = (
+        select(
+            Purchase.invoice_fingerprint,
+            func.count().label("count"),
+            func.max(Purchase.created_at).label("last_created_at"),
+        )
+        .where(Purchase.invoice_fingerprint.is_not(None))
+        .group_by(Purchase.invoice_fingerprint)
+        .having(func.count() > 1)
+        .order_by(func.max(Purchase.created_at).desc())
+        .limit(limit)
+        .subquery()
+    )
+    rows = await session.execute(
+        select(Purchase, groups.c.count)
+        .join(groups, groups.c.invoice_fingerprint == Purchase.invoice_fingerprint)
+        .order_by(groups.c.last_created_at.desc(), Purchase.created_at, Purchase.id)
+    )
+    by_fingerprint: dict[str, dict] = {}
+    for purchase, count in rows:
+        group = by_fingerprint.setdefault(
+            purchase.invoice_fingerprint,
+            {"invoice_fingerprint": purchase.invoice_fingerprint, "count": count, "purchases": []},
+        )
+        group["purchases"].append(purchase)
+    return list(by_fingerprint.values())
+
+
+async def run_invoice_filter_refresh(interval: float) -> None:
+    """Warm the filter, then top it up every ``interval`` seconds until cancelled.
+
+    Submissions made while the first load runs are probed unconditionally.
+    With ``interval`` 0 the filter is loaded once.
+    """
+
+    while True:
+        try:
+            await invoice_filter.load(overlap=interval * 2)
+        except Exception:
+            logger.exception("invoice filter load failed")
+        if interval <= 0:
+            return
+        await asyncio.sleep(interval)
@@ -0,0 +1,207 @@
+"""Process-local catalog of live missions with a time-window index.
+
+Membership comes from ``Mission.is_live``, the flag the mission scheduler
+flips at window boundaries, loaded with an indexed equality. The window
+index additionally retires a mission at its ``end_at`` between reloads.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select
+
+from app.db import async_session
+from app.models import Mission, MissionType
+
+logger = logging.getLogger(__name__)
+
+# ``end_at`` is inclusive, so a mission leaves the active set one tick later.
+WINDOW_RESOLUTION = timedelta(microseconds=1)
+
+
+def naive_utc(value: datetime | None) -> datetime | None:
+    """Compare every window in naive UTC, like the ``datetime.utcnow()`` callers."""
+
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def window_is_live(start_at: datetime | None, end_at: datetime | None, now: datetime) -> bool:
+    """Whether ``now`` lies in the inclusive window; a missing bound is open."""
+
+    return (start_at is None or start_at <= now) and (end_at is None or end_at >= now)
+
+
+@dataclass(frozen=True)
+class CatalogMission:
+    """Session-independent copy of a live ``Mission`` row."""
+
+    id: uuid.UUID
+    code: str
+    title: str
+    description: str
+    type: MissionType
+    is_active: bool
+    reward_points: int
+    reward_stamps: int
+    start_at: datetime | None
+    end_at: datetime | None
+
+    @classmethod
+    def from_mission(cls, mission: Mission) -> "CatalogMission":
+        return cls(
+            id=mission.id,
+            code=mission.code,
+            title=mission.title,
+            description=mission.description,
+            type=MissionType(mission.type),
+            is_active=mission.is_active,
+            reward_points=mission.reward_points,
+            reward_stamps=mission.reward_stamps or 0,
+            start_at=naive_utc(mission.start_at),
+            end_at=naive_utc(mission.end_at),
+        )
+
+    def is_live(self, now: datetime) -> bool:
+        return window_is_live(self.start_at, self.end_at, now)
+
+
+class _WindowIndex:
+    """Active sets precomputed between every start/end boundary.
+
+    The set of live missions only changes at a ``start_at`` or just after an
+    ``end_at``, so a lookup is one bisect over the sorted boundaries.
+    """
+
+    def __init__(self, missions: list[CatalogMission]) -> None:
+        ordered = sorted(missions, key=lambda m: (m.start_at or datetime.min, m.code))
+        boundaries = {m.start_at for m in ordered if m.start_at is not None}
+        boundaries.update(m.end_at + WINDOW_RESOLUTION for m in ordered if m.end_at is not None)
+        self.boundaries = sorted(boundaries)
+        # Before the first boundary only missions without a start are live.
+        self.segments = [tuple(m for m in ordered if m.start_at is None)]
+        self.segments.extend(
+            tuple(m for m in ordered if m.is_live(boundary)) for boundary in self.boundaries
+        )
+
+    def live(self, now: datetime) -> tuple[CatalogMission, ...]:
+        return self.segments[bisect_right(self.boundaries, now)]
+
+
+class MissionCatalog:
+    """Live missions indexed by type and time window.
+
+    Loaded once per process, patched in place after admin changes commit,
+    reloaded after the scheduler flips live flags, and reloaded periodically
+    to pick up admin changes made through other workers.
+    """
+
+    def __init__(self) -> None:
+        self._missions: dict[uuid.UUID, CatalogMission] = {}
+        self._index: dict[MissionType | None, _WindowIndex] = {}
+        self._lock = asyncio.Lock()
+        self._version = 0
+        self.loaded_at: float | None = None
+        # The scheduler run whose live flags the catalog was last reloaded after.
+        self.flags_run_at: datetime | None = None
+
+    def _rebuild(self) -> None:
+        missions = list(self._missions.values())
+        index = {None: _WindowIndex(missions)}
+        for mission_type in MissionType:
+            index[mission_type] = _WindowIndex([m for m in missions if m.type == mission_type])
+        self._index = index
+
+    def replace(self, missions: list[Mission]) -> None:
+        """Swap in a freshly loaded set of missions."""
+
+        self._missions = {
+            mission.id: CatalogMission.from_mission(mission)
+            for mission in missions
+            if mission.is_live
+        }
+        self._rebuild()
+        self.loaded_at = time.monotonic()
+
+    def upsert(self, mission: Mission) -> None:
+        """Apply a committed create or update; missions no longer live drop out."""
+
+        if mission.is_live:
+            self._missions[mission.id] = CatalogMission.from_mission(mission)
+        else:
+            self._missions.pop(mission.id, None)
+        self._version += 1
+        self._rebuild()
+
+    async def reload(self) -> None:
+        """Load every live mission from the primary database."""
+
+        async with self._lock:
+            while True:
+                version = self._version
+                async with async_session() as session:
+                    missions = (
+                        await session.scalars(select(Mission).where(Mission.is_live.is_(True)))
+                    ).all()
+                # An upsert that landed mid-query may not be in this result.
+                if version == self._version:
+                    break
+            self.replace(missions)
+
+    async def _ensure_loaded(self) -> None:
+        if self.loaded_at is None:
+            await self.reload()
+
+    async def active(
+        self, mission_type: MissionType | None = None, now: datetime | None = None
+    ) -> tuple[CatalogMission, ...]:
+        """Return missions live at ``now``, optionally of a single type."""
+
+        await self._ensure_loaded()
+        return self._index[mission_type].live(naive_utc(now) or datetime.utcnow())
+
+    async def get(self, mission_id: uuid.UUID) -> CatalogMission | None:
+        """Return a live mission by id, even if its window closed since the
+        last reload."""
+
+        await self._ensure_loaded()
+        return self._missions.get(mission_id)
+
+    async def first_active(
+        self, mission_type: MissionType, now: datetime | None = None
+    ) -> CatalogMission | None:
+        """Return the earliest-started live mission of ``mission_type``."""
+
+        missions = await self.active(mission_type, now)
+        return missions[0] if missions else None
+
+    def stats(self) -> dict[str, int | float | None]:
+        return {
+            "missions": len(self._missions),
+            "boundaries": len(self._index[None].boundaries) if self._index else 0,
+            "age_seconds": (
+                round(time.monotonic() - self.loaded_at, 1) if self.loaded_at is not None else None
+            ),
+        }
+
+
+mission_catalog = MissionCatalog()
+
+
+async def run_catalog_refresh(interval: float) -> None:
+    """Reload the mission catalog every ``interval`` seconds until cancelled."""
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await mission_catalog.reload()
+        except Exception:
+            logger.exception("mission catalog refresh failed")
@@ -0,0 +1,225 @@
+"""Scheduler that keeps ``Mission.is_live`` in step with mission windows.
+
+The window predicate is evaluated once per boundary instead of in every
+query. The next boundary is persisted in ``scheduler_jobs``, and a run is
+claimed with a conditional ``UPDATE`` in the same transaction as the flip,
+so restarts resume from the stored time and concurrent workers never fire
+the same boundary twice. The mission catalog serves user lookups from the
+flag, so every worker reloads it once a run has flipped flags.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import async_session, dialect_insert
+from app.models import Mission, SchedulerJob
+from app.services.mission_catalog_service import (
+    WINDOW_RESOLUTION,
+    mission_catalog,
+    naive_utc,
+    window_is_live,
+)
+
+logger = logging.getLogger(__name__)
+
+JOB_NAME = "mission_live_flags"
+
+
+def _live_predicate(now: datetime):
+    return and_(
+        Mission.is_active.is_(True),
+        or_(Mission.start_at.is_(None), Mission.start_at <= now),
+        or_(Mission.end_at.is_(None), Mission.end_at >= now),
+    )
+
+
+def is_live(mission: Mission, now: datetime) -> bool:
+    """Evaluate the live predicate for a single in-memory mission."""
+
+    return bool(mission.is_active) and window_is_live(
+        naive_utc(mission.start_at), naive_utc(mission.end_at), now
+    )
+
+
+def _next_boundary(mission: Mission, now: datetime) -> datetime | None:
+    start_at, end_at = naive_utc(mission.start_at), naive_utc(mission.end_at)
+    candidates = []
+    if start_at is not None and start_at > now:
+        candidates.append(start_at)
+    if end_at is not None and end_at >= now:
+        candidates.append(end_at + WINDOW_RESOLUTION)
+    return min(candidates, default=None)
+
+
+async def sync_live_flags(session: AsyncSession, now: datetime) -> int:
+    """Set ``is_live`` on every mission whose flag disagrees with its window."""
+
+    live = _live_predicate(now)
+    result = await session.execute(
+        update(Mission)
+        .where(Mission.is_live != live)
+        .values(is_live=live)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def next_transition(session: AsyncSession, now: datetime) -> datetime | None:
+    """Return the earliest future start or end boundary of an active mission."""
+
+    next_start, next_end = (
+        await session.execute(
+            select(
+                select(func.min(Mission.start_at))
+                .where(Mission.is_active.is_(True), Mission.start_at > now)
+                .scalar_subquery(),
+                select(func.min(Mission.end_at))
+                .where(Mission.is_active.is_(True), Mission.end_at >= now)
+                .scalar_subquery(),
+            )
+        )
+    ).one()
+    candidates = [naive_utc(next_start)] if next_start is not None else []
+    if next_end is not None:
+        candidates.append(naive_utc(next_end) + WINDOW_RESOLUTION)
+    return min(candidates, default=None)
+
+
+async def upcoming_transitions(session: AsyncSession, now: datetime, limit: int = 50) -> list[dict]:
+    """List the next activations and deactivations of active missions."""
+
+    starts = await session.execute(
+        select(Mission.id, Mission.code, Mission.start_at)
+        .where(Mission.is_active.is_(True), Mission.start_at > now)
+        .order_by(Mission.start_at)
+        .limit(limit)
+    )
+    ends = await session.execute(
+        select(Mission.id, Mission.code, Mission.end_at)
+        .where(Mission.is_active.is_(True), Mission.end_at >= now)
+        .order_by(Mission.end_at)
+        .limit(limit)
+    )
+    transitions = [
+        {"mission_id": mission_id, "code": code, "action": "activate", "at": naive_utc(at)}
+        for mission_id, code, at in starts
+    ]
+    transitions.extend(
+        {"mission_id": mission_id, "code": code, "action": "deactivate", "at": naive_utc(at)}
+        for mission_id, code, at in ends
+    )
+    transitions.sort(key=lambda transition: transition["at"])
+    return transitions[:limit]
+
+
+async def _ensure_job(session: AsyncSession, now: datetime) -> None:
+    insert_for_dialect = dialect_insert(session)
+    if insert_for_dialect is not None:
+        await session.execute(
+            insert_for_dialect(SchedulerJob)
+            .values(name=JOB_NAME, next_run_at=now)
+            .on_conflict_do_nothing(index_elements=[SchedulerJob.name])
+        )
+    elif await session.get(SchedulerJob, JOB_NAME) is None:
+        session.add(SchedulerJob(name=JOB_NAME, next_run_at=now))
+        await session.flush()
+
+
+async def get_job(session: AsyncSession) -> SchedulerJob | None:
+    return await session.get(SchedulerJob, JOB_NAME)
+
+
+async def reschedule_for(session: AsyncSession, mission: Mission) -> None:
+    """Apply an admin change to ``mission`` right away and move the next run
+    forward if the mission now has an earlier boundary."""
+
+    now = datetime.utcnow()
+    mission.is_live = is_live(mission, now)
+    boundary = _next_boundary(mission, now)
+    if boundary is None:
+        return
+    await _ensure_job(session, now)
+    await session.execute(
+        update(SchedulerJob)
+        .where(
+            SchedulerJob.name == JOB_NAME,
+            or_(SchedulerJob.next_run_at.is_(None), SchedulerJob.next_run_at > boundary),
+        )
+        .values(next_run_at=boundary)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def run_due(now: datetime | None = None) -> datetime | None:
+    """Flip live flags if the persisted next run is due; return the next run time.
+
+    The claiming ``UPDATE`` row-locks the job until commit, so a second
+    worker racing for the same boundary re-checks ``next_run_at`` against
+    the already advanced value and matches nothing.
+    """
+
+    now = now or datetime.utcnow()
+    async with async_session() as session:
+        await _ensure_job(session, now)
+        claimed = await session.execute(
+            update(SchedulerJob)
+            .where(SchedulerJob.name == JOB_NAME, SchedulerJob.next_run_at <= now)
+            .values(last_run_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        if claimed.rowcount == 0:
+            next_run_at, last_run_at = (
+                await session.execute(
+                    select(SchedulerJob.next_run_at, SchedulerJob.last_run_at).where(
+                        SchedulerJob.name == JOB_NAME
+                    )
+                )
+            ).one()
+            await session.commit()
+            last_run_at = naive_utc(last_run_at)
+            if last_run_at != mission_catalog.flags_run_at:
+                # Another worker ran since this catalog was loaded.
+                await mission_catalog.reload()
+                mission_catalog.flags_run_at = last_run_at
+            return naive_utc(next_run_at)
+
+        flipped = await sync_live_flags(session, now)
+        next_run_at = await next_transition(session, now)
+        await session.execute(
+            update(SchedulerJob)
+            .where(SchedulerJob.name == JOB_NAME)
+            .values(next_run_at=next_run_at)
+            .execution_options(synchronize_session=False)
+        )
+        await session.commit()
+
+    if flipped:
+        await mission_catalog.reload()
+    mission_catalog.flags_run_at = now
+    logger.info("mission scheduler flipped %d live flags, next run %s", flipped, next_run_at)
+    return next_run_at
+
+
+async def run_mission_scheduler(poll_interval: float) -> None:
+    """Run due transitions until cancelled.
+
+    Sleeps until the persisted next run, but at most ``poll_interval`` so
+    schedules moved forward by other workers are noticed.
+    """
+
+    while True:
+        try:
+            next_run_at = await run_due()
+        except Exception:
+            logger.exception("mission scheduler run failed")
+            next_run_at = None
+        delay = poll_interval
+        if next_run_at is not None:
+            delay = min(poll_interval, max((next_run_at - datetime.utcnow()).total_seconds(), 0.0))
+        await asyncio.sleep(delay)
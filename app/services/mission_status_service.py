@@ -0,0 +1,73 @@
+"""Compact per-user ``mission id -> status`` maps for mission listings."""
+
+from __future__ import annotations
+
+import uuid
+from functools import partial
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import TTLCache
+from app.config import settings
+from app.db import on_commit
+from app.models import MissionLog, MissionStatus
+
+# Status codes are small ints (shared objects), so a map costs one dict slot
+# per mission the user has been shown; 0 records "no log" for that mission.
+_NONE = 0
+_STATUS_NAMES = ("NONE", *(status.value for status in MissionStatus))
+_STATUS_CODES = {status: code for code, status in enumerate(MissionStatus, start=1)}
+
+# Maps are per process and only see the writes this worker commits, so the
+# TTL bounds how long a review made through another worker can go unseen.
+status_maps: TTLCache[uuid.UUID, dict[uuid.UUID, int]] = TTLCache(
+    maxsize=settings.mission_status_cache_max_entries,
+    ttl=settings.mission_status_cache_ttl_seconds,
+)
+
+
+async def get_mission_statuses(
+    session: AsyncSession, user_id: uuid.UUID, mission_ids: list[uuid.UUID]
+) -> dict[uuid.UUID, str]:
+    """Return the user's status name for each of ``mission_ids`` ("NONE" if never started).
+
+    Only missions missing from the cached map are queried, reading two
+    columns rather than whole ``MissionLog`` rows. Statuses noted by commits
+    that land while the query is in flight are newer, so they are kept.
+    """
+
+    codes = status_maps.get(user_id)
+    if codes is None:
+        codes = {}
+        status_maps.set(user_id, codes)
+
+    missing = [mission_id for mission_id in mission_ids if mission_id not in codes]
+    if missing:
+        rows = await session.execute(
+            select(MissionLog.mission_id, MissionLog.status).where(
+                MissionLog.user_id == user_id,
+                MissionLog.mission_id.in_(missing),
+            )
+        )
+        fetched = dict.fromkeys(missing, _NONE)
+        for mission_id, status in rows:
+            fetched[mission_id] = _STATUS_CODES[status]
+        for mission_id, code in fetched.items():
+            codes.setdefault(mission_id, code)
+
+    return {mission_id: _STATUS_NAMES[codes[mission_id]] for mission_id in mission_ids}
+
+
+def _store_status(user_id: uuid.UUID, mission_id: uuid.UUID, code: int) -> None:
+    codes = status_maps.get(user_id)
+    if codes is not None:
+        codes[mission_id] = code
+
+
+def note_mission_status(
+    session: AsyncSession, user_id: uuid.UUID, mission_id: uuid.UUID, status: MissionStatus
+) -> None:
+    """Update the user's cached map in place once ``session`` commits."""
+
+    on_commit(session, partial(_store_status, user_id, mission_id, _STATUS_CODES[status]))
@@ -25,5 +25,4 @@ async def send_notification(
         sent_at=datetime.utcnow(),
     )
     session.add(notification)
-    await session.flush()
     return notification
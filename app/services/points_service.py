@@ -0,0 +1,200 @@
+"""Points ledger writes, balance reads, snapshot compaction and reconciliation."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from functools import partial
+
+from sqlalchemy import bindparam, func, insert, or_, select, text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db import async_session, dialect_insert, on_commit
+from app.models import PointsLedgerEntry, PointsSnapshot, User, UserStats
+from app.security import invalidate_cached_user
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary key for the PostgreSQL advisory lock serialising compactions
+# across worker processes. SQLite writers are already serialised.
+_COMPACTION_LOCK_KEY = 0x706F696E
+
+
+async def record_points(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    delta: int,
+    reason: str,
+    mission_log_id: uuid.UUID | None = None,
+) -> None:
+    """Append a signed ledger entry and keep ``User.total_points`` in step."""
+
+    await record_points_bulk(
+        session,
+        [{"user_id": user_id, "delta": delta, "reason": reason, "mission_log_id": mission_log_id}],
+    )
+
+
+def _invalidate_cached_users(user_ids: list[uuid.UUID]) -> None:
+    for user_id in user_ids:
+        invalidate_cached_user(user_id)
+
+
+async def record_points_bulk(session: AsyncSession, entries: list[dict]) -> None:
+    """Append many ledger entries (``user_id``, ``delta``, ``reason`` and
+    ``mission_log_id`` keys) and apply one ``total_points`` update per user."""
+
+    entries = [entry for entry in entries if entry["delta"]]
+    if not entries:
+        return
+    totals: dict[uuid.UUID, int] = {}
+    for entry in entries:
+        totals[entry["user_id"]] = totals.get(entry["user_id"], 0) + entry["delta"]
+
+    await session.execute(insert(PointsLedgerEntry), entries)
+    users = User.__table__
+    await session.execute(
+        update(users)
+        .where(users.c.id == bindparam("b_user_id"))
+        .values(total_points=users.c.total_points + bindparam("b_delta")),
+        [{"b_user_id": user_id, "b_delta": delta} for user_id, delta in totals.items()],
+    )
+    on_commit(session, partial(_invalidate_cached_users, list(totals)))
+
+
+def _ledger_balance(user_id):
+    """Snapshot balance plus the ledger entries written after it."""
+
+    last_entry_id = (
+        select(PointsSnapshot.last_entry_id)
+        .where(PointsSnapshot.user_id == user_id)
+        .scalar_subquery()
+    )
+    snapshot_balance = (
+        select(PointsSnapshot.balance).where(PointsSnapshot.user_id == user_id).scalar_subquery()
+    )
+    tail = (
+        select(func.coalesce(func.sum(PointsLedgerEntry.delta), 0))
+        .where(
+            PointsLedgerEntry.user_id == user_id,
+            PointsLedgerEntry.id > func.coalesce(last_entry_id, 0),
+        )
+        .scalar_subquery()
+    )
+    return func.coalesce(snapshot_balance, 0) + tail
+
+
+async def get_points_balance(session: AsyncSession, user_id: uuid.UUID) -> int:
+    """Return the user's ledger balance."""
+
+    return await session.scalar(select(_ledger_balance(user_id)))
+
+
+async def compact_points_snapshots(session: AsyncSession) -> int:
+    """Fold ledger entries written since the last compaction into the snapshots.
+
+    Ledger rows are never deleted; snapshots only bound how much of the
+    ledger a balance read has to sum. Returns the number of users updated.
+
+    Ledger ids are allocated before their transaction commits, so an entry
+    with a lower id can become visible after a higher one. Only entries
+    older than ``points_compaction_horizon_seconds`` are folded, on the
+    assumption that no write transaction stays open that long; later
+    entries stay in the tail that balance reads sum.
+    """
+
+    if session.bind.dialect.name == "postgresql":
+        await session.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"), {"key": _COMPACTION_LOCK_KEY}
+        )
+
+    horizon = datetime.now(timezone.utc) - timedelta(
+        seconds=settings.points_compaction_horizon_seconds
+    )
+    high_water = await session.scalar(
+        select(func.max(PointsLedgerEntry.id)).where(PointsLedgerEntry.created_at < horizon)
+    )
+    if high_water is None:
+        return 0
+
+    tails = (
+        select(
+            PointsLedgerEntry.user_id,
+            func.sum(PointsLedgerEntry.delta),
+            func.max(PointsLedgerEntry.id),
+        )
+        .outerjoin(PointsSnapshot, PointsSnapshot.user_id == PointsLedgerEntry.user_id)
+        .where(
+            PointsLedgerEntry.id > func.coalesce(PointsSnapshot.last_entry_id, 0),
+            PointsLedgerEntry.id <= high_water,
+        )
+        .group_by(PointsLedgerEntry.user_id)
+    )
+
+    insert_for_dialect = dialect_insert(session)
+    if insert_for_dialect is None:
+        rows = (await session.execute(tails)).all()
+        for user_id, delta, last_entry_id in rows:
+            snapshot = await session.get(PointsSnapshot, user_id)
+            if snapshot is None:
+                snapshot = PointsSnapshot(user_id=user_id, balance=0)
+            snapshot.balance += delta
+            snapshot.last_entry_id = last_entry_id
+            session.add(snapshot)
+        return len(rows)
+
+    stmt = insert_for_dialect(PointsSnapshot).from_select(
+        ["user_id", "balance", "last_entry_id"], tails
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[PointsSnapshot.user_id],
+        set_={
+            "balance": PointsSnapshot.balance + stmt.excluded.balance,
+            "last_entry_id": stmt.excluded.last_entry_id,
+            "updated_at": func.now(),
+        },
+    )
+    result = await session.execute(stmt)
+    return result.rowcount
+
+
+async def reconcile_points(session: AsyncSession, limit: int = 100) -> list[dict]:
+    """List users whose ledger balance disagrees with ``User.total_points`` or
+    the dashboard counter in ``user_stats``."""
+
+    ledger_balance = _ledger_balance(User.id).label("ledger_balance")
+    stats_points = func.coalesce(UserStats.total_points, 0)
+    query = (
+        select(User.id, ledger_balance, User.total_points, stats_points)
+        .outerjoin(UserStats, UserStats.user_id == User.id)
+        .where(or_(ledger_balance != User.total_points, ledger_balance != stats_points))
+        .order_by(User.id)
+        .limit(limit)
+    )
+    return [
+        {
+            "user_id": user_id,
+            "ledger_balance": balance,
+            "user_total_points": user_points,
+            "dashboard_total_points": dashboard_points,
+        }
+        for user_id, balance, user_points, dashboard_points in await session.execute(query)
+    ]
+
+
+async def run_points_compaction(interval: float) -> None:
+    """Compact snapshots every ``interval`` seconds until cancelled."""
+
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with async_session() as session:
+                compacted = await compact_points_snapshots(session)
+                await session.commit()
+        except Exception:
+            logger.exception("points snapshot compaction failed")
+        else:
+            logger.info("points snapshots compacted for %d users", compacted)
@@ -0,0 +1,340 @@
+"""Streaming bulk import of distributor purchase files.
+
+Files are CSV (with a header row) or NDJSON, one purchase per record, keyed
+by ``users.customer_code``. Input is decoded incrementally and processed in
+fixed-size batches: each batch resolves its customers with one ``IN`` query,
+probes invoice fingerprints with another, inserts purchases, their brand
+rows and pending mission logs with ``executemany`` and commits, so memory
+stays flat regardless of file size. The import runs on its own session, not
+the caller's unit of work. Rows that fail validation are reported by line
+and skipped; if a batch fails, it is rolled back and the error propagates,
+while the batches before it stay imported.
+"""
+
+from __future__ import annotations
+
+import codecs
+import csv
+import json
+import uuid
+from collections import Counter
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from functools import partial
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.db import async_session, chunked, on_commit
+from app.models import MissionLog, MissionStatus, MissionType, Purchase, PurchaseBrand, User
+from app.models.purchase import brand_names, invoice_fingerprint
+from app.services.invoice_service import invoice_filter
+from app.services.mission_catalog_service import CatalogMission, mission_catalog
+from app.services.mission_status_service import note_mission_status
+from app.services.user_stats_service import apply_user_stats_deltas
+
+IMPORT_FORMATS = ("csv", "ndjson")
+CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+@dataclass
+class ImportReport:
+    rows: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    errors: list[dict] = field(default_factory=list)
+
+    def fail(self, line: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < settings.purchase_import_max_errors:
+            self.errors.append({"line": line, "error": message})
+
+
+class _RecordSplitter:
+    """Split decoded text into ``(first line number, record)`` pairs.
+
+    With ``quoted`` a record continues over newlines inside double quotes,
+    as CSV allows; escaped quotes come in pairs and keep the parity even.
+    """
+
+    def __init__(self, quoted: bool) -> None:
+        self.quoted = quoted
+        self._tail = ""
+        self._line_number = 0
+        self._record: list[str] = []
+        self._start = 0
+        self._quotes = 0
+
+    def _take(self, lines: list[str]) -> list[tuple[int, str]]:
+        records = []
+        for line in lines:
+            self._line_number += 1
+            if not self._record:
+                self._start = self._line_number
+            self._record.append(line.rstrip("\r"))
+            if self.quoted:
+                self._quotes += line.count('"')
+                if self._quotes % 2:
+                    continue
+            records.append((self._start, "\n".join(self._record)))
+            self._record = []
+            self._quotes = 0
+        return records
+
+    def feed(self, text: str) -> list[tuple[int, str]]:
+        *lines, self._tail = (self._tail + text).split("\n")
+        return self._take(lines)
+
+    def close(self) -> list[tuple[int, str]]:
+        records = self._take([self._tail] if self._tail else [])
+        self._tail = ""
+        if self._record:
+            records.append((self._start, "\n".join(self._record)))
+        return records
+
+
+async def _records(chunks: AsyncIterable[bytes], quoted: bool) -> AsyncIterator[tuple[int, str]]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    splitter = _RecordSplitter(quoted)
+    async for chunk in chunks:
+        for record in splitter.feed(decoder.decode(chunk)):
+            yield record
+    for record in splitter.feed(decoder.decode(b"", final=True)) + splitter.close():
+        yield record
+
+
+async def _rows(chunks: AsyncIterable[bytes], fmt: str) -> AsyncIterator[tuple[int, dict | str]]:
+    """Yield ``(line number, row)``; unparsable records yield an error message instead."""
+
+    header: list[str] | None = None
+    async for line_number, record in _records(chunks, quoted=fmt == "csv"):
+        if not record.strip():
+            continue
+        if fmt == "ndjson":
+            try:
+                row = json.loads(record)
+            except ValueError as exc:
+                yield line_number, f"invalid JSON: {exc}"
+                continue
+            yield line_number, row if isinstance(row, dict) else "expected a JSON object"
+            continue
+        values = next(csv.reader([record]))
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield line_number, f"expected {len(header)} columns, got {len(values)}"
+            continue
+        yield line_number, dict(zip(header, values))
+
+
+def _text(row: dict, name: str) -> str | None:
+    value = row.get(name)
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _brands(value) -> list[str] | None:
+    if value is None or value == "":
+        return None
+    if isinstance(value, list):
+        brands = [str(brand).strip() for brand in value]
+    else:
+        brands = [brand.strip() for brand in str(value).split("|")]
+    return [brand for brand in brands if brand] or None
+
+
+def _purchase_values(row: dict, user_id: uuid.UUID) -> dict:
+    """Validate one row into ``Purchase`` column values, raising ``ValueError``."""
+
+    try:
+        amount = Decimal(str(row.get("amount", "")).strip())
+    except InvalidOperation:
+        raise ValueError(f"invalid amount {row.get('amount')!r}") from None
+    if not amount.is_finite() or amount <= 0:
+        raise ValueError("amount must be positive")
+    try:
+        purchase_date = date.fromisoformat(str(row.get("purchase_date", "")).strip())
+    except ValueError:
+        raise ValueError(f"invalid purchase_date {row.get('purchase_date')!r}") from None
+
+    invoice_number = _text(row, "invoice_number")
+    return {
+        "id": uuid.uuid4(),
+        "user_id": user_id,
+        "amount": amount,
+        "purchase_date": purchase_date,
+        # Distributor dumps carry no invoice photo.
+        "invoice_image_url": _text(row, "invoice_image_url") or "",
+        "description": _text(row, "description"),
+        "brands": _brands(row.get("brands")),
+        "invoice_number": invoice_number,
+        "product_category": _text(row, "product_category"),
+        "barcode": _text(row, "barcode"),
+        "invoice_fingerprint": invoice_fingerprint(invoice_number),
+        "duplicate_of_id": None,
+        "status": MissionStatus.PENDING,
+        "mission_id": None,
+        "mission_log_id": None,
+    }
+
+
+class _Importer:
+    def __init__(self, session: AsyncSession, mission: CatalogMission | None) -> None:
+        self.session = session
+        self.mission = mission
+        self.report = ImportReport()
+        self.user_ids: dict[str, uuid.UUID | None] = {}
+
+    async def _resolve_customers(self, rows: list[tuple[int, dict]]) -> None:
+        codes = list(
+            {
+                code
+                for _, row in rows
+                if (code := _text(row, "customer_code")) is not None and code not in self.user_ids
+            }
+        )
+        for chunk in chunked(codes):
+            self.user_ids.update(dict.fromkeys(chunk))
+            found = await self.session.execute(
+                select(User.customer_code, User.id).where(User.customer_code.in_(chunk))
+            )
+            self.user_ids.update(dict(found.all()))
+
+    async def _link_duplicates(self, purchases: list[dict]) -> None:
+        candidates = list(
+            {
+                fingerprint
+                for purchase in purchases
+                if (fingerprint := purchase["invoice_fingerprint"]) is not None
+                and invoice_filter.might_exist(fingerprint)
+            }
+        )
+        first: dict[str, uuid.UUID] = {}
+        for chunk in chunked(candidates):
+            rows = await self.session.execute(
+                select(Purchase.invoice_fingerprint, Purchase.id)
+                .where(Purchase.invoice_fingerprint.in_(chunk))
+                .order_by(Purchase.created_at.desc(), Purchase.id.desc())
+            )
+            # Descending order leaves the earliest purchase in the dict.
+            first.update(rows.all())
+        for purchase in purchases:
+            fingerprint = purchase["invoice_fingerprint"]
+            if fingerprint is None:
+                continue
+            original = first.setdefault(fingerprint, purchase["id"])
+            if original != purchase["id"]:
+                purchase["duplicate_of_id"] = original
+                self.report.duplicates += 1
+
+    async def import_batch(self, rows: list[tuple[int, dict]]) -> None:
+        await self._resolve_customers(rows)
+        purchases: list[dict] = []
+        for line_number, row in rows:
+            code = _text(row, "customer_code")
+            user_id = self.user_ids.get(code) if code else None
+            if user_id is None:
+                self.report.fail(line_number, f"unknown customer_code {code!r}")
+                continue
+            try:
+                purchases.append(_purchase_values(row, user_id))
+            except ValueError as exc:
+                self.report.fail(line_number, str(exc))
+        if not purchases:
+            return
+
+        await self._link_duplicates(purchases)
+        logs: list[dict] = []
+        if self.mission is not None:
+            for purchase in purchases:
+                purchase["mission_id"] = self.mission.id
+                purchase["mission_log_id"] = uuid.uuid4()
+                logs.append(
+                    {
+                        "id": purchase["mission_log_id"],
+                        "mission_id": self.mission.id,
+                        "user_id": purchase["user_id"],
+                        "status": MissionStatus.PENDING,
+                        "is_repeatable": True,
+                        "payload": {
+                            "amount": float(purchase["amount"]),
+                            "invoice_number": purchase["invoice_number"],
+                            "brands": purchase["brands"],
+                            "product_category": purchase["product_category"],
+                            "barcode": purchase["barcode"],
+                        },
+                    }
+                )
+            await self.session.execute(insert(MissionLog.__table__), logs)
+        await self.session.execute(insert(Purchase.__table__), purchases)
+        purchase_brands = [
+            {"purchase_id": purchase["id"], "brand": brand}
+            for purchase in purchases
+            for brand in brand_names(purchase["brands"])
+        ]
+        if purchase_brands:
+            await self.session.execute(insert(PurchaseBrand.__table__), purchase_brands)
+
+        if logs:
+            pending = Counter(log["user_id"] for log in logs)
+            await apply_user_stats_deltas(
+                self.session,
+                {user_id: {"missions_pending": count} for user_id, count in pending.items()},
+            )
+            for user_id in pending:
+                note_mission_status(self.session, user_id, self.mission.id, MissionStatus.PENDING)
+        fingerprints = [
+            purchase["invoice_fingerprint"]
+            for purchase in purchases
+            if purchase["invoice_fingerprint"] is not None
+        ]
+        on_commit(self.session, partial(invoice_filter.add_many, fingerprints))
+        await self.session.commit()
+        self.report.imported += len(purchases)
+
+
+async def import_purchases(
+    chunks: AsyncIterable[bytes],
+    fmt: str,
+    batch_size: int | None = None,
+) -> ImportReport:
+    """Import purchases from a CSV or NDJSON byte stream, committing per batch
+    on a session of its own.
+
+    Imported purchases start ``PENDING`` with a mission log against the
+    active purchase mission, exactly like ``POST /purchase/``, and go
+    through the normal review queue.
+    """
+
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"unsupported import format {fmt!r}")
+    batch_size = batch_size or settings.purchase_import_batch_size
+    mission = await mission_catalog.first_active(MissionType.PURCHASE)
+    async with async_session() as session:
+        importer = _Importer(session, mission)
+        batch: list[tuple[int, dict]] = []
+        async for line_number, row in _rows(chunks, fmt):
+            importer.report.rows += 1
+            if isinstance(row, str):
+                importer.report.fail(line_number, row)
+                continue
+            batch.append((line_number, row))
+            if len(batch) >= batch_size:
+                await importer.import_batch(batch)
+                batch = []
+        if batch:
+            await importer.import_batch(batch)
+    importer.report.errors.sort(key=lambda error: error["line"])
+    return importer.report
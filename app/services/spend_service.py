@@ -0,0 +1,211 @@
+"""Incremental maintenance of the monthly spend rollups.
+
+Only approved purchases count. A purchase adds its amount when it moves
+into ``APPROVED`` and subtracts it when an approved purchase is rejected,
+so analytics read the rollup tables and never aggregate ``purchases``.
+"""
+
+from __future__ import annotations
+
+import uuid
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import chunked, dialect_insert
+from app.models import (
+    BrandMonthlySpend,
+    CityMonthlySpend,
+    MissionStatus,
+    Purchase,
+    User,
+    UserMonthlySpend,
+)
+from app.models.purchase import brand_names
+
+DIMENSIONS = {
+    "users": (UserMonthlySpend, "user_id"),
+    "brands": (BrandMonthlySpend, "brand"),
+    "cities": (CityMonthlySpend, "city"),
+}
+
+_REBUILD_PAGE = 10_000
+
+
+def _month(day: date) -> date:
+    return day.replace(day=1)
+
+
+class SpendDeltas:
+    """Signed amount and count changes per rollup row."""
+
+    def __init__(self) -> None:
+        self.rows: dict[str, dict[tuple, list]] = {
+            dimension: defaultdict(lambda: [Decimal(0), 0]) for dimension in DIMENSIONS
+        }
+
+    def add(
+        self,
+        user_id: uuid.UUID,
+        city: str | None,
+        brands: list[str] | None,
+        purchase_date: date,
+        amount: Decimal,
+        sign: int = 1,
+    ) -> None:
+        month = _month(purchase_date)
+        amount = Decimal(amount) * sign
+        keys = [("users", user_id), ("cities", (city or "").strip()[:128])]
+        keys.extend(("brands", brand) for brand in brand_names(brands))
+        for dimension, key in keys:
+            totals = self.rows[dimension][(key, month)]
+            totals[0] += amount
+            totals[1] += sign
+
+
+async def apply_spend_deltas(session: AsyncSession, deltas: SpendDeltas) -> None:
+    """Add ``deltas`` to the rollup tables with one upsert per table."""
+
+    insert_for_dialect = dialect_insert(session)
+    for dimension, rows in deltas.rows.items():
+        rows = {key: totals for key, totals in rows.items() if totals[0] or totals[1]}
+        if not rows:
+            continue
+        model, key_column = DIMENSIONS[dimension]
+        if insert_for_dialect is None:
+            for (key, month), (amount, purchases) in rows.items():
+                spend = await session.get(model, (key, month))
+                if spend is None:
+                    spend = model(**{key_column: key}, month=month, amount=0, purchases=0)
+                spend.amount += amount
+                spend.purchases += purchases
+                session.add(spend)
+            continue
+
+        stmt = insert_for_dialect(model).values(
+            [
+                {key_column: key, "month": month, "amount": amount, "purchases": purchases}
+                for (key, month), (amount, purchases) in rows.items()
+            ]
+        )
+        await session.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[getattr(model, key_column), model.month],
+                set_={
+                    "amount": model.amount + stmt.excluded.amount,
+                    "purchases": model.purchases + stmt.excluded.purchases,
+                    "updated_at": func.now(),
+                },
+            )
+        )
+
+
+def _spend_source():
+    return select(
+        Purchase.id,
+        Purchase.user_id,
+        func.coalesce(Purchase.spend_city, User.city),
+        Purchase.brands,
+        Purchase.purchase_date,
+        Purchase.amount,
+    ).join(User, User.id == Purchase.user_id)
+
+
+def _store_city():
+    return select(func.coalesce(User.city, "")).where(User.id == Purchase.user_id).scalar_subquery()
+
+
+async def record_purchase_review_spend(
+    session: AsyncSession, previous: dict[uuid.UUID, MissionStatus], target: MissionStatus
+) -> None:
+    """Apply the spend change of moving purchases from their ``previous``
+    status to ``target``.
+
+    Pass only the purchases the review actually moved, i.e. those whose
+    status update matched a row. Approvals record the store's current city
+    on the purchase and credit it; reversals debit the recorded city.
+    """
+
+    deltas = SpendDeltas()
+    for chunk in chunked(list(previous)):
+        if target == MissionStatus.APPROVED:
+            await session.execute(
+                update(Purchase)
+                .where(Purchase.id.in_(chunk))
+                .values(spend_city=_store_city())
+                .execution_options(synchronize_session=False)
+            )
+        rows = await session.execute(_spend_source().where(Purchase.id.in_(chunk)))
+        for purchase_id, user_id, city, brands, purchase_date, amount in rows:
+            was_approved = previous[purchase_id] == MissionStatus.APPROVED
+            if target == MissionStatus.APPROVED and not was_approved:
+                deltas.add(user_id, city, brands, purchase_date, amount)
+            elif target != MissionStatus.APPROVED and was_approved:
+                deltas.add(user_id, city, brands, purchase_date, amount, sign=-1)
+    await apply_spend_deltas(session, deltas)
+
+
+async def rebuild_spend_rollups(session: AsyncSession) -> int:
+    """Recompute every rollup from approved purchases, reading them in keyset pages.
+
+    Returns the number of purchases counted. Purchases are attributed to
+    the city recorded when they were approved.
+    """
+
+    for model, _ in DIMENSIONS.values():
+        await session.execute(delete(model))
+
+    deltas = SpendDeltas()
+    counted = 0
+    last: uuid.UUID | None = None
+    query = _spend_source().where(Purchase.status == MissionStatus.APPROVED).order_by(Purchase.id)
+    while True:
+        page_query = query if last is None else query.where(Purchase.id > last)
+        page = (await session.execute(page_query.limit(_REBUILD_PAGE))).all()
+        for _, user_id, city, brands, purchase_date, amount in page:
+            deltas.add(user_id, city, brands, purchase_date, amount)
+        counted += len(page)
+        if len(page) < _REBUILD_PAGE:
+            break
+        last = page[-1][0]
+
+    for dimension, rows in deltas.rows.items():
+        model, key_column = DIMENSIONS[dimension]
+        values = [
+            {key_column: key, "month": month, "amount": amount, "purchases": purchases}
+            for (key, month), (amount, purchases) in rows.items()
+        ]
+        for start in range(0, len(values), _REBUILD_PAGE):
+            await session.execute(insert(model), values[start : start + _REBUILD_PAGE])
+    return counted
+
+
+async def list_spend(
+    session: AsyncSession,
+    dimension: str,
+    start: date | None = None,
+    end: date | None = None,
+    key: str | uuid.UUID | None = None,
+    limit: int = 100,
+) -> list[dict]:
+    """Read one rollup, newest month first and largest spend first within a month."""
+
+    model, key_column = DIMENSIONS[dimension]
+    column = getattr(model, key_column)
+    query = select(column, model.month, model.amount, model.purchases)
+    if start is not None:
+        query = query.where(model.month >= _month(start))
+    if end is not None:
+        query = query.where(model.month <= _month(end))
+    if key is not None:
+        query = query.where(column == key)
+    rows = await session.execute(
+        query.order_by(model.month.desc(), model.amount.desc(), column).limit(limit)
+    )
+    return [
+        {key_column: row_key, "month": month, "amount": float(amount), "purchases": purchases}
+        for row_key, month, amount, purchases in rows
+    ]
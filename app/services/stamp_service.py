@@ -7,6 +7,7 @@ import uuid
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Stamp
+from app.services.user_stats_service import record_stamp
 
 
 async def award_stamps(
@@ -19,5 +20,5 @@ async def award_stamps(
 
     stamp = Stamp(user_id=user_id, mission_log_id=mission_log_id, value=amount)
     session.add(stamp)
-    await session.flush()
+    await record_stamp(session, user_id)
     return stamp
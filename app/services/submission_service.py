@@ -0,0 +1,131 @@
+"""Loading and claiming of reviewable submissions with their mission context."""
+
+from __future__ import annotations
+
+import uuid
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.db import acquire_writer_lane, chunked
+from app.models import Display, Mission, MissionLog, MissionStatus, Purchase, Referral
+from app.services.user_stats_service import record_mission_transition
+
+Submission = TypeVar("Submission", Purchase, Display, Referral)
+Reviewable = TypeVar("Reviewable", Purchase, Display, Referral, MissionLog)
+
+
+@dataclass
+class ResolvedSubmission(Generic[Submission]):
+    """A submission row with the mission log and mission it is reviewed against."""
+
+    submission: Submission
+    mission_log: MissionLog | None
+    mission: Mission | None
+
+
+async def resolve_submission(
+    session: AsyncSession, model: type[Submission], submission_id: uuid.UUID
+) -> ResolvedSubmission[Submission] | None:
+    """Load a purchase, display or referral, its mission log and its mission.
+
+    The mission comes from the log when there is one, otherwise from the
+    submission's own ``mission_id``. The submission row is locked until the
+    transaction ends: by ``FOR UPDATE`` on PostgreSQL, and on SQLite by
+    taking the writer lane before the read. Concurrent reviews therefore
+    cannot both read the old status.
+    """
+
+    await acquire_writer_lane(session)
+    row = (
+        await session.execute(
+            select(model, MissionLog, Mission)
+            .outerjoin(MissionLog, MissionLog.id == model.mission_log_id)
+            .outerjoin(Mission, Mission.id == func.coalesce(MissionLog.mission_id, model.mission_id))
+            .where(model.id == submission_id)
+            .with_for_update(of=model)
+            .execution_options(populate_existing=True)
+        )
+    ).first()
+    if row is None:
+        return None
+    return ResolvedSubmission(*row)
+
+
+async def resolve_mission_log(
+    session: AsyncSession, log_id: uuid.UUID
+) -> tuple[MissionLog, Mission | None] | None:
+    """Load a mission log and its mission, locking the log like ``resolve_submission``."""
+
+    await acquire_writer_lane(session)
+    row = (
+        await session.execute(
+            select(MissionLog, Mission)
+            .outerjoin(Mission, Mission.id == MissionLog.mission_id)
+            .where(MissionLog.id == log_id)
+            .with_for_update(of=MissionLog)
+            .execution_options(populate_existing=True)
+        )
+    ).first()
+    if row is None:
+        return None
+    return row[0], row[1]
+
+
+async def claim_many(
+    session: AsyncSession, model: type[Reviewable], ids: list[uuid.UUID], **values
+) -> set[uuid.UUID]:
+    """Write ``values`` to the rows of ``model`` in ``ids`` that do not hold
+    them yet, and return the ids of the rows this transaction changed."""
+
+    guard = or_(*(getattr(model, column).is_distinct_from(value) for column, value in values.items()))
+    claimed: set[uuid.UUID] = set()
+    for chunk in chunked(sorted(ids)):
+        rows = await session.scalars(
+            update(model)
+            .where(model.id.in_(chunk), guard)
+            .values(**values)
+            .returning(model.id)
+            .execution_options(synchronize_session=False)
+        )
+        claimed.update(rows)
+    return claimed
+
+
+async def claim(session: AsyncSession, row: Reviewable, **values) -> bool:
+    """Write ``values`` to ``row`` unless it already holds them.
+
+    The conditional ``UPDATE ... RETURNING`` is the guard of a review: it
+    reports whether this transaction changed the row, and only then may the
+    caller apply the review's side effects. ``row`` reflects ``values``
+    either way.
+    """
+
+    claimed = bool(await claim_many(session, type(row), [row.id], **values))
+    for column, value in values.items():
+        set_committed_value(row, column, value)
+    return claimed
+
+
+async def move_mission_log(
+    session: AsyncSession, mission_log: MissionLog, target: MissionStatus, reward_points: int = 0
+) -> bool:
+    """Claim ``mission_log``'s move to ``target`` and record the transition's
+    counters and points. Returns whether the log moved."""
+
+    previous = mission_log.status
+    if not await claim(session, mission_log, status=target):
+        return False
+    await record_mission_transition(
+        session,
+        mission_log.user_id,
+        previous,
+        target,
+        reward_points,
+        mission_log.id,
+        mission_id=mission_log.mission_id,
+    )
+    return True
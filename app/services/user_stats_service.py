@@ -0,0 +1,179 @@
+"""Incremental maintenance of the per-user ``user_stats`` projection."""
+
+from __future__ import annotations
+
+import uuid
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import dialect_insert, note_write
+from app.models import MissionLog, MissionStatus, PointsLedgerEntry, Stamp, User, UserStats
+from app.services.dashboard_service import invalidate_dashboards
+from app.services.mission_status_service import note_mission_status
+from app.services.points_service import record_points
+
+_STATUS_COLUMNS = {
+    MissionStatus.PENDING: "missions_pending",
+    MissionStatus.APPROVED: "missions_approved",
+    MissionStatus.REJECTED: "missions_rejected",
+}
+_COUNTER_COLUMNS = ("total_stamps", "total_points", *_STATUS_COLUMNS.values())
+
+
+async def apply_user_stats_deltas(
+    session: AsyncSession, deltas_by_user: dict[uuid.UUID, dict[str, int]]
+) -> None:
+    """Add counter deltas for many users in one upsert statement."""
+
+    deltas_by_user = {
+        user_id: deltas for user_id, deltas in deltas_by_user.items() if any(deltas.values())
+    }
+    if not deltas_by_user:
+        return
+    invalidate_dashboards(session, list(deltas_by_user))
+    for user_id in deltas_by_user:
+        note_write(session, user_id)
+
+    insert_for_dialect = dialect_insert(session)
+    if insert_for_dialect is None:
+        for user_id, deltas in deltas_by_user.items():
+            stats = await session.get(UserStats, user_id)
+            if stats is None:
+                stats = UserStats(user_id=user_id, **{column: 0 for column in _COUNTER_COLUMNS})
+            for column, delta in deltas.items():
+                setattr(stats, column, getattr(stats, column) + delta)
+            session.add(stats)
+        return
+
+    rows = [
+        {"user_id": user_id, **{column: deltas.get(column, 0) for column in _COUNTER_COLUMNS}}
+        for user_id, deltas in deltas_by_user.items()
+    ]
+    stmt = insert_for_dialect(UserStats).values(rows)
+    updates = {
+        column: getattr(UserStats, column) + getattr(stmt.excluded, column)
+        for column in _COUNTER_COLUMNS
+    }
+    updates["updated_at"] = func.now()
+    await session.execute(
+        stmt.on_conflict_do_update(index_elements=[UserStats.user_id], set_=updates)
+    )
+
+
+async def _apply_deltas(session: AsyncSession, user_id: uuid.UUID, deltas: dict[str, int]) -> None:
+    await apply_user_stats_deltas(session, {user_id: deltas})
+
+
+def transition_deltas(
+    previous: MissionStatus | None, current: MissionStatus, reward_points: int = 0
+) -> dict[str, int]:
+    """Counter deltas for moving one mission log from ``previous`` to ``current``."""
+
+    deltas = {_STATUS_COLUMNS[current]: 1}
+    if previous is not None:
+        deltas[_STATUS_COLUMNS[previous]] = -1
+    if current == MissionStatus.APPROVED:
+        deltas["total_points"] = reward_points
+    elif previous == MissionStatus.APPROVED:
+        deltas["total_points"] = -reward_points
+    return deltas
+
+
+def ledger_reason(current: MissionStatus) -> str:
+    """Ledger reason for the points a transition into ``current`` moves."""
+
+    return "MISSION_APPROVED" if current == MissionStatus.APPROVED else "MISSION_REVOKED"
+
+
+async def record_mission_transition(
+    session: AsyncSession,
+    user_id: uuid.UUID,
+    previous: MissionStatus | None,
+    current: MissionStatus,
+    reward_points: int = 0,
+    mission_log_id: uuid.UUID | None = None,
+    mission_id: uuid.UUID | None = None,
+) -> None:
+    """Move a mission log between status counters; approved logs carry their points.
+
+    Points gained or revoked by the transition are also written to the ledger,
+    and ``mission_id`` keeps the user's cached mission status map current.
+    """
+
+    if previous == current:
+        return
+    if mission_id is not None:
+        note_mission_status(session, user_id, mission_id, current)
+    deltas = transition_deltas(previous, current, reward_points)
+    if deltas.get("total_points"):
+        await record_points(
+            session, user_id, deltas["total_points"], ledger_reason(current), mission_log_id
+        )
+    await _apply_deltas(session, user_id, deltas)
+
+
+async def record_reward_points(
+    session: AsyncSession, user_id: uuid.UUID, points: int, reason: str
+) -> None:
+    """Credit points that no mission log carries, e.g. a purchase approved
+    while its mission had no log, to the ledger and the dashboard total.
+    Negative ``points`` revoke such a credit when the approval is reversed."""
+
+    await record_points(session, user_id, points, reason)
+    await _apply_deltas(session, user_id, {"total_points": points})
+
+
+async def record_stamp(session: AsyncSession, user_id: uuid.UUID) -> None:
+    """Count one newly awarded stamp row."""
+
+    await _apply_deltas(session, user_id, {"total_stamps": 1})
+
+
+async def get_user_stats(session: AsyncSession, user_id: uuid.UUID) -> UserStats:
+    """Return the user's counters, all zero if nothing has been recorded yet."""
+
+    stats = await session.get(UserStats, user_id)
+    if stats is None:
+        stats = UserStats(user_id=user_id, **{column: 0 for column in _COUNTER_COLUMNS})
+    return stats
+
+
+def _status_count(status: MissionStatus):
+    return (
+        select(func.count())
+        .select_from(MissionLog)
+        .where(MissionLog.user_id == User.id, MissionLog.status == status)
+        .scalar_subquery()
+    )
+
+
+async def rebuild_user_stats(session: AsyncSession) -> int:
+    """Recompute every user's counters from mission logs, stamps and the
+    points ledger.
+
+    Returns the number of users written.
+    """
+
+    total_stamps = (
+        select(func.count()).select_from(Stamp).where(Stamp.user_id == User.id).scalar_subquery()
+    )
+    total_points = (
+        select(func.coalesce(func.sum(PointsLedgerEntry.delta), 0))
+        .where(PointsLedgerEntry.user_id == User.id)
+        .scalar_subquery()
+    )
+    source = select(
+        User.id,
+        total_stamps,
+        total_points,
+        _status_count(MissionStatus.PENDING),
+        _status_count(MissionStatus.APPROVED),
+        _status_count(MissionStatus.REJECTED),
+    )
+
+    await session.execute(delete(UserStats))
+    result = await session.execute(
+        insert(UserStats).from_select(["user_id", *_COUNTER_COLUMNS], source)
+    )
+    return result.rowcount
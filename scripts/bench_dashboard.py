@@ -0,0 +1,193 @@
+"""Latency benchmark of the dashboard counter queries on a seeded dataset.
+
+Seeds ``--users`` users with ``--logs`` mission logs and stamps each, then
+times, per dashboard open, the five separate queries the endpoint used to
+run, the single conditional-aggregation statement that replaced them, and
+the ``user_stats`` primary-key read the endpoint serves today::
+
+    python -m scripts.bench_dashboard --users 2000 --logs 50 --opens 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import uuid
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import case, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db import async_session, init_db
+from app.models import (
+    Mission,
+    MissionLog,
+    MissionStatus,
+    MissionType,
+    PointsLedgerEntry,
+    Stamp,
+    User,
+)
+from app.services.user_stats_service import get_user_stats, rebuild_user_stats
+from scripts.benchutil import summary, timed
+
+_STATUSES = list(MissionStatus)
+
+
+async def _five_queries(session: AsyncSession, user_id: uuid.UUID) -> tuple[int, ...]:
+    stamps = await session.scalar(
+        select(func.count()).select_from(Stamp).where(Stamp.user_id == user_id)
+    )
+    points = await session.scalar(
+        select(func.coalesce(func.sum(Mission.reward_points), 0))
+        .select_from(MissionLog)
+        .join(Mission, MissionLog.mission_id == Mission.id)
+        .where(MissionLog.user_id == user_id, MissionLog.status == MissionStatus.APPROVED)
+    )
+    counts = [
+        await session.scalar(
+            select(func.count())
+            .select_from(MissionLog)
+            .where(MissionLog.user_id == user_id, MissionLog.status == status)
+        )
+        for status in (MissionStatus.PENDING, MissionStatus.APPROVED, MissionStatus.REJECTED)
+    ]
+    return (stamps, points, *counts)
+
+
+def _count_where(condition):
+    return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+
+async def _single_statement(session: AsyncSession, user_id: uuid.UUID) -> tuple[int, ...]:
+    stamps = (
+        select(func.count()).select_from(Stamp).where(Stamp.user_id == user_id).scalar_subquery()
+    )
+    approved = MissionLog.status == MissionStatus.APPROVED
+    stmt = (
+        select(
+            stamps,
+            func.coalesce(func.sum(case((approved, Mission.reward_points), else_=0)), 0),
+            _count_where(MissionLog.status == MissionStatus.PENDING),
+            _count_where(approved),
+            _count_where(MissionLog.status == MissionStatus.REJECTED),
+        )
+        .select_from(MissionLog)
+        .outerjoin(Mission, MissionLog.mission_id == Mission.id)
+        .where(MissionLog.user_id == user_id)
+    )
+    return tuple((await session.execute(stmt)).one())
+
+
+async def _user_stats(session: AsyncSession, user_id: uuid.UUID) -> tuple[int, ...]:
+    stats = await get_user_stats(session, user_id)
+    return (
+        stats.total_stamps,
+        stats.total_points,
+        stats.missions_pending,
+        stats.missions_approved,
+        stats.missions_rejected,
+    )
+
+
+async def _seed(users: int, logs: int) -> list[uuid.UUID]:
+    user_rows = [{"id": uuid.uuid4(), "telegram_id": random.randrange(10**12)} for _ in range(users)]
+    missions = [
+        {
+            "id": uuid.uuid4(),
+            "code": f"BENCH-{uuid.uuid4().hex[:8]}",
+            "title": "Bench",
+            "description": "Bench",
+            "type": MissionType.LAUNCH,
+            "reward_points": 10 + n,
+        }
+        for n in range(logs)
+    ]
+    points = {mission["id"]: mission["reward_points"] for mission in missions}
+    async with async_session() as session:
+        await session.execute(insert(User), user_rows)
+        await session.execute(insert(Mission), missions)
+        for user in user_rows:
+            log_rows = [
+                {
+                    "id": uuid.uuid4(),
+                    "mission_id": mission["id"],
+                    "user_id": user["id"],
+                    "status": random.choice(_STATUSES),
+                    "is_repeatable": False,
+                    "payload": {},
+                }
+                for mission in missions
+            ]
+            await session.execute(insert(MissionLog), log_rows)
+            approved = [log for log in log_rows if log["status"] == MissionStatus.APPROVED]
+            if approved:
+                await session.execute(
+                    insert(Stamp),
+                    [
+                        {
+                            "id": uuid.uuid4(),
+                            "user_id": user["id"],
+                            "mission_log_id": log["id"],
+                            "value": 1,
+                        }
+                        for log in approved
+                    ],
+                )
+                await session.execute(
+                    insert(PointsLedgerEntry),
+                    [
+                        {
+                            "user_id": user["id"],
+                            "delta": points[log["mission_id"]],
+                            "reason": "MISSION_APPROVED",
+                            "mission_log_id": log["id"],
+                        }
+                        for log in approved
+                    ],
+                )
+        await rebuild_user_stats(session)
+        await session.commit()
+    return [user["id"] for user in user_rows]
+
+
+async def _measure(
+    load: Callable[[AsyncSession, uuid.UUID], Awaitable[tuple[int, ...]]],
+    user_ids: list[uuid.UUID],
+) -> tuple[list[float], dict[uuid.UUID, tuple[int, ...]]]:
+    samples, results = [], {}
+    for user_id in user_ids:
+        async with async_session() as session:
+            result, elapsed = await timed(lambda: load(session, user_id))
+        samples.append(elapsed)
+        results[user_id] = tuple(int(value or 0) for value in result)
+    return samples, results
+
+
+async def main(users: int, logs: int, opens: int) -> None:
+    await init_db()
+    user_ids = await _seed(users, logs)
+    sample = [random.choice(user_ids) for _ in range(opens)]
+
+    variants = {
+        "five queries": _five_queries,
+        "single statement": _single_statement,
+        "user_stats read": _user_stats,
+    }
+    answers = {}
+    print(f"{users} users x {logs} mission logs, {opens} dashboard opens")
+    for label, load in variants.items():
+        samples, answers[label] = await _measure(load, sample)
+        print(summary(label, samples))
+    agree = all(result == answers["five queries"] for result in answers.values())
+    print(f"counters agree across variants: {agree}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m scripts.bench_dashboard")
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--logs", type=int, default=50)
+    parser.add_argument("--opens", type=int, default=2_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.logs, args.opens))
@@ -0,0 +1,82 @@
+"""Concurrency benchmark for first logins through ``POST /auth/telegram``.
+
+Fires ``--users`` logins for brand-new Telegram ids at once (at most
+``--concurrency`` in flight) through the ASGI app, then checks that every
+login got a token and exactly one user row was created per id::
+
+    python -m scripts.bench_telegram_login --users 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import hmac
+import json
+import random
+import time
+from collections import Counter
+from urllib.parse import urlencode
+
+import httpx
+from sqlalchemy import func, select
+
+from app.config import settings
+from app.db import async_session, init_db
+from app.main import app
+from app.models import User
+from scripts.benchutil import summary, timed
+
+
+def _init_data(telegram_id: int) -> str:
+    fields = {
+        "auth_date": str(int(time.time())),
+        "query_id": f"bench-{telegram_id}",
+        "user": json.dumps({"id": telegram_id, "first_name": "Bench"}),
+    }
+    data_check_string = "\n".join(f"{key}={fields[key]}" for key in sorted(fields))
+    secret = hmac.new(b"WebAppData", settings.telegram_bot_token.encode(), hashlib.sha256).digest()
+    fields["hash"] = hmac.new(secret, data_check_string.encode(), hashlib.sha256).hexdigest()
+    return urlencode(fields)
+
+
+async def main(users: int, concurrency: int) -> None:
+    await init_db()
+    base = random.randrange(10**9, 2 * 10**9)
+    telegram_ids = list(range(base, base + users))
+    payloads = [{"init_data": _init_data(telegram_id)} for telegram_id in telegram_ids]
+    path = app.url_path_for("telegram_auth")
+    gate = asyncio.Semaphore(concurrency)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def login(payload: dict) -> tuple[httpx.Response, float]:
+            async with gate:
+                return await timed(lambda: client.post(path, json=payload))
+
+        started = time.perf_counter()
+        results = await asyncio.gather(*(login(payload) for payload in payloads))
+        wall = time.perf_counter() - started
+
+    statuses = Counter(response.status_code for response, _ in results)
+    statements = Counter(response.headers.get("X-DB-Statements") for response, _ in results)
+    async with async_session() as session:
+        created = await session.scalar(
+            select(func.count()).select_from(User).where(User.telegram_id.in_(telegram_ids))
+        )
+
+    print(f"{users} first logins, {concurrency} in flight, {wall:.2f} s ({users / wall:.0f} logins/s)")
+    print(summary("POST /auth/telegram", [elapsed for _, elapsed in results]))
+    print(f"responses: {dict(statuses)}")
+    print(f"SQL statements per login: {dict(statements)}")
+    print(f"users created: {created} (expected {users})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m scripts.bench_telegram_login")
+    parser.add_argument("--users", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=2_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.users, args.concurrency))
@@ -0,0 +1,57 @@
+"""Microbenchmark of JWT verification with and without the claims cache.
+
+Compares a plain ``jose.jwt.decode`` per request (the previous path) with
+``decode_access_token`` for one token presented repeatedly, and for a
+stream of distinct tokens where every call misses the cache::
+
+    python -m scripts.bench_token_cache --calls 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from collections.abc import Callable
+
+from jose import jwt
+
+from app.config import settings
+from app.security import ALGORITHM, create_access_token, decode_access_token, token_cache
+from scripts.benchutil import summary
+
+
+def _measure(call: Callable[[str], dict], tokens: list[str]) -> list[float]:
+    samples = []
+    for token in tokens:
+        started = time.perf_counter()
+        call(token)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def _uncached(token: str) -> dict:
+    return jwt.decode(token, settings.secret_key, algorithms=[ALGORITHM])
+
+
+def main(calls: int) -> None:
+    token = create_access_token({"user_id": "00000000-0000-0000-0000-000000000001"})
+    repeated = [token] * calls
+    distinct = [create_access_token({"user_id": f"user-{n}"}) for n in range(calls)]
+
+    token_cache.clear()
+    baseline = _measure(_uncached, repeated)
+    hits = _measure(decode_access_token, repeated)
+    token_cache.clear()
+    misses = _measure(decode_access_token, distinct)
+
+    print(summary("jwt.decode (no cache)", baseline))
+    print(summary("cached, same token", hits))
+    print(summary("cached, every call a miss", misses))
+    speedup = (sum(baseline) / len(baseline)) / (sum(hits) / len(hits))
+    print(f"same-token speedup: {speedup:.1f}x, cache stats: {token_cache.stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m scripts.bench_token_cache")
+    parser.add_argument("--calls", type=int, default=20_000)
+    main(parser.parse_args().calls)
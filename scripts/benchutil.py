@@ -0,0 +1,41 @@
+"""Helpers shared by the benchmark scripts in this directory.
+
+Run the scripts from the repository root as modules, e.g.
+``python -m scripts.bench_telegram_login``, with the usual settings in the
+environment or ``.env``. Point ``DATABASE_URL`` at a scratch database: the
+benchmarks create and seed their own rows.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from collections.abc import Awaitable, Callable
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """Nearest-rank percentile of ``samples`` (``q`` in 0..100)."""
+
+    ordered = sorted(samples)
+    rank = max(math.ceil(q / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def summary(label: str, samples: list[float]) -> str:
+    """One line with the count, mean, p50, p99 and max of ``samples`` seconds."""
+
+    mean = sum(samples) / len(samples)
+    return (
+        f"{label:<28} n={len(samples):<6} mean={mean * 1000:8.3f} ms "
+        f"p50={percentile(samples, 50) * 1000:8.3f} ms "
+        f"p99={percentile(samples, 99) * 1000:8.3f} ms "
+        f"max={max(samples) * 1000:8.3f} ms"
+    )
+
+
+async def timed(call: Callable[[], Awaitable[object]]) -> tuple[object, float]:
+    """Await ``call()`` and return its result with the elapsed seconds."""
+
+    started = time.perf_counter()
+    result = await call()
+    return result, time.perf_counter() - started
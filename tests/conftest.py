@@ -0,0 +1,150 @@
+"""Shared fixtures: a throwaway SQLite database and row factories.
+
+Settings are read when ``app`` is first imported, so the environment is
+prepared here before any test module imports it.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+
+_DB_DIR = tempfile.mkdtemp(prefix="vip-passport-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_DB_DIR}/test.sqlite3"
+os.environ.pop("DATABASE_REPLICA_URL", None)
+os.environ["REDIS_URL"] = ""
+for _name, _value in {
+    "TELEGRAM_BOT_TOKEN": "123456:TEST",
+    "SECRET_KEY": "test-secret",
+    "BACKEND_BASE_URL": "http://backend.test",
+    "MINIAPP_URL": "http://miniapp.test",
+    "ADMIN_USERNAME": "admin",
+    "ADMIN_PASSWORD": "admin",
+}.items():
+    os.environ.setdefault(_name, _value)
+
+import pytest  # noqa: E402
+
+from app.db import async_session, engine  # noqa: E402
+from app.models import (  # noqa: E402
+    Base,
+    Mission,
+    MissionLog,
+    MissionStatus,
+    MissionType,
+    Purchase,
+    User,
+)
+from app.security import token_cache, user_cache  # noqa: E402
+from app.services.mission_catalog_service import mission_catalog  # noqa: E402
+from app.services.mission_schedule_service import is_live  # noqa: E402
+from app.services.mission_status_service import status_maps  # noqa: E402
+from app.services.user_stats_service import record_mission_transition  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def anyio_backend() -> str:
+    return "asyncio"
+
+
+@pytest.fixture(scope="session", autouse=True)
+async def _session_event_loop():
+    # anyio keeps its runner, and so one event loop, alive while a
+    # session-scoped async fixture is active. The pooled aiosqlite
+    # connections and the SQLite writer lane are bound to that loop.
+    yield
+
+
+@pytest.fixture
+async def db():
+    """Recreate every table and empty the per-process caches."""
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+    for cache in (user_cache, token_cache, status_maps):
+        cache.clear()
+    mission_catalog.replace([])
+    mission_catalog.flags_run_at = None
+    yield engine
+
+
+@pytest.fixture
+async def session(db):
+    async with async_session() as session:
+        yield session
+
+
+@pytest.fixture
+def make_user(session):
+    async def make_user(**values) -> User:
+        values.setdefault("telegram_id", uuid.uuid4().int % 10**12)
+        user = User(id=uuid.uuid4(), **values)
+        session.add(user)
+        await session.commit()
+        return user
+
+    return make_user
+
+
+@pytest.fixture
+def make_mission(session):
+    async def make_mission(mission_type: MissionType = MissionType.PURCHASE, **values) -> Mission:
+        values.setdefault("reward_points", 10)
+        values.setdefault("reward_stamps", 1)
+        values.setdefault("is_active", True)
+        mission = Mission(
+            id=uuid.uuid4(),
+            code=f"{mission_type.value}-{uuid.uuid4().hex[:8]}",
+            title="t",
+            description="d",
+            type=mission_type,
+            **values,
+        )
+        # Flagged like the admin endpoints do; the scheduler flips it later.
+        mission.is_live = is_live(mission, datetime.utcnow())
+        session.add(mission)
+        await session.commit()
+        mission_catalog.upsert(mission)
+        return mission
+
+    return make_mission
+
+
+@pytest.fixture
+def make_purchase(session):
+    async def make_purchase(
+        user: User, mission: Mission | None = None, amount: str = "100", **values
+    ) -> Purchase:
+        """A pending purchase, with a pending mission log when ``mission`` is given."""
+
+        purchase = Purchase(
+            id=uuid.uuid4(),
+            user_id=user.id,
+            amount=Decimal(amount),
+            purchase_date=values.pop("purchase_date", date(2026, 1, 15)),
+            invoice_image_url="",
+            status=MissionStatus.PENDING,
+            **values,
+        )
+        if mission is not None:
+            log = MissionLog(
+                id=uuid.uuid4(),
+                mission_id=mission.id,
+                user_id=user.id,
+                status=MissionStatus.PENDING,
+                is_repeatable=True,
+                payload={},
+            )
+            session.add(log)
+            purchase.mission_id = mission.id
+            purchase.mission_log_id = log.id
+            await record_mission_transition(session, user.id, None, MissionStatus.PENDING)
+        session.add(purchase)
+        await session.commit()
+        return purchase
+
+    return make_purchase
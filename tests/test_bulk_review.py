@@ -0,0 +1,129 @@
+"""Bulk reviews claim their rows, so overlapping reviews reward each item once."""
+
+from __future__ import annotations
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from app.api.purchase import approve_purchase_record
+from app.db import async_session
+from app.models import MissionLog, MissionStatus, MissionType, Purchase, Stamp, UserMonthlySpend
+from app.services.bulk_review_service import bulk_review
+from app.services.points_service import get_points_balance, reconcile_points
+from app.services.spend_service import rebuild_spend_rollups
+from app.services.submission_service import resolve_submission
+from app.services.user_stats_service import get_user_stats, rebuild_user_stats
+
+pytestmark = pytest.mark.anyio
+
+
+async def _bulk(ids_by_kind, target=MissionStatus.APPROVED, admin_note=None):
+    async with async_session() as session:
+        results = await bulk_review(session, ids_by_kind, target, admin_note)
+        await session.commit()
+    return results
+
+
+async def _approve_one(purchase_id):
+    async with async_session() as session:
+        await approve_purchase_record(session, await resolve_submission(session, Purchase, purchase_id))
+        await session.commit()
+
+
+async def _counters(session, user):
+    stats = await get_user_stats(session, user.id)
+    await session.refresh(stats)
+    return (
+        await get_points_balance(session, user.id),
+        stats.total_points,
+        stats.total_stamps,
+        stats.missions_pending,
+        stats.missions_approved,
+    )
+
+
+async def _spend(session):
+    rows = await session.execute(select(UserMonthlySpend.amount, UserMonthlySpend.purchases))
+    return [tuple(row) for row in rows]
+
+
+async def test_overlapping_bulk_and_single_approvals_award_once(
+    session, make_user, make_mission, make_purchase
+):
+    user = await make_user()
+    mission = await make_mission(reward_points=10, reward_stamps=1)
+    purchases = [await make_purchase(user, mission) for _ in range(3)]
+    ids = [purchase.id for purchase in purchases]
+
+    batches = await asyncio.gather(
+        _bulk({"purchases": ids}),
+        _bulk({"purchases": ids}),
+        *(_approve_one(purchase_id) for purchase_id in ids),
+    )
+
+    approved = [entry for results in batches[:2] for entry in results["purchases"]]
+    assert sum(entry["result"] == "approved" for entry in approved) <= 3
+    assert await _counters(session, user) == (30, 30, 3, 0, 3)
+    assert await session.scalar(select(func.count()).select_from(Stamp)) == 3
+    assert await _spend(session) == [(Decimal("300.00"), 3)]
+    assert await reconcile_points(session) == []
+
+    await rebuild_user_stats(session)
+    await rebuild_spend_rollups(session)
+    await session.commit()
+    assert await _counters(session, user) == (30, 30, 3, 0, 3)
+    assert await _spend(session) == [(Decimal("300.00"), 3)]
+
+
+async def test_items_already_in_the_target_state_are_unchanged(
+    session, make_user, make_mission, make_purchase
+):
+    user = await make_user()
+    mission = await make_mission(MissionType.LAUNCH, reward_points=20)
+    log = MissionLog(mission_id=mission.id, user_id=user.id, status=MissionStatus.PENDING, payload={})
+    session.add(log)
+    await session.commit()
+
+    first = await _bulk({"mission_logs": [log.id]})
+    second = await _bulk({"mission_logs": [log.id]})
+
+    assert first["mission_logs"] == [{"id": log.id, "result": "approved"}]
+    assert second["mission_logs"] == [{"id": log.id, "result": "unchanged"}]
+    assert await get_points_balance(session, user.id) == 20
+
+
+async def test_reject_after_approve_reverses_once(session, make_user, make_mission, make_purchase):
+    user = await make_user()
+    mission = await make_mission(reward_points=10, reward_stamps=0)
+    purchase = await make_purchase(user, mission)
+
+    await _bulk({"purchases": [purchase.id]})
+    rejections = await asyncio.gather(
+        *(_bulk({"purchases": [purchase.id]}, MissionStatus.REJECTED) for _ in range(3))
+    )
+
+    assert sorted(results["purchases"][0]["result"] for results in rejections) == [
+        "rejected",
+        "unchanged",
+        "unchanged",
+    ]
+    assert (await _counters(session, user))[:2] == (0, 0)
+    assert await _spend(session) == [(Decimal("0.00"), 0)]
+    assert await reconcile_points(session) == []
+
+
+async def test_rejecting_log_less_purchases_revokes_their_credit(
+    session, make_user, make_mission, make_purchase
+):
+    user = await make_user()
+    mission = await make_mission(reward_points=25, reward_stamps=0)
+    purchase = await make_purchase(user, mission_id=mission.id)
+
+    for target in (MissionStatus.APPROVED, MissionStatus.REJECTED, MissionStatus.APPROVED):
+        await _bulk({"purchases": [purchase.id]}, target)
+
+    assert (await _counters(session, user))[:2] == (25, 25)
+    assert await reconcile_points(session) == []
@@ -0,0 +1,90 @@
+"""``init_db`` upgrades a SQLite database created by an older schema."""
+
+from __future__ import annotations
+
+import shutil
+import sqlite3
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db import _create_sqlite_schema
+from app.models import Mission, MissionLog
+
+pytestmark = pytest.mark.anyio
+
+# The development database committed with the original schema.
+LEGACY_DB = Path(__file__).resolve().parent.parent / "db.sqlite3"
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    path = tmp_path / "legacy.sqlite3"
+    shutil.copy(LEGACY_DB, path)
+    return path
+
+
+def _seed_submission_logs(path: Path) -> list[str]:
+    """Two purchase-backed logs for the same user and mission, plus a double start."""
+
+    user_id, mission_id = uuid.uuid4().hex, uuid.uuid4().hex
+    log_ids = [uuid.uuid4().hex for _ in range(4)]
+    with sqlite3.connect(path) as conn:
+        conn.execute("INSERT INTO users (id, telegram_id) VALUES (?, 1)", (user_id,))
+        conn.execute(
+            "INSERT INTO missions (id, code, title, description, type, reward_points) "
+            "VALUES (?, 'P', 't', 'd', 'PURCHASE', 10)",
+            (mission_id,),
+        )
+        for n, log_id in enumerate(log_ids):
+            conn.execute(
+                "INSERT INTO mission_logs (id, mission_id, user_id, status, payload, created_at) "
+                "VALUES (?, ?, ?, 'PENDING', '{}', ?)",
+                (log_id, mission_id, user_id, f"2025-01-0{n + 1} 00:00:00"),
+            )
+        for log_id in log_ids[:2]:
+            conn.execute(
+                "INSERT INTO purchases (id, user_id, amount, purchase_date, invoice_image_url, "
+                "status, mission_id, mission_log_id) "
+                "VALUES (?, ?, 10, '2025-01-01', '', 'PENDING', ?, ?)",
+                (uuid.uuid4().hex, user_id, mission_id, log_id),
+            )
+    return log_ids
+
+
+async def test_existing_database_gains_new_columns_and_indexes(legacy_db):
+    log_ids = _seed_submission_logs(legacy_db)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{legacy_db}")
+    try:
+        assert await _create_sqlite_schema(engine) is True
+        assert await _create_sqlite_schema(engine) is False
+
+        async with engine.connect() as conn:
+            assert (await conn.execute(select(Mission.is_live))).all() == [(False,)]
+            repeatable = dict(
+                (await conn.execute(select(MissionLog.id, MissionLog.is_repeatable))).all()
+            )
+            indexes = set(
+                (await conn.execute(text("SELECT name FROM sqlite_master WHERE type = 'index'")))
+                .scalars()
+                .all()
+            )
+    finally:
+        await engine.dispose()
+
+    # Submission logs and the later double start are exempt; the first start is kept.
+    assert {log_id.hex: flag for log_id, flag in repeatable.items()} == {
+        log_ids[0]: True,
+        log_ids[1]: True,
+        log_ids[2]: False,
+        log_ids[3]: True,
+    }
+    assert {
+        "ix_missions_is_live",
+        "uq_mission_logs_mission_id_user_id",
+        "ix_purchases_invoice_fingerprint",
+        "ix_purchases_pending",
+    } <= indexes
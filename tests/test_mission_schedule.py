@@ -0,0 +1,73 @@
+"""The catalog serves the live flags the scheduler flips at window boundaries."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models import Mission, MissionType
+from app.services.mission_catalog_service import WINDOW_RESOLUTION, mission_catalog
+from app.services.mission_schedule_service import is_live, next_transition, run_due
+
+pytestmark = pytest.mark.anyio
+
+START = datetime(2026, 3, 1, 9, 0)
+END = datetime(2026, 3, 31, 18, 0)
+
+
+@pytest.mark.parametrize(
+    ("now", "live"),
+    [
+        (START - WINDOW_RESOLUTION, False),
+        (START, True),
+        (END, True),
+        (END + WINDOW_RESOLUTION, False),
+    ],
+)
+async def test_catalog_and_scheduler_agree_on_window_edges(make_mission, now, live):
+    mission = await make_mission(MissionType.LAUNCH, start_at=START, end_at=END)
+    await run_due(now)
+
+    assert is_live(mission, now) is live
+    assert (mission.id in {m.id for m in await mission_catalog.active(now=now)}) is live
+
+
+async def test_aware_windows_are_compared_in_utc(make_mission):
+    tehran = timezone(timedelta(hours=3, minutes=30))
+    mission = await make_mission(
+        MissionType.LAUNCH, start_at=START.replace(tzinfo=timezone.utc).astimezone(tehran)
+    )
+
+    assert not is_live(mission, START - WINDOW_RESOLUTION)
+    assert is_live(mission, START)
+
+
+async def test_scheduler_flips_the_flag_at_each_boundary(session, make_mission):
+    mission = await make_mission(MissionType.LAUNCH, start_at=START, end_at=END)
+
+    assert await next_transition(session, START - timedelta(days=1)) == START
+    await run_due(START)
+    assert (await session.get(Mission, mission.id, populate_existing=True)).is_live
+    await run_due(END + WINDOW_RESOLUTION)
+    assert not (await session.get(Mission, mission.id, populate_existing=True)).is_live
+
+
+async def test_catalog_only_serves_flagged_missions(session, make_mission):
+    mission = await make_mission(MissionType.LAUNCH, start_at=START, end_at=END)
+
+    # Inside its window, but the scheduler has not flipped the flag yet.
+    assert mission.id not in {m.id for m in await mission_catalog.active(now=START)}
+    await run_due(START)
+    assert mission.id in {m.id for m in await mission_catalog.active(now=START)}
+
+
+async def test_other_workers_reload_after_a_flip(session, make_mission):
+    mission = await make_mission(MissionType.LAUNCH, start_at=START, end_at=END)
+    await run_due(START)
+
+    # A worker whose catalog predates the flip notices it on its next poll.
+    mission_catalog.replace([])
+    mission_catalog.flags_run_at = None
+    await run_due(START)
+    assert mission.id in {m.id for m in await mission_catalog.active(now=START)}
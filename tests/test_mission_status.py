@@ -0,0 +1,57 @@
+"""Cached mission status maps merge fetched rows without losing newer notes."""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+
+from app.models import MissionLog, MissionStatus, MissionType
+from app.services import mission_status_service
+from app.services.mission_status_service import get_mission_statuses, status_maps
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_fetch_reports_missions_without_logs_as_none(session, make_user, make_mission):
+    user = await make_user()
+    started = await make_mission(MissionType.LAUNCH)
+    untouched = await make_mission(MissionType.LAUNCH)
+    session.add(
+        MissionLog(
+            mission_id=started.id,
+            user_id=user.id,
+            status=MissionStatus.PENDING,
+            is_repeatable=False,
+            payload={},
+        )
+    )
+    await session.commit()
+
+    statuses = await get_mission_statuses(session, user.id, [started.id, untouched.id])
+
+    assert statuses == {started.id: "PENDING", untouched.id: "NONE"}
+
+
+async def test_note_committed_during_the_fetch_is_not_overwritten(
+    session, make_user, make_mission, monkeypatch
+):
+    user = await make_user()
+    mission = await make_mission(MissionType.LAUNCH)
+    other = uuid.uuid4()
+    await get_mission_statuses(session, user.id, [other])
+    execute = session.execute
+
+    async def execute_then_commit_elsewhere(*args, **kwargs):
+        result = await execute(*args, **kwargs)
+        # Another request approves the mission while this query is in flight.
+        mission_status_service._store_status(
+            user.id, mission.id, mission_status_service._STATUS_CODES[MissionStatus.APPROVED]
+        )
+        return result
+
+    monkeypatch.setattr(session, "execute", execute_then_commit_elsewhere)
+    statuses = await get_mission_statuses(session, user.id, [mission.id])
+
+    assert statuses == {mission.id: "APPROVED"}
+    assert set(status_maps.get(user.id)) == {other, mission.id}
@@ -0,0 +1,80 @@
+"""Snapshot compaction keeps ledger balances equal to the sum of the ledger."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, insert, select
+
+from app.models import PointsLedgerEntry, PointsSnapshot
+from app.services.points_service import compact_points_snapshots, get_points_balance
+
+pytestmark = pytest.mark.anyio
+
+_LONG_AGO = datetime.now(timezone.utc) - timedelta(hours=1)
+
+
+async def _write(session, user, entry_id: int, delta: int, created_at: datetime) -> None:
+    await session.execute(
+        insert(PointsLedgerEntry),
+        [
+            {
+                "id": entry_id,
+                "user_id": user.id,
+                "delta": delta,
+                "reason": "TEST",
+                "created_at": created_at,
+            }
+        ],
+    )
+    await session.commit()
+
+
+async def _ledger_sum(session, user) -> int:
+    return await session.scalar(
+        select(func.coalesce(func.sum(PointsLedgerEntry.delta), 0)).where(
+            PointsLedgerEntry.user_id == user.id
+        )
+    )
+
+
+async def test_compaction_folds_only_entries_older_than_the_horizon(session, make_user):
+    user = await make_user()
+    await _write(session, user, 1, 10, _LONG_AGO)
+    await _write(session, user, 2, 5, _LONG_AGO)
+    await _write(session, user, 3, 7, datetime.now(timezone.utc))
+
+    assert await compact_points_snapshots(session) == 1
+    await session.commit()
+
+    snapshot = await session.get(PointsSnapshot, user.id)
+    assert (snapshot.balance, snapshot.last_entry_id) == (15, 2)
+    assert await get_points_balance(session, user.id) == 22
+
+
+async def test_entry_committed_late_with_a_lower_id_is_not_lost(session, make_user):
+    user = await make_user()
+    await _write(session, user, 1, 10, _LONG_AGO)
+    await _write(session, user, 3, 7, datetime.now(timezone.utc))
+    await compact_points_snapshots(session)
+    await session.commit()
+
+    # Id 2 was allocated before id 3 but its transaction commits only now.
+    await _write(session, user, 2, 4, datetime.now(timezone.utc))
+
+    assert await get_points_balance(session, user.id) == await _ledger_sum(session, user) == 21
+
+
+async def test_repeated_compaction_is_idempotent(session, make_user):
+    user = await make_user()
+    for entry_id, delta in enumerate((10, -3, 8), start=1):
+        await _write(session, user, entry_id, delta, _LONG_AGO)
+
+    for _ in range(2):
+        await compact_points_snapshots(session)
+        await session.commit()
+
+    snapshot = await session.get(PointsSnapshot, user.id)
+    assert (snapshot.balance, snapshot.last_entry_id) == (15, 3)
+    assert await get_points_balance(session, user.id) == 15
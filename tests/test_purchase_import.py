@@ -0,0 +1,78 @@
+"""Bulk purchase import across more customers than fit in one IN list."""
+
+from __future__ import annotations
+
+import uuid
+
+import pytest
+from sqlalchemy import func, insert, select
+
+from app.db import IN_LIST_CHUNK_SIZE
+from app.models import MissionLog, MissionType, Purchase, PurchaseBrand, User
+from app.models.purchase import brand_names
+from app.services import purchase_import_service
+from app.services.purchase_import_service import import_purchases
+from app.services.user_stats_service import get_user_stats
+
+pytestmark = pytest.mark.anyio
+
+
+async def _stream(text: str):
+    yield text.encode()
+
+
+async def test_import_resolves_customers_and_duplicates_across_chunks(session):
+    customers = IN_LIST_CHUNK_SIZE + 20
+    await session.execute(
+        insert(User),
+        [
+            {"id": uuid.uuid4(), "telegram_id": n, "customer_code": f"C{n}"}
+            for n in range(customers)
+        ],
+    )
+    await session.commit()
+
+    lines = ["customer_code,amount,purchase_date,invoice_number"]
+    lines += [f"C{n},10,2026-01-15,INV-{n}" for n in range(customers)]
+    lines.append("C0,10,2026-01-15,INV-0")
+    lines.append("UNKNOWN,10,2026-01-15,INV-X")
+
+    report = await import_purchases(_stream("\n".join(lines) + "\n"), "csv")
+
+    assert report.imported == customers + 1
+    assert [error["line"] for error in report.errors] == [customers + 3]
+    duplicates = await session.scalar(
+        select(func.count()).select_from(Purchase).where(Purchase.duplicate_of_id.is_not(None))
+    )
+    assert duplicates == 1
+
+
+async def test_failed_batch_rolls_back_alone(session, make_user, make_mission, monkeypatch):
+    user = await make_user(customer_code="C1")
+    await make_mission(MissionType.PURCHASE)
+
+    def failing_brand_names(brands):
+        if brands == ["boom"]:
+            raise RuntimeError("brand lookup failed")
+        return brand_names(brands)
+
+    monkeypatch.setattr(purchase_import_service, "brand_names", failing_brand_names)
+    lines = [
+        "customer_code,amount,purchase_date,invoice_number,brands",
+        "C1,10,2026-01-15,INV-1,a",
+        "C1,10,2026-01-15,INV-2,b",
+        "C1,10,2026-01-15,INV-3,c",
+        "C1,10,2026-01-15,INV-4,boom",
+    ]
+
+    with pytest.raises(RuntimeError):
+        await import_purchases(_stream("\n".join(lines) + "\n"), "csv", batch_size=2)
+
+    invoices = await session.scalars(select(Purchase.invoice_number).order_by(Purchase.invoice_number))
+    assert invoices.all() == ["INV-1", "INV-2"]
+    assert await session.scalar(select(func.count()).select_from(MissionLog)) == 2
+    assert (await session.scalars(select(PurchaseBrand.brand).order_by(PurchaseBrand.brand))).all() == [
+        "a",
+        "b",
+    ]
+    assert (await get_user_stats(session, user.id)).missions_pending == 2
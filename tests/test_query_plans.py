@@ -0,0 +1,217 @@
+"""EXPLAIN QUERY PLAN checks for the hot per-user, status and review-queue lookups.
+
+Each test seeds enough rows for the planner's statistics to matter, runs
+``ANALYZE`` and fails if the query no longer uses its index. Plans are taken
+for the statement and bound parameters exactly as the application sends
+them to the driver.
+"""
+
+from __future__ import annotations
+
+import uuid
+from datetime import date, datetime, timedelta
+
+import pytest
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.dialects import postgresql
+
+from app.models import (
+    Display,
+    Mission,
+    MissionLog,
+    MissionStatus,
+    MissionType,
+    Purchase,
+    Referral,
+    Stamp,
+    User,
+)
+from app.api.admin import _purchase_filters
+from app.models.mission import status_is
+
+pytestmark = pytest.mark.anyio
+
+USERS = 200
+PER_USER = 10
+STATUSES = list(MissionStatus)
+
+
+@pytest.fixture
+async def seeded(session):
+    users = [{"id": uuid.uuid4(), "telegram_id": n} for n in range(USERS)]
+    missions = [
+        {
+            "id": uuid.uuid4(),
+            "code": f"M{n}",
+            "title": "t",
+            "description": "d",
+            "type": MissionType.LAUNCH,
+            "reward_points": 10,
+        }
+        for n in range(PER_USER)
+    ]
+    created = datetime(2026, 1, 1)
+    logs, purchases, displays, referrals, stamps = [], [], [], [], []
+    for u, user in enumerate(users):
+        for n, mission in enumerate(missions):
+            status = STATUSES[(u + n) % len(STATUSES)]
+            at = created + timedelta(minutes=u * PER_USER + n)
+            log_id = uuid.uuid4()
+            logs.append(
+                {
+                    "id": log_id,
+                    "mission_id": mission["id"],
+                    "user_id": user["id"],
+                    "status": status,
+                    "is_repeatable": False,
+                    "payload": {},
+                    "created_at": at,
+                }
+            )
+            purchases.append(
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": user["id"],
+                    "amount": 10,
+                    "purchase_date": date(2026, 1, 1),
+                    "invoice_image_url": "",
+                    "status": status,
+                    "created_at": at,
+                }
+            )
+            displays.append(
+                {
+                    "id": uuid.uuid4(),
+                    "user_id": user["id"],
+                    "brand": "b",
+                    "location_desc": "l",
+                    "display_image_url": "",
+                    "status": status,
+                    "created_at": at,
+                }
+            )
+            referrals.append(
+                {
+                    "id": uuid.uuid4(),
+                    "referrer_user_id": user["id"],
+                    "store_name": "s",
+                    "manager_name": "m",
+                    "phone": "p",
+                    "city": "c",
+                }
+            )
+            stamps.append(
+                {"id": uuid.uuid4(), "user_id": user["id"], "mission_log_id": log_id, "value": 1}
+            )
+    for model, rows in (
+        (User, users),
+        (Mission, missions),
+        (MissionLog, logs),
+        (Purchase, purchases),
+        (Display, displays),
+        (Referral, referrals),
+        (Stamp, stamps),
+    ):
+        await session.execute(insert(model), rows)
+    await session.commit()
+    await (await session.connection()).exec_driver_sql("ANALYZE")
+    return {"user_id": users[7]["id"], "mission_id": missions[3]["id"]}
+
+
+async def _plan(session, stmt) -> str:
+    plan: list[str] = []
+
+    def explain(conn, cursor, statement, parameters, context, executemany):
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        plan.extend(row[-1] for row in cursor.fetchall())
+
+    sync_engine = session.bind.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", explain)
+    try:
+        await session.execute(stmt)
+    finally:
+        event.remove(sync_engine, "before_cursor_execute", explain)
+    return "\n".join(plan)
+
+
+def _assert_uses(plan: str, index: str) -> None:
+    assert f"INDEX {index}" in plan, plan
+
+
+async def test_mission_logs_by_user_and_status(session, seeded):
+    stmt = select(func.count()).select_from(MissionLog).where(
+        MissionLog.user_id == seeded["user_id"], MissionLog.status == MissionStatus.PENDING
+    )
+    _assert_uses(await _plan(session, stmt), "ix_mission_logs_user_id_status")
+
+
+async def test_mission_logs_by_user_and_missions(session, seeded):
+    # Shape of the mission status lookup behind GET /missions/.
+    stmt = select(MissionLog.mission_id, MissionLog.status).where(
+        MissionLog.user_id == seeded["user_id"],
+        MissionLog.mission_id.in_([seeded["mission_id"], uuid.uuid4()]),
+    )
+    plan = await _plan(session, stmt)
+    assert "SCAN mission_logs" not in plan, plan
+    assert "USING" in plan and "INDEX" in plan, plan
+
+
+async def test_mission_start_duplicate_check(session, seeded):
+    stmt = select(MissionLog.id).where(
+        MissionLog.mission_id == seeded["mission_id"],
+        MissionLog.user_id == seeded["user_id"],
+        MissionLog.is_repeatable.is_(False),
+    )
+    plan = await _plan(session, stmt)
+    assert "SCAN mission_logs" not in plan, plan
+
+
+async def test_stamps_by_user(session, seeded):
+    stmt = select(func.count()).select_from(Stamp).where(Stamp.user_id == seeded["user_id"])
+    _assert_uses(await _plan(session, stmt), "ix_stamps_user_id")
+
+
+@pytest.mark.parametrize(
+    ("model", "index"),
+    [(Purchase, "ix_purchases_user_id_status"), (Display, "ix_displays_user_id_status")],
+)
+async def test_submissions_by_user_and_status(session, seeded, model, index):
+    stmt = select(model.id).where(
+        model.user_id == seeded["user_id"], model.status == MissionStatus.APPROVED
+    )
+    _assert_uses(await _plan(session, stmt), index)
+
+
+async def test_referrals_by_referrer(session, seeded):
+    stmt = select(Referral.id).where(Referral.referrer_user_id == seeded["user_id"])
+    _assert_uses(await _plan(session, stmt), "ix_referrals_referrer_user_id")
+
+
+@pytest.mark.parametrize(
+    ("model", "index"),
+    [
+        (MissionLog, "ix_mission_logs_pending"),
+        (Purchase, "ix_purchases_pending"),
+        (Display, "ix_displays_pending"),
+    ],
+)
+async def test_pending_review_queue(session, seeded, model, index):
+    stmt = (
+        select(model.id)
+        .where(status_is(model.status, MissionStatus.PENDING))
+        .order_by(model.created_at)
+        .limit(50)
+    )
+    _assert_uses(await _plan(session, stmt), index)
+
+
+async def test_admin_pending_purchases(session, seeded):
+    # The query behind GET /admin/purchases?status=PENDING.
+    stmt = (
+        _purchase_filters(select(Purchase), None, MissionStatus.PENDING)
+        .order_by(Purchase.created_at.desc(), Purchase.id)
+        .limit(50)
+    )
+    _assert_uses(await _plan(session, stmt), "ix_purchases_pending")
+    # A PostgreSQL generic plan only matches the partial index on a literal.
+    assert "purchases.status = 'PENDING'" in str(stmt.compile(dialect=postgresql.dialect()))
@@ -0,0 +1,258 @@
+"""Single-item admin reviews keep the ledger, users and dashboard counters in step."""
+
+from __future__ import annotations
+
+import asyncio
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import func, select
+
+from app.api.display import approve_display_record
+from app.api.purchase import approve_purchase_record, reject_purchase_record
+from app.api.referral import mark_referral_first_purchase_record
+from app.db import async_session
+from app.models import (
+    Display,
+    MissionLog,
+    MissionStatus,
+    MissionType,
+    NotificationLog,
+    Purchase,
+    Referral,
+    Stamp,
+    User,
+    UserMonthlySpend,
+)
+from app.services.points_service import get_points_balance, reconcile_points
+from app.services.spend_service import rebuild_spend_rollups
+from app.services.submission_service import (
+    move_mission_log,
+    resolve_mission_log,
+    resolve_submission,
+)
+from app.services.user_stats_service import get_user_stats, rebuild_user_stats
+
+pytestmark = pytest.mark.anyio
+
+
+async def _points(session, user) -> tuple[int, int, int]:
+    stats = await get_user_stats(session, user.id)
+    refreshed = await session.get(User, user.id, populate_existing=True)
+    return (
+        await get_points_balance(session, user.id),
+        refreshed.total_points,
+        stats.total_points,
+    )
+
+
+async def _spend(session) -> list[tuple[Decimal, int]]:
+    rows = await session.execute(select(UserMonthlySpend.amount, UserMonthlySpend.purchases))
+    return [tuple(row) for row in rows]
+
+
+async def test_approving_a_purchase_without_a_log_credits_the_dashboard(
+    session, make_user, make_mission, make_purchase
+):
+    user = await make_user()
+    mission = await make_mission(reward_points=25)
+    purchase = await make_purchase(user, mission_id=mission.id)
+
+    await approve_purchase_record(session, await resolve_submission(session, Purchase, purchase.id))
+    await session.commit()
+
+    assert await _points(session, user) == (25, 25, 25)
+    assert await reconcile_points(session) == []
+
+
+async def test_approving_a_display_without_a_log_credits_the_dashboard(
+    session, make_user, make_mission
+):
+    user = await make_user()
+    mission = await make_mission(MissionType.DISPLAY, reward_points=15)
+    display = Display(
+        user_id=user.id,
+        brand="b",
+        location_desc="l",
+        display_image_url="",
+        status=MissionStatus.PENDING,
+        mission_id=mission.id,
+    )
+    session.add(display)
+    await session.commit()
+
+    await approve_display_record(session, await resolve_submission(session, Display, display.id))
+    await session.commit()
+
+    assert await _points(session, user) == (15, 15, 15)
+    await rebuild_user_stats(session)
+    await session.commit()
+    assert await _points(session, user) == (15, 15, 15)
+
+
+async def test_rejecting_a_purchase_without_a_log_revokes_its_credit(
+    session, make_user, make_mission, make_purchase
+):
+    user = await make_user()
+    mission = await make_mission(reward_points=25)
+    purchase = await make_purchase(user, mission_id=mission.id)
+
+    await _approve_purchase(purchase.id)
+    await _reject_purchase(purchase.id)
+    assert await _points(session, user) == (0, 0, 0)
+
+    await _approve_purchase(purchase.id)
+    assert await _points(session, user) == (25, 25, 25)
+    await _assert_projections_match_rebuild(session, user)
+
+
+async def _review(record, model, resource_id):
+    async with async_session() as session:
+        await record(session, await resolve_submission(session, model, resource_id))
+        await session.commit()
+
+
+async def _approve_purchase(purchase_id):
+    await _review(approve_purchase_record, Purchase, purchase_id)
+
+
+async def _reject_purchase(purchase_id):
+    await _review(reject_purchase_record, Purchase, purchase_id)
+
+
+async def _count(session, model) -> int:
+    return await session.scalar(select(func.count()).select_from(model))
+
+
+async def _assert_projections_match_rebuild(session, user) -> None:
+    """Incrementally maintained counters and rollups equal a full recompute."""
+
+    stats = await get_user_stats(session, user.id)
+    counters = (
+        stats.total_stamps,
+        stats.total_points,
+        stats.missions_pending,
+        stats.missions_approved,
+        stats.missions_rejected,
+    )
+    spend = await _spend(session)
+    assert await reconcile_points(session) == []
+
+    await rebuild_user_stats(session)
+    await rebuild_spend_rollups(session)
+    await session.commit()
+    rebuilt = await get_user_stats(session, user.id)
+    await session.refresh(rebuilt)
+    assert counters == (
+        rebuilt.total_stamps,
+        rebuilt.total_points,
+        rebuilt.missions_pending,
+        rebuilt.missions_approved,
+        rebuilt.missions_rejected,
+    )
+    assert [row for row in spend if row[1]] == await _spend(session)
+
+
+async def test_concurrent_approvals_award_once(session, make_user, make_mission, make_purchase):
+    user = await make_user()
+    mission = await make_mission(reward_points=10, reward_stamps=1)
+    purchase = await make_purchase(user, mission)
+
+    await asyncio.gather(*(_approve_purchase(purchase.id) for _ in range(4)))
+
+    stats = await get_user_stats(session, user.id)
+    assert await _points(session, user) == (10, 10, 10)
+    assert (stats.total_stamps, stats.missions_pending, stats.missions_approved) == (1, 0, 1)
+    assert await session.scalar(select(func.count()).select_from(Stamp)) == 1
+    assert await _spend(session) == [(Decimal("100.00"), 1)]
+
+
+async def test_reject_then_reapprove_moves_points_and_spend(
+    session, make_user, make_mission, make_purchase
+):
+    user = await make_user()
+    mission = await make_mission(reward_points=10)
+    purchase = await make_purchase(user, mission)
+
+    await _approve_purchase(purchase.id)
+    await _reject_purchase(purchase.id)
+    assert await _points(session, user) == (0, 0, 0)
+    assert await _spend(session) == [(Decimal("0.00"), 0)]
+
+    await _approve_purchase(purchase.id)
+    assert await _points(session, user) == (10, 10, 10)
+    assert await _spend(session) == [(Decimal("100.00"), 1)]
+    await _assert_projections_match_rebuild(session, user)
+
+
+async def test_repeated_review_has_no_side_effects(session, make_user, make_mission, make_purchase):
+    user = await make_user()
+    mission = await make_mission(reward_points=10)
+    purchase = await make_purchase(user, mission)
+
+    for _ in range(3):
+        await _approve_purchase(purchase.id)
+
+    assert await _points(session, user) == (10, 10, 10)
+    assert await _count(session, NotificationLog) == 1
+    assert await _count(session, Stamp) == 1
+
+
+async def test_racing_approve_and_reject_leave_consistent_totals(
+    session, make_user, make_mission, make_purchase
+):
+    user = await make_user()
+    mission = await make_mission(reward_points=10)
+    purchase = await make_purchase(user, mission)
+
+    await asyncio.gather(
+        *(_approve_purchase(purchase.id) for _ in range(3)),
+        *(_reject_purchase(purchase.id) for _ in range(3)),
+    )
+
+    await _assert_projections_match_rebuild(session, user)
+
+
+async def test_concurrent_referral_completions_create_one_log(session, make_user, make_mission):
+    user = await make_user()
+    mission = await make_mission(MissionType.REFERRAL, reward_points=30)
+    referral = Referral(
+        referrer_user_id=user.id,
+        store_name="s",
+        manager_name="m",
+        phone="p",
+        city="c",
+        mission_id=mission.id,
+    )
+    session.add(referral)
+    await session.commit()
+
+    await asyncio.gather(
+        *(_review(mark_referral_first_purchase_record, Referral, referral.id) for _ in range(3))
+    )
+
+    assert await _points(session, user) == (30, 30, 30)
+    assert await _count(session, MissionLog) == 1
+    await _assert_projections_match_rebuild(session, user)
+
+
+async def test_concurrent_mission_log_approvals_award_once(session, make_user, make_mission):
+    user = await make_user()
+    mission = await make_mission(MissionType.LAUNCH, reward_points=20)
+    log = MissionLog(
+        mission_id=mission.id, user_id=user.id, status=MissionStatus.PENDING, payload={}
+    )
+    session.add(log)
+    await session.commit()
+
+    async def approve():
+        async with async_session() as admin_session:
+            mission_log, _ = await resolve_mission_log(admin_session, log.id)
+            await move_mission_log(admin_session, mission_log, MissionStatus.APPROVED, 20)
+            await admin_session.commit()
+
+    await asyncio.gather(*(approve() for _ in range(3)))
+
+    assert await _points(session, user) == (20, 20, 20)
+    assert (await resolve_mission_log(session, log.id))[0].status == MissionStatus.APPROVED
+    await session.commit()
@@ -0,0 +1,71 @@
+"""City rollups follow the city each approval was credited to."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+
+from app.api.purchase import approve_purchase_record, reject_purchase_record
+from app.db import async_session
+from app.models import CityMonthlySpend, Purchase, User
+from app.services.spend_service import rebuild_spend_rollups
+from app.services.submission_service import resolve_submission
+
+pytestmark = pytest.mark.anyio
+
+
+async def _review(record, purchase_id):
+    async with async_session() as session:
+        await record(session, await resolve_submission(session, Purchase, purchase_id))
+        await session.commit()
+
+
+async def _move_store(session, user, city):
+    (await session.get(User, user.id)).city = city
+    await session.commit()
+
+
+async def _cities(session) -> dict[str, tuple[Decimal, int]]:
+    rows = await session.execute(
+        select(CityMonthlySpend.city, CityMonthlySpend.amount, CityMonthlySpend.purchases)
+    )
+    return {city: (amount, purchases) for city, amount, purchases in rows if purchases}
+
+
+async def test_rejection_after_a_move_debits_the_credited_city(
+    session, make_user, make_mission, make_purchase
+):
+    user = await make_user(city="Tehran")
+    mission = await make_mission()
+    kept = await make_purchase(user, mission)
+    rejected = await make_purchase(user, mission)
+
+    await _review(approve_purchase_record, kept.id)
+    await _review(approve_purchase_record, rejected.id)
+    await _move_store(session, user, "Shiraz")
+    await _review(reject_purchase_record, rejected.id)
+
+    assert await _cities(session) == {"Tehran": (Decimal("100.00"), 1)}
+    await rebuild_spend_rollups(session)
+    await session.commit()
+    assert await _cities(session) == {"Tehran": (Decimal("100.00"), 1)}
+
+
+async def test_reapproval_after_a_move_credits_the_new_city(
+    session, make_user, make_mission, make_purchase
+):
+    user = await make_user(city="Tehran")
+    purchase = await make_purchase(user, await make_mission())
+
+    await _review(approve_purchase_record, purchase.id)
+    await _review(reject_purchase_record, purchase.id)
+    await _move_store(session, user, "Shiraz")
+    await _review(approve_purchase_record, purchase.id)
+    await _move_store(session, user, "Tabriz")
+
+    assert await _cities(session) == {"Shiraz": (Decimal("100.00"), 1)}
+    await rebuild_spend_rollups(session)
+    await session.commit()
+    assert await _cities(session) == {"Shiraz": (Decimal("100.00"), 1)}